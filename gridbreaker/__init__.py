@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+GridBreaker — Modern Minesweeper
+Features:
+- Fullscreen (F11), Exit confirmation (Esc), Restart (F2)
+- Splash screen with optional image (assets/splash.png)
+- Light/Dark themes, internationalization (EN, BN, HI, ES, JA)
+- Safe first click, right-click (or Ctrl+Click) to flag, double-click chord
+- Square, toroidal (wrap-around) and hex board topologies
+- Timer, mine counter, best times per difficulty
+- Unfinished games saved on exit and resumed on start; every game kept as a replay
+- Single-canvas board renderer, with the per-cell button grid as a fallback
+- Optional sounds via pygame if installed and assets/sound available
+
+``import gridbreaker`` loads only the headless engine. The Tk application is
+imported on first use of ``gridbreaker.App`` / ``gridbreaker.main``.
+"""
+
+from .engine import (
+    Board, NeighborTable, neighbor_table,
+    DIFFICULTIES, TOPOLOGIES, HIDDEN, REVEALED, FLAGGED,
+)
+
+__all__ = [
+    "Board", "NeighborTable", "neighbor_table",
+    "DIFFICULTIES", "TOPOLOGIES", "HIDDEN", "REVEALED", "FLAGGED",
+    "App", "main",
+]
+
+
+def __getattr__(name):
+    if name in ("App", "main"):
+        from . import app
+        return getattr(app, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Command line entry point.
+
+    python -m gridbreaker                  open the game window
+    python -m gridbreaker play --no-splash / --startup-time / --race HOST:PORT
+    python -m gridbreaker board [...]      generate and print a board, no GUI
+    python -m gridbreaker simulate [...]   Monte Carlo win-rate statistics
+    python -m gridbreaker replay [...]     list or play back recorded games
+    python -m gridbreaker stats [...]      game history and best times
+    python -m gridbreaker bench [...]      time the engine hot paths, compare to a baseline
+    python -m gridbreaker endless [...]    play an unbounded, chunk-generated board
+    python -m gridbreaker race serve|load  run a race server, or load-test one
+    python -m gridbreaker importtime       check the engine import budget
+
+Only ``play`` (and ``replay --gui``) import tkinter, and every command
+imports its own module only when it runs.
+"""
+
+import os
+import sys
+import random
+import argparse
+import subprocess
+
+from .config import (ENGINE_IMPORT_BUDGET_MS, REPLAY_FILE, STATS_DB, HIGHSCORE_FILE, RACE_PORT,
+                     SIM_STRATEGIES, SIM_FIRST_CLICKS, BENCH_OPS, BENCH_SIZES,
+                     ENDLESS_DENSITY, ENDLESS_MAX_CHUNKS)
+from .engine import Board, DIFFICULTIES, TOPOLOGIES, HIDDEN, FLAGGED
+
+GUI_MODULES = ("tkinter", "pygame", "PIL")
+
+
+def add_board_args(p):
+    p.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="expert")
+    p.add_argument("--rows", type=int, help="custom rows (overrides --difficulty)")
+    p.add_argument("--cols", type=int, help="custom columns")
+    p.add_argument("--mines", type=int, help="custom mine count")
+    p.add_argument("--topology", choices=TOPOLOGIES, default="square")
+
+
+# The command modules are imported only to run a command, so their
+# arguments are defined here.
+def add_simulate_args(p):
+    p.add_argument("--games", type=int, default=10000)
+    p.add_argument("--strategy", choices=sorted(SIM_STRATEGIES), default="random")
+    p.add_argument("--first-click", choices=SIM_FIRST_CLICKS, default="center")
+    p.add_argument("--seed", type=int, default=0, help="master seed")
+    p.add_argument("--workers", type=int, default=os.cpu_count(), help="0 = run in-process")
+    p.add_argument("--chunk", type=int, default=1000, help="games per work unit")
+    p.add_argument("--json", metavar="PATH", help="also write the summary as JSON")
+    p.add_argument("--quiet", action="store_true", help="no progress output")
+
+
+def add_bench_args(p):
+    p.add_argument("--sizes", nargs="*", default=list(BENCH_SIZES), metavar="ROWSxCOLS",
+                   help="synthetic boards at expert density (default: %(default)s)")
+    p.add_argument("--topology", nargs="+", choices=TOPOLOGIES, default=["square"])
+    p.add_argument("--ops", nargs="+", choices=BENCH_OPS, default=list(BENCH_OPS))
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=5, help="fresh boards / cleared replays per case")
+    p.add_argument("--cells", type=int, default=200, help="cells touched per replay by per-cell ops")
+    p.add_argument("--json", metavar="PATH", help="write the results as JSON (e.g. a new baseline)")
+    p.add_argument("--baseline", metavar="PATH", help="compare against a saved JSON run")
+    p.add_argument("--tolerance", type=float, default=0.2,
+                   help="allowed slowdown vs. the baseline (0.2 = 20%%)")
+
+
+def add_endless_args(p):
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--density", type=float, default=ENDLESS_DENSITY)
+    p.add_argument("--store", metavar="PATH", help="SQLite file holding the game; resumed if it exists")
+    p.add_argument("--max-chunks", type=int, default=ENDLESS_MAX_CHUNKS, help="chunks kept in memory")
+    p.add_argument("--click", type=int, nargs=2, action="append", default=[], metavar=("ROW", "COL"))
+    p.add_argument("--flag", type=int, nargs=2, action="append", default=[], metavar=("ROW", "COL"))
+    p.add_argument("--chord", type=int, nargs=2, action="append", default=[], metavar=("ROW", "COL"))
+    p.add_argument("--walk", type=int, default=0, metavar="CELLS",
+                   help="then reveal this many safe cells eastward (stress test)")
+    p.add_argument("--view", type=int, nargs=4, metavar=("ROW", "COL", "ROWS", "COLS"),
+                   help="print this window of the board")
+
+
+def add_race_args(p):
+    sub = p.add_subparsers(dest="mode", required=True)
+    s = sub.add_parser("serve", help="run a race server")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=RACE_PORT, help="0 picks a free port")
+    s.add_argument("--seed", type=int, help="seed for room seeds (repeatable runs)")
+
+    s = sub.add_parser("load", help="load-test a race server with scripted players")
+    s.add_argument("--connect", metavar="HOST:PORT", help="server to test (default: start one)")
+    s.add_argument("--sessions", type=int, nargs="+", default=[500, 2000, 5000],
+                   help="concurrent players at each stage (default: %(default)s)")
+    s.add_argument("--rate", type=float, default=0.5, help="moves per second per player")
+    s.add_argument("--duration", type=float, default=10.0, help="seconds measured per stage")
+    s.add_argument("--warmup", type=float, default=2.0, help="seconds before measuring each stage")
+    s.add_argument("--room-size", type=int, default=4, help="players per room")
+    s.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default="expert")
+    s.add_argument("--topology", choices=TOPOLOGIES, default="square")
+    s.add_argument("--seed", type=int, default=0)
+    s.add_argument("--budget", type=float, metavar="MS", help="fail if any stage's p99 exceeds this")
+
+
+def board_dims(args):
+    rows, cols, mines = DIFFICULTIES[args.difficulty]
+    return (args.rows or rows, args.cols or cols, args.mines if args.mines is not None else mines)
+
+
+def format_board(board, show_mines=False):
+    lines = []
+    for r in range(board.rows):
+        row = []
+        for c in range(board.cols):
+            i = r * board.cols + c
+            st = board.cell_state[i]
+            if show_mines and board.mine_map[i]:
+                row.append("*")
+            elif st == HIDDEN:
+                row.append("#")
+            elif st == FLAGGED:
+                row.append("F")
+            else:
+                row.append(str(board.counts[i]) if board.counts[i] > 0 else ".")
+        lines.append(("" if board.topology != "hex" or not r & 1 else " ") + " ".join(row))
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Commands
+# -----------------------------
+def cmd_play(args):
+    race = None
+    if getattr(args, "race", None):
+        from .race import parse_address
+        try:
+            race = (*parse_address(args.race), args.room)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    from .app import main
+    main(splash=not getattr(args, "no_splash", False), measure=getattr(args, "startup_time", False),
+         race=race)
+    return 0
+
+
+def cmd_board(args):
+    rows, cols, mines = board_dims(args)
+    rng = random.Random(args.seed) if args.seed is not None else None
+    board = Board(rows, cols, mines, args.topology, rng=rng)
+    r, c = args.click if args.click else (rows // 2, cols // 2)
+    layout = None
+    if args.no_guess:
+        from .generator import generate_no_guess
+        layout = generate_no_guess(rows, cols, mines, args.topology, (r, c), rng)
+        if layout is None:
+            print("no no-guess layout found; using a random board", file=sys.stderr)
+    if layout is not None:
+        board.set_mines(layout)
+    else:
+        board.place_mines(r, c)
+    hit, newly = board.reveal(r, c)
+    print(format_board(board, show_mines=args.show_mines))
+    print(f"{rows}x{cols}, {mines} mines, {args.topology}: "
+          f"revealed {board.revealed_count}, 3BV {board.three_bv}, "
+          f"openings {len(board.open_offsets) - 1}")
+    return 0
+
+
+def cmd_simulate(args):
+    from . import sim
+    return sim.run(args, *board_dims(args))
+
+
+def cmd_replay(args):
+    import time
+    from .replay import KINDS, load_replays
+    replays = load_replays(args.file)
+    if not replays:
+        print(f"no replays in {args.file}")
+        return 1
+    if args.list:
+        for n, rp in enumerate(replays):
+            _, outcome = rp.run()
+            print(f"{n:5d}  {rp.rows}x{rp.cols}/{rp.mines} {rp.topology}{' no-guess' if rp.no_guess else ''}  "
+                  f"{len(rp.events)} moves  {rp.duration_ms / 1000:.1f}s  {len(rp.to_bytes())} B  {outcome}")
+        return 0
+    try:
+        rp = replays[args.index]
+    except IndexError:
+        print(f"no replay #{args.index} ({len(replays)} recorded)")
+        return 1
+    if args.gui:
+        from .app import main
+        main(splash=False, replay=rp, speed=args.speed)
+        return 0
+    t = time.perf_counter()
+    board, outcome = rp.run()
+    dt = time.perf_counter() - t
+    if args.moves:
+        for t_ms, kind, i in rp.events:
+            print(f"{t_ms / 1000:8.3f}s  {KINDS[kind]:<6} {divmod(i, rp.cols)}")
+    print(format_board(board, show_mines=outcome != "won"))
+    print(f"{rp.rows}x{rp.cols}, {rp.mines} mines, {rp.topology}: {outcome} after {len(rp.events)} moves "
+          f"in {rp.duration_ms / 1000:.1f}s; {len(rp.to_bytes())} bytes; replayed in {dt * 1000:.1f} ms")
+    return 0
+
+
+def cmd_stats(args):
+    import time
+    from .store import GameStore
+    store = GameStore(args.db, legacy_json=HIGHSCORE_FILE)
+    rows, cols, mines = board_dims(args)
+    key = (rows, cols, mines, args.topology)
+    counts = store.summary(key)
+    played = sum(counts.values())
+    print(f"{rows}x{cols}, {mines} mines, {args.topology}: {played} games, "
+          + ", ".join(f"{n} {outcome}" for outcome, n in counts.items()))
+    for n, (seconds, when) in enumerate(store.top(key, args.top), 1):
+        print(f"  #{n:<3} {seconds:8.2f}s  {time.strftime('%Y-%m-%d %H:%M', time.localtime(when))}")
+    if args.recent:
+        print("recent:")
+        for g in store.recent(args.recent):
+            board = f"{g['rows']}x{g['cols']}/{g['mines']}"
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(g['finished_at']))}  "
+                  f"{board:<12} {g['topology']:<6} {g['outcome']:<9} {g['seconds']:7.1f}s")
+    store.close()
+    return 0
+
+
+def cmd_bench(args):
+    from . import bench
+    return bench.run(args)
+
+
+def cmd_endless(args):
+    from . import endless
+    return endless.run(args)
+
+
+def cmd_race(args):
+    from . import race
+    return race.run(args)
+
+
+def cmd_importtime(args):
+    # Each sample is a fresh interpreter, so caches never hide import cost.
+    code = ("import sys, time; t = time.perf_counter(); import gridbreaker.engine; "
+            "dt = time.perf_counter() - t; "
+            f"print(dt * 1000, ','.join(m for m in {GUI_MODULES!r} if m in sys.modules))")
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = root + os.pathsep + env.get("PYTHONPATH", "")
+    samples, leaked = [], set()
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                             capture_output=True, text=True).stdout.split()
+        samples.append(float(out[0]))
+        if len(out) > 1:
+            leaked.update(out[1].split(","))
+    samples.sort()
+    best, median = samples[0], samples[len(samples) // 2]
+    print(f"import gridbreaker.engine: best {best:.1f} ms, median {median:.1f} ms "
+          f"(budget {args.budget:.1f} ms, {args.runs} runs)")
+    if leaked:
+        print(f"FAIL: engine import pulled in {', '.join(sorted(leaked))}")
+        return 1
+    if best > args.budget:
+        print("FAIL: over budget")
+        return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m gridbreaker")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("play", help="open the game window (default)")
+    p.add_argument("--no-splash", action="store_true", help="show the window as soon as it is built")
+    p.add_argument("--startup-time", action="store_true",
+                   help="print startup phase timings once the window is up, then exit")
+    p.add_argument("--race", metavar="HOST:PORT", help="join a race on this server")
+    p.add_argument("--room", default="lobby", help="race room to join (default: %(default)s)")
+    p.set_defaults(func=cmd_play)
+
+    p = sub.add_parser("board", help="generate a board and print it after the first click")
+    add_board_args(p)
+    p.add_argument("--seed", type=int)
+    p.add_argument("--click", type=int, nargs=2, metavar=("ROW", "COL"))
+    p.add_argument("--show-mines", action="store_true")
+    p.add_argument("--no-guess", action="store_true", help="only emit boards solvable without guessing")
+    p.set_defaults(func=cmd_board)
+
+    p = sub.add_parser("simulate", help="play many seeded games and report statistics")
+    add_board_args(p)
+    add_simulate_args(p)
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("replay", help="list recorded games or play one back")
+    p.add_argument("--file", default=REPLAY_FILE)
+    p.add_argument("--index", type=int, default=-1, help="which game (default: the last)")
+    p.add_argument("--list", action="store_true", help="one line per recorded game")
+    p.add_argument("--moves", action="store_true", help="print every move")
+    p.add_argument("--gui", action="store_true", help="play back in the game window")
+    p.add_argument("--speed", type=float, default=1.0, help="GUI playback speed (e.g. 4 for 4x)")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("stats", help="best times and recent games from the history database")
+    add_board_args(p)
+    p.add_argument("--db", default=STATS_DB)
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--recent", type=int, default=10)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("bench", help="benchmark Board operations across board sizes")
+    add_bench_args(p)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("endless", help="moves on an endless board, optionally kept in a store file")
+    add_endless_args(p)
+    p.set_defaults(func=cmd_endless)
+
+    p = sub.add_parser("race", help="race server and its load test")
+    add_race_args(p)
+    p.set_defaults(func=cmd_race)
+
+    p = sub.add_parser("importtime", help="measure engine import time against the budget")
+    p.add_argument("--runs", type=int, default=7)
+    p.add_argument("--budget", type=float, default=ENGINE_IMPORT_BUDGET_MS, help="milliseconds")
+    p.set_defaults(func=cmd_importtime)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    func = getattr(args, "func", cmd_play)
+    return func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
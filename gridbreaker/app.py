@@ -0,0 +1,1432 @@
+# -*- coding: utf-8 -*-
+"""Tk application window: menus, top panel, game flow and best times."""
+
+import os
+import sys
+import time
+import random
+import functools
+import threading
+import multiprocessing
+from collections import deque
+import tkinter as tk
+from tkinter import messagebox, simpledialog, filedialog
+
+from .config import (APP_NAME, ASSETS_DIR, HIGHSCORE_FILE, SAVE_FILE, STATS_DB, SPLASH_MIN_MS, PERF_OVERLAY_MS,
+                     RACE_PORT, RACE_POLL_MS, HEAT_BUDGET_MS, HEAT_DELAY_MS, HEAT_RETRY_MS,
+                     OFFLOAD_MIN_CELLS, JOB_QUEUE_MAX, JOB_EXIT_WAIT_S,
+                     CUSTOM_MAX, FULL_VIEW_MAX)
+from .engine import Board, DIFFICULTIES, TOPOLOGIES, REVEALED, FLAGGED
+from .i18n import LANGUAGES, I18N, T
+from .themes import THEMES, FACE_DEFAULT, FACE_WON, FACE_LOST
+from .audio import AudioManager
+from .solver import Solver
+from .probability import ProbabilityMap
+from .generator import NoGuessPool, default_start, seeded_layout
+from .replay import Recorder, Replay, REVEAL, FLAG, CHORD, append_replay, load_replays
+from .history import MoveHistory
+from . import snapshot
+from .store import GameStore
+from .perf import Timings, InputLatency, export as export_perf, perf_file
+from .jobs import JobRunner, JOB_POLL_MS
+from .views import BOARD_VIEWS, DEFAULT_VIEW, RenderQueue
+
+# -----------------------------
+# Splash Screen
+# -----------------------------
+def load_splash_image():
+    """Decoded and resized splash image (a PIL Image), or None. Safe to call
+    off the Tk thread; the PhotoImage is made later by Splash.set_image."""
+    path = os.path.join(ASSETS_DIR, "splash.png")
+    if not os.path.exists(path):
+        return None
+    try:
+        from PIL import Image
+        return Image.open(path).convert("RGBA").resize((460, 180))
+    except Exception:
+        return None
+
+
+class Splash(tk.Toplevel):
+    def __init__(self, root, lang):
+        super().__init__(root)
+        self.lang = lang
+        self.overrideredirect(True)
+        self.configure(bg="#111111")
+        w, h = 520, 300
+        x = (self.winfo_screenwidth() - w) // 2
+        y = (self.winfo_screenheight() - h) // 2
+        self.geometry(f"{w}x{h}+{x}+{y}")
+
+        # Text logo until the splash image (assets/splash.png) is decoded
+        self.logo_img = None
+        self.title_lbl = tk.Label(self, text=f"🧠 {APP_NAME}", fg="#FAFAFA", bg="#111111",
+                                  font=("Segoe UI", 28, "bold"))
+        self.subtitle_lbl = tk.Label(self, text="A modern Minesweeper", fg="#BDBDBD", bg="#111111",
+                                     font=("Segoe UI", 12))
+        self.title_lbl.pack(pady=(48, 4))
+        self.subtitle_lbl.pack()
+
+        self.loading = tk.Label(self, text=T(self.lang, "loading"), fg="#BDBDBD", bg="#111111",
+                                font=("Segoe UI", 12))
+        self.loading.pack(pady=16)
+
+        try:
+            self.attributes("-alpha", 0.0)
+            self.after(20, self._fade_in, 0.0)
+        except Exception:
+            pass
+
+    def set_image(self, img):
+        try:
+            from PIL import ImageTk
+            self.logo_img = ImageTk.PhotoImage(img)
+        except Exception:
+            self.logo_img = None
+            return
+        self.title_lbl.destroy()
+        self.subtitle_lbl.destroy()
+        lbl = tk.Label(self, image=self.logo_img, bg="#111111")
+        lbl.pack(pady=30, before=self.loading)
+
+    def _fade_in(self, a):
+        try:
+            if a < 1.0:
+                self.attributes("-alpha", a)
+                self.after(20, self._fade_in, a + 0.06)
+        except Exception:
+            pass
+
+    def _close(self):
+        try:
+            self.destroy()
+        except Exception:
+            pass
+
+# -----------------------------
+# Main App UI
+# -----------------------------
+def traced(name):
+    """Make an input handler an InputLatency trace named ``name``; it ends
+    in an idle callback once everything the handler queued is painted."""
+    def wrap(handler):
+        @functools.wraps(handler)
+        def run(self, *args):
+            if not self.latency.begin(name):
+                return handler(self, *args)  # nested: part of the outer trace
+            try:
+                return handler(self, *args)
+            finally:
+                tr = self.latency.settle()
+                if tr is not None:
+                    self.render_queue.when_drained(lambda: self._after_paint(tr))
+        return run
+    return wrap
+
+
+class App(tk.Tk):
+    def __init__(self, splash=True, measure=False):
+        super().__init__()
+        self.withdraw()  # Hide until splash finishes
+
+        self.title(APP_NAME)
+        self.icon_path = os.path.join(ASSETS_DIR, "icon.ico")
+        try:
+            if os.path.exists(self.icon_path):
+                self.iconbitmap(self.icon_path)
+        except Exception:
+            pass
+
+        # Defaults
+        self.lang = "en"
+        self.theme = "light"
+        self.theme_cfg = THEMES[self.theme]
+        self.number_colors = self.theme_cfg["num_colors"]
+
+        self.current_diff = "beginner"
+        self.current_rows, self.current_cols, self.current_mines = DIFFICULTIES[self.current_diff]
+
+        self.topology = "square"
+        self.fullscreen = False
+
+        self.board = None
+        self.renderer = DEFAULT_VIEW
+        self.view = None
+        self.render_queue = RenderQueue(self, lambda cells: self.view.render_revealed(cells))
+        self.solver = None
+        self.heat = False         # heat map overlay shown
+        self.heatmap = None       # ProbabilityMap of the current board
+        self.heat_cache = None    # solved component shapes, kept across games
+        self.heat_job = None
+        self.no_guess = False
+        self.no_guess_pool = None
+        self.practice = False     # practice games: undo/redo, no records
+        self.history = None       # MoveHistory of a practice game
+        self.seed = None
+        self.recorder = None
+        self.replay = None        # Replay being played back in the window
+        self.replay_job = None
+        self.replay_speed = 1.0
+        self.pending_replay = None
+        self.last_replay = None
+        self.game_over = False
+        self.first_click = True
+        self.start_time = None
+        self.timer_job = None
+        self._tick_due = None
+        self.perf = Timings()
+        self.latency = InputLatency(self.perf)
+        self.jobs = JobRunner(self, self.perf)
+        self.board_job = None     # Job working on the board, see _offload
+        self.queued_clicks = deque()
+        self.perf_overlay = None
+        self.perf_overlay_job = None
+        self.race = None          # RaceClient while in a race
+        self.race_room = None
+        self.race_job = None
+        self.race_peers = {}      # player -> (revealed cells, status)
+        self.pending_race = None
+
+        self.audio = AudioManager(start=False)
+        self.best_times = {}   # (rows, cols, mines, topology) -> seconds
+        self.store = None
+
+        self._start(splash, measure)
+
+    # ---- Startup ----
+    # Sounds, best times and the splash image load on a worker thread while
+    # the Tk thread builds the UI off-screen one step per event-loop turn,
+    # so the splash keeps animating. The window appears once both are done
+    # (and the splash has been up SPLASH_MIN_MS); without a splash it
+    # appears as soon as the UI and best times are ready.
+    def _start(self, splash, measure):
+        self._t0 = time.perf_counter()
+        self._measure = measure
+        self._phases = {}
+        self._ui_steps = [self._apply_theme_colors, self._create_menus, self._create_top_panel,
+                          self._create_board_area, self._bind_shortcuts,
+                          self._resume_or_new]
+        self._best_loaded = threading.Event()
+        self._loaded = threading.Event()
+        self._splash_img = None
+        self.splash = Splash(self, self.lang) if splash else None
+        threading.Thread(target=self._load_background, args=(splash,), daemon=True).start()
+        if splash:
+            self.after(1, self._build_step)
+        else:
+            self._init_ui()
+            self._poll_startup()
+
+    def _load_background(self, want_image):
+        if want_image:
+            self._splash_img = self._phase("image", load_splash_image)
+        self.best_times = self._phase("best_times", self._load_best)
+        self._best_loaded.set()
+        self.audio.start()
+        self._phase("audio", self.audio.ready.wait)
+        self._loaded.set()
+
+    def _phase(self, name, fn):
+        t = time.perf_counter()
+        result = fn()
+        self._phases[name] = (time.perf_counter() - t) * 1000.0
+        return result
+
+    def _build_step(self):
+        t = time.perf_counter()
+        self._ui_steps.pop(0)()
+        self._phases["ui"] = self._phases.get("ui", 0.0) + (time.perf_counter() - t) * 1000.0
+        if self._ui_steps:
+            self.after(1, self._build_step)
+        else:
+            self._poll_startup()
+
+    def _poll_startup(self):
+        elapsed = (time.perf_counter() - self._t0) * 1000.0
+        if self.splash is not None:
+            if self._splash_img is not None and self.splash.logo_img is None:
+                self.splash.set_image(self._splash_img)
+            ready = self._loaded.is_set() and elapsed >= SPLASH_MIN_MS
+        else:
+            ready = self._best_loaded.is_set()
+        if "ready" not in self._phases and self._loaded.is_set() and not self._ui_steps:
+            self._phases["ready"] = elapsed
+        if not ready:
+            self.after(15, self._poll_startup)
+            return
+        if self.splash is not None:
+            self.splash._close()
+            self.splash = None
+        self.deiconify()
+        self.update_idletasks()
+        self._phases["shown"] = (time.perf_counter() - self._t0) * 1000.0
+        self.perf.add("startup", self._phases["shown"])
+        if self._measure:
+            self._report_startup()
+        elif self.pending_replay:
+            self.play_replay(*self.pending_replay)
+        elif self.pending_race:
+            self.join_race(*self.pending_race)
+
+    def _report_startup(self):
+        # Wait for the audio too, so the report always has every phase.
+        if not self._loaded.is_set():
+            self.after(15, self._report_startup)
+            return
+        self._phases.setdefault("ready", (time.perf_counter() - self._t0) * 1000.0)
+        for name in ("image", "best_times", "audio", "ui", "ready", "shown"):
+            if name in self._phases:
+                print(f"{name:<12}{self._phases[name]:9.1f} ms")
+        self._shutdown()
+
+    # ---- UI Init ----
+    def _init_ui(self):
+        t = time.perf_counter()
+        while self._ui_steps:
+            self._ui_steps.pop(0)()
+        self._phases["ui"] = (time.perf_counter() - t) * 1000.0
+
+    def _apply_theme_colors(self):
+        t = self.theme_cfg
+        self.configure(bg=t["bg"])
+
+    def _create_menus(self):
+        self.menubar = tk.Menu(self)
+        self.config(menu=self.menubar)
+
+        # Game
+        self.game_menu = tk.Menu(self.menubar, tearoff=0)
+        self.game_menu.add_command(label=T(self.lang, "new_game"), command=self.reset_game, accelerator="F2")
+        self.game_menu.add_command(label=T(self.lang, "hint"), command=self.show_hint, accelerator="F3")
+        self.game_menu.add_command(label=T(self.lang, "auto_solve"), command=self.auto_solve, accelerator="F4")
+        self.game_menu.add_command(label=T(self.lang, "undo"), command=self.undo, accelerator="Ctrl+Z")
+        self.game_menu.add_command(label=T(self.lang, "redo"), command=self.redo, accelerator="Ctrl+Y")
+        self.replay_menu = tk.Menu(self.game_menu, tearoff=0)
+        for speed in (1, 2, 4, 8):
+            self.replay_menu.add_command(label=f"{speed}x", command=lambda s=speed: self.replay_last(s))
+        self.game_menu.add_cascade(label=T(self.lang, "replay_last"), menu=self.replay_menu)
+        self.game_menu.add_command(label=T(self.lang, "statistics"), command=self.show_stats)
+        self.game_menu.add_command(label=T(self.lang, "join_race"), command=self.join_race_dialog)
+        self.game_menu.add_command(label=T(self.lang, "leave_race"), command=self.leave_race)
+        self.diff_menu = tk.Menu(self.game_menu, tearoff=0)
+        self.diff_menu.add_command(label=T(self.lang, "beginner"), command=lambda: self._set_diff("beginner"))
+        self.diff_menu.add_command(label=T(self.lang, "intermediate"), command=lambda: self._set_diff("intermediate"))
+        self.diff_menu.add_command(label=T(self.lang, "expert"), command=lambda: self._set_diff("expert"))
+        self.diff_menu.add_separator()
+        self.diff_menu.add_command(label=T(self.lang, "custom"), command=self._custom_diff)
+        self.game_menu.add_cascade(label=T(self.lang, "difficulty"), menu=self.diff_menu)
+        self.topology_menu = tk.Menu(self.game_menu, tearoff=0)
+        for topo in TOPOLOGIES:
+            self.topology_menu.add_command(label=T(self.lang, f"topology_{topo}"), command=lambda t=topo: self._set_topology(t))
+        self.game_menu.add_cascade(label=T(self.lang, "topology"), menu=self.topology_menu)
+        self.game_menu.add_checkbutton(label=T(self.lang, "no_guess"), command=self.toggle_no_guess)
+        self.game_menu.add_checkbutton(label=T(self.lang, "practice"), command=self.toggle_practice)
+        self.game_menu.add_separator()
+        self.game_menu.add_command(label=T(self.lang, "exit"), command=self._confirm_exit, accelerator="Esc")
+        self.menubar.add_cascade(label=T(self.lang, "game"), menu=self.game_menu)
+
+        # View (fullscreen, theme)
+        self.view_menu = tk.Menu(self.menubar, tearoff=0)
+        self.view_menu.add_checkbutton(label=T(self.lang, "fullscreen"), command=self.toggle_fullscreen)
+        self.theme_menu = tk.Menu(self.view_menu, tearoff=0)
+        self.theme_menu.add_command(label=T(self.lang, "light"), command=lambda: self._set_theme("light"))
+        self.theme_menu.add_command(label=T(self.lang, "dark"), command=lambda: self._set_theme("dark"))
+        self.view_menu.add_cascade(label=T(self.lang, "theme"), menu=self.theme_menu)
+        self.renderer_menu = tk.Menu(self.view_menu, tearoff=0)
+        self.renderer_menu.add_command(label=T(self.lang, "renderer_canvas"), command=lambda: self._set_renderer("canvas"))
+        self.renderer_menu.add_command(label=T(self.lang, "renderer_buttons"), command=lambda: self._set_renderer("buttons"))
+        self.view_menu.add_cascade(label=T(self.lang, "renderer"), menu=self.renderer_menu)
+        self.view_menu.add_checkbutton(label=T(self.lang, "animate"), command=self.toggle_animation)
+        self.view_menu.add_checkbutton(label=T(self.lang, "heatmap"), command=self.toggle_heatmap,
+                                       accelerator="F9")
+        self.view_menu.add_separator()
+        self.view_menu.add_checkbutton(label=T(self.lang, "perf_overlay"), command=self.toggle_perf_overlay,
+                                       accelerator="F12")
+        self.view_menu.add_command(label=T(self.lang, "export_perf"), command=self.export_perf)
+        self.menubar.add_cascade(label=T(self.lang, "view"), menu=self.view_menu)
+
+        # Language
+        self.lang_menu = tk.Menu(self.menubar, tearoff=0)
+        for code, name in LANGUAGES.items():
+            self.lang_menu.add_command(label=name, command=lambda c=code: self._set_language(c))
+        self.menubar.add_cascade(label=T(self.lang, "language"), menu=self.lang_menu)
+
+        # Help
+        self.help_menu = tk.Menu(self.menubar, tearoff=0)
+        self.help_menu.add_command(label=T(self.lang, "about"), command=lambda: messagebox.showinfo(T(self.lang, "about"), T(self.lang, "about_text")))
+        self.menubar.add_cascade(label=T(self.lang, "help"), menu=self.help_menu)
+
+    def _refresh_menus(self):
+        self._create_menus()
+
+    def _create_top_panel(self):
+        t = self.theme_cfg
+        self.topbar = tk.Frame(self, bg=t["bg"], padx=8, pady=8)
+        self.topbar.grid(row=0, column=0, sticky="ew")
+
+        # FIX: Start with "000" at UI creation; will set correct mines after board is created
+        self.mine_var = tk.StringVar(value="000")
+        self.mine_label = tk.Label(self.topbar, textvariable=self.mine_var, font=("Consolas", 16, "bold"),
+                                   fg=t["counter"], bg=t["bg"])
+        self.mine_label.grid(row=0, column=0, padx=6)
+
+        self.face_btn = tk.Button(self.topbar, text=FACE_DEFAULT, font=("Segoe UI Emoji", 16), width=3,
+                                  command=self.reset_game, bg=self.theme_cfg["panel"], activebackground=self.theme_cfg["panel_dark"],
+                                  fg=t["text"], relief="raised")
+        self.face_btn.grid(row=0, column=1, padx=6)
+
+        self.time_var = tk.StringVar(value="000")
+        self.time_label = tk.Label(self.topbar, textvariable=self.time_var, font=("Consolas", 16, "bold"),
+                                   fg=t["time"], bg=t["bg"])
+        self.time_label.grid(row=0, column=2, padx=6)
+
+    def _create_board_area(self):
+        t = self.theme_cfg
+        self.board_outer = tk.Frame(self, bg=t["panel_dark"], padx=6, pady=6)
+        self.board_outer.grid(row=1, column=0)
+        self.board_frame = tk.Frame(self.board_outer, bg=t["panel"])
+        self.board_frame.grid(row=0, column=0)
+        self.view_name = self.renderer
+        self.view = BOARD_VIEWS[self.renderer](self, self.board_frame)
+
+    def _bind_shortcuts(self):
+        self.bind("<F2>", lambda e: self.reset_game())
+        self.bind("<F3>", lambda e: self.show_hint())
+        self.bind("<F4>", lambda e: self.auto_solve())
+        self.bind("<F9>", lambda e: self.toggle_heatmap())
+        self.bind("<Control-z>", lambda e: self.undo())
+        self.bind("<Control-y>", lambda e: self.redo())
+        self.bind("<Control-Z>", lambda e: self.redo())  # Ctrl+Shift+Z
+        self.bind("<Escape>", lambda e: self._confirm_exit())
+        self.bind("<F11>", lambda e: self.toggle_fullscreen())
+        self.bind("<F12>", lambda e: self.toggle_perf_overlay())
+
+    # ---- Theme / Language / Fullscreen ----
+    def _set_theme(self, theme):
+        if theme not in THEMES: return
+        self.theme = theme
+        self.theme_cfg = THEMES[theme]
+        self.number_colors = self.theme_cfg["num_colors"]
+        self._apply_theme_colors()
+        # repaint topbar
+        self.topbar.configure(bg=self.theme_cfg["bg"])
+        self.mine_label.configure(bg=self.theme_cfg["bg"], fg=self.theme_cfg["counter"])
+        self.time_label.configure(bg=self.theme_cfg["bg"], fg=self.theme_cfg["time"])
+        self.face_btn.configure(bg=self.theme_cfg["panel"], activebackground=self.theme_cfg["panel_dark"], fg=self.theme_cfg["text"])
+        # repaint board
+        self.board_outer.configure(bg=self.theme_cfg["panel_dark"])
+        self.board_frame.configure(bg=self.theme_cfg["panel"])
+        if self.perf_overlay is not None:
+            self.perf_overlay.configure(bg=self.theme_cfg["panel_dark"], fg=self.theme_cfg["text"])
+        self._repaint_board()
+
+    def _set_renderer(self, name):
+        if name not in BOARD_VIEWS or name == self.renderer: return
+        self.renderer = name
+        b = self.board
+        if self._view_for(b.rows, b.cols) == self.view_name:
+            return  # large board: stays in the viewport
+        self.render_queue.clear()
+        self._use_view(self._view_for(b.rows, b.cols))
+        self.view.build(b.rows, b.cols)
+        self.view.render_revealed([b.pos(i) for i in range(b.size) if b.cell_state[i] == REVEALED])
+        for i in range(b.size):
+            if b.cell_state[i] == FLAGGED:
+                self.view.render_cell(*b.pos(i))
+
+    def _view_for(self, rows, cols):
+        if rows > FULL_VIEW_MAX[0] or cols > FULL_VIEW_MAX[1]:
+            return "viewport"
+        return self.renderer
+
+    def _use_view(self, name):
+        if name == self.view_name:
+            return
+        self.view.destroy()
+        self.view_name = name
+        self.view = BOARD_VIEWS[name](self, self.board_frame)
+
+    def _set_language(self, code):
+        if code not in I18N: return
+        self.lang = code
+        self._refresh_menus()
+
+    def toggle_animation(self):
+        self.render_queue.animate = not self.render_queue.animate
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        try:
+            self.attributes("-fullscreen", self.fullscreen)
+        except Exception:
+            pass
+
+    # ---- Difficulty / Game control ----
+    def toggle_no_guess(self):
+        self.no_guess = not self.no_guess
+        if not self.no_guess and self.no_guess_pool:
+            self.no_guess_pool.shutdown()
+            self.no_guess_pool = None
+        self.reset_game()
+
+    def toggle_practice(self):
+        self.practice = not self.practice
+        self.reset_game()
+
+    def _set_topology(self, topology):
+        if topology not in TOPOLOGIES: return
+        self.leave_race()
+        self.topology = topology
+        self.reset_game()
+
+    def _set_diff(self, diff):
+        if diff not in DIFFICULTIES: return
+        self.leave_race()
+        self.current_diff = diff
+        r, c, m = DIFFICULTIES[diff]
+        self._new_game(r, c, m)
+
+    def _custom_diff(self):
+        lang = self.lang
+        title = T(lang, "custom_prompt_title")
+        try:
+            rows = simpledialog.askinteger(title, T(lang, "rows_prompt"), minvalue=5, maxvalue=CUSTOM_MAX[0], parent=self)
+            if rows is None: return
+            cols = simpledialog.askinteger(title, T(lang, "cols_prompt"), minvalue=5, maxvalue=CUSTOM_MAX[1], parent=self)
+            if cols is None: return
+            max_m = rows*cols - 1
+            mines = simpledialog.askinteger(title, T(lang, "mines_prompt"), minvalue=1, maxvalue=max_m, parent=self)
+            if mines is None: return
+        except Exception:
+            messagebox.showerror(title, T(lang, "invalid_custom"))
+            return
+        if not (5 <= rows <= CUSTOM_MAX[0] and 5 <= cols <= CUSTOM_MAX[1] and 1 <= mines <= rows*cols - 1):
+            messagebox.showerror(title, T(lang, "invalid_custom"))
+            return
+        self.leave_race()
+        self.current_diff = "custom"
+        self._new_game(rows, cols, mines)
+
+    def _new_game(self, rows, cols, mines, board=None):
+        # ``board``: one with mines already placed (resumed or replayed game)
+        self._cancel_board_job()
+        self._record_game()
+        self._stop_replay()
+        with self.perf.timer("reset") as span:
+            self.render_queue.clear()
+            self._stop_heat()
+            if board is None:
+                self.seed = random.getrandbits(32)
+                board = Board(rows, cols, mines, self.topology, rng=random.Random(self.seed))
+            self.board = board
+            self.solver = None
+            self.game_over = False
+            self.first_click = True
+
+            # FIX: Ensure proper timer reset and mine counter initialization
+            self._stop_timer()
+            self.start_time = None
+            self.time_var.set("000")
+            self.face_btn.config(text=FACE_DEFAULT)
+
+            self._use_view(self._view_for(rows, cols))
+            self.view.build(rows, cols)
+            span.detail = "{}x{} {} reused={} created={} destroyed={}".format(
+                rows, cols, self.view_name, *self.view.last_build)
+        if self.no_guess and not board.mines_placed and self.race is None:
+            self._prepare_no_guess()
+        self.recorder = Recorder(rows, cols, mines, self.topology, self.seed, self.no_guess)
+        self.history = None
+        if self.practice and self.race is None:
+            # Undone moves would make the replay and the records meaningless
+            self.history = MoveHistory(board)
+            self.recorder = None
+        # FIX: Immediately show correct remaining mines (mines_total - flags)
+        self._update_mine_counter()
+
+        # Adaptive window size, never beyond the screen (larger boards
+        # scroll in the viewport); keep fullscreen state
+        width = min(cols * 32 + 24 + (16 if self.topology == "hex" else 0), self.winfo_screenwidth() - 40)
+        height = min(rows * 32 + 140, self.winfo_screenheight() - 80)
+        if not self.fullscreen:
+            try:
+                self.geometry(f"{width}x{height}")
+            except Exception:
+                pass
+
+    @traced("new_game")
+    def reset_game(self):
+        if self.race is not None:
+            self._join_race_room()  # rematch on the room's board
+        elif self.board:
+            self._new_game(self.board.rows, self.board.cols, self.board.mines_total)
+
+    # ---- Mine placement ----
+    def _prepare_no_guess(self):
+        # Take a pre-generated layout for the marked start cell if the
+        # background pool has one ready; the pool refills itself.
+        b = self.board
+        if self.no_guess_pool is None:
+            self.no_guess_pool = NoGuessPool()
+        taken = self.no_guess_pool.take((b.rows, b.cols, b.mines_total, b.topology))
+        if taken is not None:
+            self.seed, layout = taken
+            b.set_mines(layout)
+        self.view.mark_hint(*default_start(b.rows, b.cols), self.theme_cfg["hint_safe"])
+
+    def _mine_rules(self):
+        # What _place_mines needs from the App, read on the Tk thread
+        return self.replay is not None, self.no_guess, self.seed
+
+    def _place_mines(self, board, r, c, rules):
+        # Every layout is seeded_layout(seed, first click), so a replay can
+        # rebuild it from the seed alone. May run on the job worker, so it
+        # only reads ``board`` and ``rules`` (from _mine_rules).
+        b = board
+        replaying, no_guess, seed = rules
+        if replaying:
+            return  # set by play_replay
+        if not no_guess:
+            b.place_mines(r, c)
+            return
+        if b.mines_placed and (r, c) == default_start(b.rows, b.cols):
+            return
+        # First click away from the marked start (or pool not ready yet):
+        # generate for this cell now, falling back to a plain random board.
+        b.set_mines(seeded_layout(b.rows, b.cols, b.mines_total, b.topology, seed, (r, c), True))
+
+    # ---- Events ----
+    @traced("left")
+    def _on_left(self, r, c):
+        if self.replay_job is not None:
+            return
+        if self.board_job is not None:
+            self._queue_click(REVEAL, r, c)
+            return
+        if self.board.state_at(r, c) == FLAGGED:
+            return
+        if self.race is not None:
+            self._race_move(REVEAL, r, c)
+            return
+        if self.recorder:
+            self.recorder.record(REVEAL, r, c)
+        first = self.first_click
+        if first:
+            self.first_click = False
+            self._start_timer()
+        if self._offload(r, c, first):
+            self._start_board_job(self._reveal_job, self._revealed, r, c, first, self._mine_rules())
+            return
+        t = time.perf_counter()
+        if first:
+            self._place_mines(self.board, r, c, self._mine_rules())
+        hit, newly = self._moves().reveal(r, c)
+        self._revealed(r, c, (t, None, hit, newly))
+
+    def _revealed(self, r, c, result):
+        t, t1, hit, newly = result
+        self.latency.board(t, len(newly), t1)
+        if hit:
+            self._reveal_all_mines(bang=(r, c))
+            self._lose()
+            self.audio.play("boom")
+            return
+        self._render_new(newly, origin=(r, c))
+        if self.solver:
+            self.solver.update(newly)
+        self._heat_touch(newly)
+        self.audio.play("click")
+        if self.board.is_win():
+            self._win()
+
+    @traced("flag")
+    def _on_right(self, r, c):
+        if self.replay_job is not None:
+            return
+        if self.board_job is not None:
+            self._queue_click(FLAG, r, c)
+            return
+        if self.race is not None:
+            self._race_move(FLAG, r, c)
+            return
+        if self.recorder:
+            self.recorder.record(FLAG, r, c)
+        t = time.perf_counter()
+        delta = self._moves().toggle_flag(r, c)
+        self.latency.board(t, 1 if delta else 0)
+        if delta is None: return
+        self.view.render_cell(r, c)
+        if self.solver:
+            self.solver.update([(r, c)])
+        self._heat_touch([(r, c)])
+        if self.board.state_at(r, c) == FLAGGED:
+            self.audio.play("flag")
+        self._update_mine_counter()
+
+    @traced("chord")
+    def _on_chord(self, r, c):
+        if self.replay_job is not None:
+            return
+        if self.board_job is not None:
+            self._queue_click(CHORD, r, c)
+            return
+        if self.race is not None:
+            self._race_move(CHORD, r, c)
+            return
+        if self.recorder:
+            self.recorder.record(CHORD, r, c)
+        if self.board.size >= OFFLOAD_MIN_CELLS:
+            self._start_board_job(self._chord_job, self._chorded, r, c)
+            return
+        t = time.perf_counter()
+        hit, newly = self._moves().chord_reveal(r, c)
+        self._chorded(r, c, (t, None, hit, newly))
+
+    def _chorded(self, r, c, result):
+        t, t1, hit, newly = result
+        self.latency.board(t, len(newly), t1)
+        if hit:
+            self._reveal_all_mines()
+            self._lose()
+            self.audio.play("boom")
+            return
+        self._render_new(newly, origin=(r, c))
+        if self.solver and newly:
+            self.solver.update(newly)
+        if newly:
+            self._heat_touch(newly)
+            self.audio.play("click")
+        if newly and self.board.is_win():
+            self._win()
+
+    # ---- Background board work ----
+    # Placing mines on a big board, an opening there, or generating a
+    # no-guess layout can take longer than a frame, so those moves run on
+    # the JobRunner's worker thread and finish in _revealed / _chorded on
+    # the Tk thread. Until then the board belongs to the job: clicks wait
+    # in queued_clicks (up to JOB_QUEUE_MAX, beyond that they are dropped
+    # with a bell) and run in order once it is done, hints, auto-solve and
+    # the heat map wait too. A new game makes the job stale and drops the
+    # waiting clicks.
+    def _offload(self, r, c, first):
+        b = self.board
+        if first and self.no_guess and self.replay is None:
+            return True  # may have to generate a no-guess layout
+        if b.size < OFFLOAD_MIN_CELLS:
+            return False
+        return first or b.counts[b.idx(r, c)] == 0
+
+    def _reveal_job(self, board, moves, r, c, first, rules):
+        t = time.perf_counter()
+        if first:
+            self._place_mines(board, r, c, rules)
+        hit, newly = moves.reveal(r, c)
+        return t, time.perf_counter(), hit, newly
+
+    def _chord_job(self, board, moves, r, c):
+        t = time.perf_counter()
+        hit, newly = moves.chord_reveal(r, c)
+        return t, time.perf_counter(), hit, newly
+
+    def _start_board_job(self, work, finish, r, c, *args):
+        trace = self.latency.detach()
+
+        def done(result):
+            self.board_job = None
+            resumed = self.latency.attach(trace)
+            try:
+                finish(r, c, result)
+            finally:
+                settled = self.latency.settle() if resumed else None
+                if settled is not None:
+                    self.render_queue.when_drained(lambda: self._after_paint(settled))
+            self._run_queued_clicks()
+
+        def failed(error):
+            # Unlock the board and report; re-raising here would only reach
+            # Tk's error printer
+            self.board_job = None
+            self.queued_clicks.clear()
+            if not self.board.mines_placed:
+                self.first_click = True  # place them on the next click
+                self._stop_timer()
+                self.start_time = None
+                self.time_var.set("000")
+            messagebox.showerror(APP_NAME, T(self.lang, "move_failed", error=error))
+
+        self.board_job = self.jobs.submit(work, self.board, self._moves(), r, c, *args,
+                                          done=done, failed=failed, key="board")
+
+    def _cancel_board_job(self):
+        if self.board_job is not None:
+            self.jobs.cancel("board")
+            self.board_job = None
+        self.queued_clicks.clear()
+
+    def _queue_click(self, kind, r, c):
+        if len(self.queued_clicks) >= JOB_QUEUE_MAX:
+            self.latency.cut()
+            self.bell()
+            return
+        self.queued_clicks.append((kind, r, c))
+
+    def _run_queued_clicks(self):
+        handlers = (self._on_left, self._on_right, self._on_chord)
+        while self.queued_clicks and self.board_job is None:
+            if self.game_over:
+                self.queued_clicks.clear()
+                break
+            kind, r, c = self.queued_clicks.popleft()
+            handlers[kind](r, c)
+
+    # ---- Undo / redo (practice games) ----
+    # MoveHistory keeps each move as the cells it changed, so taking a move
+    # back or playing it again repaints only those cells. Undoing the move
+    # that hit a mine hides the mines again and the game goes on; a won
+    # game is final.
+    def _moves(self):
+        # Board moves go through the history in practice games
+        return self.history if self.history is not None else self.board
+
+    def _can_rewind(self):
+        return (self.history is not None and self.board_job is None and self.replay is None
+                and not (self.game_over and self.board.is_win()))
+
+    @traced("undo")
+    def undo(self):
+        if not self._can_rewind():
+            return
+        self.render_queue.flush()
+        t = time.perf_counter()
+        move = self.history.undo()
+        if move is None:
+            return
+        self.latency.board(t, len(move.cells))
+        if self.game_over:
+            self.game_over = False
+            self.view.hide_mines()
+            self.face_btn.config(text=FACE_DEFAULT)
+            self._tick_timer()
+        b = self.board
+        cells = [divmod(i, b.cols) for i in move.cells]
+        if move.kind == FLAG:
+            self.view.render_cell(*cells[0])
+            self._update_mine_counter()
+        else:
+            self.view.render_hidden(cells)
+        self.solver = None  # its deductions assume cells only ever get revealed
+        self._heat_touch(cells)
+
+    @traced("redo")
+    def redo(self):
+        if not self._can_rewind() or self.game_over:
+            return
+        t = time.perf_counter()
+        move = self.history.redo()
+        if move is None:
+            return
+        self.latency.board(t, len(move.cells))
+        b = self.board
+        cells = [divmod(i, b.cols) for i in move.cells]
+        if move.kind == FLAG:
+            self.view.render_cell(*cells[0])
+            self._update_mine_counter()
+            self._heat_touch(cells)
+            return
+        if move.hit:
+            self._reveal_all_mines(bang=b.pos(move.at) if move.kind == REVEAL else None)
+            self._lose()
+            return
+        self._render_new(cells)
+        self.solver = None
+        self._heat_touch(cells)
+        if b.is_win():
+            self._win()
+
+    # ---- Hints / auto-play ----
+    def _ensure_solver(self):
+        # Built on first use from the revealed numbers, then kept current
+        # by the click handlers with just the cells each move changed.
+        if self.solver is None:
+            self.solver = Solver(self.board)
+        return self.solver
+
+    @traced("hint")
+    def show_hint(self):
+        if (self.game_over or self.first_click or self.replay is not None or self.race is not None
+                or self.board_job is not None):
+            return
+        hint = self._ensure_solver().hint()
+        if hint is None:
+            self.latency.cut()
+            messagebox.showinfo(T(self.lang, "hint"), T(self.lang, "no_hint"))
+            return
+        kind, (r, c) = hint
+        self.view.mark_hint(r, c, self.theme_cfg["hint_safe" if kind == "safe" else "hint_mine"])
+
+    @traced("auto_solve")
+    def auto_solve(self):
+        if (self.game_over or self.first_click or self.replay is not None or self.race is not None
+                or self.board_job is not None):
+            return
+        solver = self._ensure_solver()
+        while not self.game_over and self.board_job is None:
+            cell = solver.next_safe()
+            if cell is None:
+                break
+            if self.board.state_at(*cell) == FLAGGED:
+                self._on_right(*cell)  # wrong flag on a proven-safe cell
+            self._on_left(*cell)
+
+    # ---- Heat map ----
+    # Mine probability of every hidden cell (see probability.py), kept
+    # current like the solver: moves pass the cells they changed, and a
+    # refresh a moment later re-solves only the components they touched.
+    # Components that miss HEAT_BUDGET_MS show estimates and are solved
+    # further every HEAT_RETRY_MS, so the overlay never blocks input.
+    def toggle_heatmap(self):
+        self.heat = not self.heat
+        if self.heat:
+            self._refresh_heat()
+        else:
+            self._stop_heat()
+
+    def _heat_touch(self, cells):
+        if self.heatmap is not None:
+            self.heatmap.update(cells)
+        if self.heat and self.heat_job is None:
+            self.heat_job = self.after(HEAT_DELAY_MS, self._refresh_heat)
+
+    def _refresh_heat(self):
+        self.heat_job = None
+        if not self.heat or self.game_over or self.first_click or self.board is None:
+            return
+        if self.board_job is not None:
+            self.heat_job = self.after(HEAT_RETRY_MS, self._refresh_heat)
+            return
+        if self.heatmap is None:
+            self.heatmap = ProbabilityMap(self.board, self.heat_cache)
+            self.heat_cache = self.heatmap.cache
+        hm = self.heatmap
+        with self.perf.timer("heatmap") as span:
+            exact = hm.recompute(HEAT_BUDGET_MS)
+            self.view.show_heat(hm.prob, hm.interior)
+            span.detail = "exact={} solved={} cached={} estimated={}".format(exact, *hm.last)
+        if hm.pending:
+            self.heat_job = self.after(HEAT_RETRY_MS, self._refresh_heat)
+
+    def _stop_heat(self):
+        if self.heat_job is not None:
+            try:
+                self.after_cancel(self.heat_job)
+            except Exception:
+                pass
+            self.heat_job = None
+        if self.heatmap is not None:
+            self.heatmap = None
+            if self.view is not None:
+                self.view.show_heat(None)
+
+    # ---- Save / resume ----
+    def _resume_or_new(self):
+        try:
+            snap = snapshot.load(SAVE_FILE)
+        except Exception:
+            snap = None
+        self._remove_save()  # consumed; a crash later must not resume stale state
+        if snap is None:
+            self._new_game(self.current_rows, self.current_cols, self.current_mines)
+        else:
+            self._resume(snap)
+
+    def _resume(self, snap):
+        b = snap.board
+        self.topology = b.topology
+        self.current_diff = snap.difficulty
+        self.current_rows, self.current_cols, self.current_mines = b.rows, b.cols, b.mines_total
+        self._new_game(b.rows, b.cols, b.mines_total, board=b)
+        self.seed = snap.seed
+        self.first_click = False
+        try:
+            self.recorder = Recorder.resume(Replay.from_bytes(snap.replay)) if snap.replay else None
+        except (ValueError, IndexError):
+            self.recorder = None
+        # Repaint in one pass from the cell states instead of replaying moves.
+        cols, state = b.cols, b.cell_state
+        self.view.render_revealed([divmod(i, cols) for i in range(b.size) if state[i] == REVEALED])
+        i = state.find(FLAGGED)
+        while i != -1:
+            self.view.render_cell(*divmod(i, cols))
+            i = state.find(FLAGGED, i + 1)
+        self._update_mine_counter()
+        self._heat_touch(())
+        self.start_time = time.time() - snap.elapsed_ms / 1000.0
+        self._tick_timer()
+
+    def _save_game(self):
+        # Keeps an unfinished game for the next start; True if one was saved.
+        b = self.board
+        if (b is None or self.game_over or self.first_click or self.replay is not None or self.race is not None
+                or self.history is not None):
+            return False
+        rec = self.recorder.replay() if self.recorder else None
+        elapsed = (time.time() - self.start_time) * 1000.0 if self.start_time else 0
+        try:
+            snapshot.save(SAVE_FILE, b, elapsed_ms=elapsed, seed=self.seed,
+                          no_guess=rec.no_guess if rec else self.no_guess,
+                          difficulty=self.current_diff, replay=rec.to_bytes() if rec else b"")
+        except Exception:
+            return False
+        return True
+
+    def _remove_save(self):
+        try:
+            os.remove(SAVE_FILE)
+        except OSError:
+            pass
+
+    # ---- Replays ----
+    def _record_game(self):
+        # The game being left goes to the replay log and the history store (once).
+        rec, self.recorder = self.recorder, None
+        replay = rec.replay() if rec else None
+        if replay is None:
+            return
+        self.last_replay = replay
+        try:
+            append_replay(replay.to_bytes())
+        except Exception:
+            pass
+        if self.store is not None:
+            b = self.board
+            outcome = ("won" if b.is_win() else "lost") if self.game_over else "abandoned"
+            self.store.record(difficulty=self.current_diff, rows=b.rows, cols=b.cols, mines=b.mines_total,
+                              topology=b.topology, no_guess=int(replay.no_guess), outcome=outcome,
+                              seconds=self._game_seconds(), moves=len(replay.events),
+                              three_bv=b.three_bv, seed=replay.seed)
+
+    def _game_seconds(self):
+        return time.time() - self.start_time if self.start_time else 0.0
+
+    def replay_last(self, speed=1):
+        self._record_game()
+        if self.last_replay is None:
+            try:
+                replays = load_replays()
+            except Exception:
+                replays = []
+            self.last_replay = replays[-1] if replays else None
+        if self.last_replay is None:
+            messagebox.showinfo(T(self.lang, "replay_last"), T(self.lang, "no_replay"))
+            return
+        self.play_replay(self.last_replay, speed)
+
+    def play_replay(self, replay, speed=None):
+        """Play ``replay`` back in the window at ``speed`` times real time.
+        Clicks are ignored until it finishes; nothing is recorded."""
+        if speed:
+            self.replay_speed = speed
+        self.leave_race()
+        self.topology = replay.topology
+        self.current_diff = next((k for k, v in DIFFICULTIES.items()
+                                  if v == (replay.rows, replay.cols, replay.mines)), "custom")
+        self._new_game(replay.rows, replay.cols, replay.mines, board=replay.board())
+        self.recorder = None
+        self.history = None
+        self.replay = replay
+        self._replay_pos = 0
+        self._replay_start = next((t for t, kind, _ in replay.events if kind == REVEAL), 0)
+        if replay.events:
+            self.replay_job = self.after(300, self._replay_step)
+
+    def _replay_step(self):
+        self.replay_job = None
+        if self.board_job is not None:
+            # The previous move is still on the worker: events stay in order
+            self.replay_job = self.after(JOB_POLL_MS, self._replay_step)
+            return
+        replay = self.replay
+        t, kind, i = replay.events[self._replay_pos]
+        self._replay_pos += 1
+        # The counter shows recorded game time, whatever the playback speed.
+        self.time_var.set(f"{min(max(t - self._replay_start, 0) // 1000, 999):03d}")
+        (self._on_left, self._on_right, self._on_chord)[kind](*divmod(i, replay.cols))
+        self._stop_timer()
+        if self.replay is replay and not self.game_over and self._replay_pos < len(replay.events):
+            delay = (replay.events[self._replay_pos][0] - t) / self.replay_speed
+            self.replay_job = self.after(max(1, int(delay)), self._replay_step)
+
+    def _stop_replay(self):
+        if self.replay_job is not None:
+            try:
+                self.after_cancel(self.replay_job)
+            except Exception:
+                pass
+            self.replay_job = None
+        self.replay = None
+
+    # ---- Races ----
+    # The server owns the board; moves are sent as they are clicked and the
+    # local board is a copy kept current from the diffs the server answers
+    # with (see race.py), polled every RACE_POLL_MS. race.py pulls in
+    # asyncio, so it is only imported once a race is joined.
+    def join_race_dialog(self):
+        from .race import parse_address
+        lang = self.lang
+        title = T(lang, "join_race")
+        addr = simpledialog.askstring(title, T(lang, "race_address"), initialvalue=f"127.0.0.1:{RACE_PORT}",
+                                      parent=self)
+        if not addr: return
+        room = simpledialog.askstring(title, T(lang, "race_room"), initialvalue=self.race_room or "lobby",
+                                      parent=self)
+        if not room: return
+        try:
+            host, port = parse_address(addr)
+        except ValueError:
+            messagebox.showerror(title, T(lang, "race_bad_address"))
+            return
+        self.join_race(host, port, room)
+
+    def join_race(self, host, port, room):
+        """Play ``room`` on the race server at host:port with the current
+        board settings (the room's own if it already exists)."""
+        from .race import RaceClient
+        self.leave_race()
+        try:
+            client = RaceClient(host, port)
+        except OSError as e:
+            messagebox.showerror(T(self.lang, "join_race"), str(e))
+            return
+        self.race, self.race_room = client, room
+        self._join_race_room()
+        self._poll_race()
+
+    def leave_race(self):
+        if self.race is None:
+            return
+        if self.race_job is not None:
+            self.after_cancel(self.race_job)
+            self.race_job = None
+        self.race.close()
+        self.race = None
+        self.race_peers = {}
+        self.title(APP_NAME)
+
+    def _join_race_room(self):
+        self.race_peers = {}
+        self.race.join(self.race_room, self.current_rows, self.current_cols, self.current_mines, self.topology)
+
+    def _race_move(self, kind, r, c):
+        if not self.game_over:
+            self.race.move(kind, r * self.board.cols + c)
+
+    def _poll_race(self):
+        self.race_job = None
+        for msg in self.race.poll():
+            getattr(self, f"_race_{msg[0]}")(*msg[1:])
+            if self.race is None:
+                return
+        self.race_job = self.after(RACE_POLL_MS, self._poll_race)
+
+    def _race_welcome(self, player, rows, cols, mines, topology, seed):
+        self.topology = topology
+        self.current_rows, self.current_cols, self.current_mines = rows, cols, mines
+        self.current_diff = next((k for k, v in DIFFICULTIES.items() if v == (rows, cols, mines)), "custom")
+        self._new_game(rows, cols, mines)
+        self.recorder = None  # the layout depends on the room's start cell, not a first click
+        self.seed = seed
+        self.first_click = False
+        self._start_timer()
+
+    @traced("race")
+    def _race_diff(self, status, cells, rtt):
+        from .race import apply_diff, WON, LOST
+        if rtt is not None:
+            self.perf.add("race.rtt", rtt)
+        b = self.board
+        t = time.perf_counter()
+        revealed, flags, bang = apply_diff(b, cells)
+        self.latency.board(t, len(cells))
+        self._heat_touch(revealed + flags)
+        for i in flags:
+            self.view.render_cell(*b.pos(i))
+        if flags:
+            if b.cell_state[flags[-1]] == FLAGGED:
+                self.audio.play("flag")
+            self._update_mine_counter()
+        if status == LOST:
+            self._reveal_all_mines(bang=b.pos(bang) if bang is not None else None)
+            self._lose()
+            self.audio.play("boom")
+            return
+        if revealed:
+            self._render_new([b.pos(i) for i in revealed])
+            if rtt is not None:
+                self.audio.play("click")
+        self._update_race_title()
+        if status == WON:
+            self._win()
+
+    def _race_peer(self, player, revealed, status):
+        from .race import LEFT
+        if status == LEFT:
+            self.race_peers.pop(player, None)
+        else:
+            self.race_peers[player] = (revealed, status)
+        self._update_race_title()
+
+    def _race_error(self, text):
+        messagebox.showerror(T(self.lang, "join_race"), text)
+
+    def _race_closed(self):
+        self.leave_race()
+        messagebox.showinfo(T(self.lang, "join_race"), T(self.lang, "race_closed"))
+
+    def _update_race_title(self):
+        from .race import WON, LOST
+        b = self.board
+        safe = max(1, b.size - b.mines_total)
+        parts = [f"{T(self.lang, 'race_you')} {100 * b.revealed_count // safe}%"]
+        for player, (revealed, status) in sorted(self.race_peers.items()):
+            parts.append(f"#{player} " + {WON: "✔", LOST: "✖"}.get(status, f"{100 * revealed // safe}%"))
+        self.title(f"{APP_NAME} — {self.race_room}: " + " · ".join(parts))
+
+    # ---- Rendering ----
+    def _render_new(self, cells, origin=None):
+        self.render_queue.push(cells, origin)
+
+    def _reveal_all_mines(self, bang=None):
+        self._stop_heat()
+        with self.perf.timer("reveal_mines"):
+            self.view.reveal_mines(bang)
+        self.latency.touch(self.board.mines_total)
+
+    def _repaint_board(self):
+        with self.perf.timer("repaint"):
+            self.view.repaint()
+        if self.board:
+            self.latency.touch(self.board.size)
+
+    def _after_paint(self, tr):
+        try:
+            self.after_idle(self.latency.finish, tr)
+        except Exception:
+            pass  # window already gone
+
+    # ---- End states ----
+    def _lose(self):
+        self.game_over = True
+        self._record_game()
+        self.face_btn.config(text=FACE_LOST)
+        self._stop_timer()
+        self.latency.cut()
+        messagebox.showinfo(T(self.lang, "you_lose"), T(self.lang, "you_lose"))
+
+    def _win(self):
+        self.game_over = True
+        self._stop_heat()
+        self.face_btn.config(text=FACE_WON)
+        self._stop_timer()
+        elapsed = int(self.time_var.get())
+        seconds = self._game_seconds()
+        # Auto-flag remaining mines
+        b = self.board
+        auto = []
+        for i in range(b.size):
+            if b.mine_map[i] and b.cell_state[i] != FLAGGED:
+                b.cell_state[i] = FLAGGED
+                auto.append(b.pos(i))
+        self.view.mark_flags(auto, "#2E7D32")
+        self._update_mine_counter()
+        self.audio.play("win")
+
+        diff_label = {
+            "beginner": T(self.lang, "beginner"),
+            "intermediate": T(self.lang, "intermediate"),
+            "expert": T(self.lang, "expert"),
+            "custom": T(self.lang, "custom"),
+        }.get(self.current_diff, "Custom")
+
+        msg = T(self.lang, "cleared_in", seconds=elapsed)
+        new_record = False
+        pct = None
+        if self.replay is None and self.history is None and self.race is None:
+            # Every board has its own record, custom sizes and topologies
+            # included. Races are not in the store, so they set no record.
+            key = (b.rows, b.cols, b.mines_total, b.topology)
+            if self.store is not None:
+                pct = self.store.percentile(key, seconds)
+            best = self.best_times.get(key)
+            if best is None or seconds < best:
+                self.best_times[key] = seconds
+                new_record = True
+        self._record_game()
+        if new_record:
+            msg += f"\n{T(self.lang, 'new_record', difficulty=diff_label.split('(')[0].strip(), seconds=elapsed)}"
+        elif pct is not None:
+            msg += f"\n{T(self.lang, 'faster_than', pct=pct)}"
+        self.latency.cut()
+        messagebox.showinfo(T(self.lang, "you_win"), msg)
+
+    # ---- Timer / counters ----
+    def _start_timer(self):
+        if self.start_time is None:
+            self.start_time = time.time()
+            self._tick_timer()
+
+    def _tick_timer(self):
+        # Drift: how late this tick ran compared to when it was scheduled
+        now = time.perf_counter()
+        if self._tick_due is not None:
+            self.perf.add("tick_drift", (now - self._tick_due) * 1000.0)
+        elapsed = int(time.time() - self.start_time)
+        self.time_var.set(f"{min(elapsed, 999):03d}")
+        self._tick_due = now + 1.0
+        self.timer_job = self.after(1000, self._tick_timer)
+
+    def _stop_timer(self):
+        self._tick_due = None
+        if self.timer_job is not None:
+            self.after_cancel(self.timer_job)
+            self.timer_job = None
+
+    def _update_mine_counter(self):
+        remaining = max(0, self.board.mines_total - self.board.flag_count) if self.board else 0
+        self.mine_var.set(f"{min(remaining, 999):03d}")
+        self.mine_label.configure(fg=self.theme_cfg["counter"])
+        self.time_label.configure(fg=self.theme_cfg["time"])
+
+    # ---- About / Exit ----
+    def _confirm_exit(self):
+        if messagebox.askokcancel(T(self.lang, "confirm_exit_title"), T(self.lang, "confirm_exit_text")):
+            self._shutdown()
+
+    def _shutdown(self):
+        self.leave_race()
+        # A move still on the worker finishes and is delivered first (a hit
+        # or a win ends the game there), so the save is consistent; if it
+        # does not finish in time the board is half-updated, so the save
+        # from before is kept rather than overwritten with it
+        self.queued_clicks.clear()
+        stopped = self.jobs.shutdown(JOB_EXIT_WAIT_S)
+        if not (stopped and self._save_game()):
+            self._record_game()
+        if self.store is not None:
+            self.store.close()
+        self.audio.close()
+        if self.no_guess_pool:
+            self.no_guess_pool.shutdown()
+        if self.perf.echo and self.perf.samples:
+            print(self.perf.report(), file=sys.stderr)
+        if perf_file():
+            try:
+                self._export_perf(perf_file())
+            except Exception:
+                pass
+        self.destroy()
+
+    # ---- Performance overlay ----
+    # Live input latency per handler (see perf.InputLatency), cells touched
+    # per event and timer drift, refreshed every PERF_OVERLAY_MS while shown.
+    def toggle_perf_overlay(self):
+        if self.perf_overlay is not None:
+            if self.perf_overlay_job is not None:
+                self.after_cancel(self.perf_overlay_job)
+                self.perf_overlay_job = None
+            self.perf_overlay.destroy()
+            self.perf_overlay = None
+            return
+        t = self.theme_cfg
+        self.perf_overlay = tk.Label(self, font=("Consolas", 9), justify="left", anchor="nw",
+                                     bg=t["panel_dark"], fg=t["text"], padx=6, pady=4)
+        self.perf_overlay.place(relx=1.0, rely=1.0, x=-4, y=-4, anchor="se")
+        self._refresh_perf_overlay()
+
+    def _refresh_perf_overlay(self):
+        self.perf_overlay.config(text="\n".join(self._perf_lines()))
+        self.perf_overlay_job = self.after(PERF_OVERLAY_MS, self._refresh_perf_overlay)
+
+    def _perf_lines(self):
+        lines = [f"{'input':<10}{'n':>5}{'p50':>8}{'p95':>8}{'p99':>8}  cells"]
+        for name in self.latency.handlers():
+            st = self.perf.summary(f"input.{name}")
+            cells = self.latency.cells.summary(name)
+            lines.append(f"{name:<10}{st['count']:>5}{st['p50']:>8.1f}{st['p95']:>8.1f}{st['p99']:>8.1f}"
+                         f"  {cells['p50']:.0f}/{cells['max']:.0f}")
+        rtt = self.perf.summary("race.rtt")
+        if rtt:
+            lines.append(f"{'race rtt':<10}{rtt['count']:>5}{rtt['p50']:>8.1f}{rtt['p95']:>8.1f}"
+                         f"{rtt['p99']:>8.1f}")
+        job = self.perf.summary("job.run")
+        if job:
+            lines.append(f"{'jobs':<10}{job['count']:>5}{job['p50']:>8.1f}{job['p95']:>8.1f}"
+                         f"{job['p99']:>8.1f}  wait {self.perf.summary('job.delivery')['p50']:.1f}")
+        heat = self.perf.summary("heatmap")
+        if heat:
+            lines.append(f"{'heat map':<10}{heat['count']:>5}{heat['p50']:>8.1f}{heat['p95']:>8.1f}"
+                         f"{heat['p99']:>8.1f}")
+        drift = self.perf.summary("tick_drift")
+        if drift:
+            lines.append(f"{'tick drift':<10}{drift['count']:>5}{drift['p50']:>8.1f}{drift['p95']:>8.1f}"
+                         f"{drift['p99']:>8.1f}  max {drift['max']:.1f}")
+        if len(lines) == 1:
+            lines.append("(no input yet)")
+        lines.append("ms; cells p50/max")
+        return lines
+
+    def export_perf(self):
+        path = filedialog.asksaveasfilename(title=T(self.lang, "export_perf"), defaultextension=".json",
+                                            initialfile="gridbreaker-perf.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self._export_perf(path)
+        except OSError as e:
+            messagebox.showerror(T(self.lang, "export_perf"), str(e))
+
+    def _export_perf(self, path):
+        export_perf(path, timings=self.perf, cells=self.latency.cells)
+
+    # ---- Best times ----
+    def _load_best(self):
+        # Runs on the startup loader thread; opening the store also imports
+        # the old JSON best times the first time.
+        try:
+            self.store = GameStore(STATS_DB, legacy_json=HIGHSCORE_FILE)
+            return self.store.best_times()
+        except Exception:
+            self.store = None
+            return {}
+
+    def show_stats(self):
+        if self.store is None or self.board is None:
+            return
+        b = self.board
+        key = (b.rows, b.cols, b.mines_total, b.topology)
+        counts = self.store.summary(key)
+        played, won = sum(counts.values()), counts["won"]
+        lines = [T(self.lang, "stats_played", played=played, won=won, rate=100.0 * won / played if played else 0.0)]
+        top = self.store.top(key, 5)
+        if top:
+            lines.append(f"{T(self.lang, 'stats_best')}: " + ", ".join(f"{s:.1f}s" for s, _ in top))
+        recent = self.store.recent(10, key)
+        if recent:
+            marks = {"won": "✔", "lost": "✖", "abandoned": "…"}
+            lines.append(f"{T(self.lang, 'stats_recent')}: " +
+                         " ".join(f"{marks.get(g['outcome'], '?')}{g['seconds']:.0f}s" for g in recent))
+        messagebox.showinfo(T(self.lang, "statistics"), "\n".join(lines))
+
+
+
+def main(splash=True, measure=False, replay=None, speed=1.0, race=None):
+    """Run the game. ``measure`` prints startup phase timings once the
+    window is up and then exits; ``replay`` is played back once it is, and
+    ``race`` (host, port, room) joined."""
+    multiprocessing.freeze_support()  # no-guess pool workers in frozen builds
+    app = App(splash=splash, measure=measure)
+    if replay is not None:
+        app.pending_replay = (replay, speed)
+    if race is not None:
+        app.pending_race = race
+    app.mainloop()
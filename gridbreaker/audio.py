@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Optional sound effects, played from a background worker thread.
+
+pygame is imported, the mixer opened and every sound decoded on the worker,
+never on the Tk thread. play() only drops a command into a bounded queue
+and returns; when the queue is full the sound is skipped. Bursts are thinned
+twice: repeats of a sound within MERGE_MS are dropped before queueing, and
+the worker plays each sound at most once per batch of pending commands and
+never with more than MAX_VOICES copies audible at the same time.
+"""
+
+import os
+import time
+import queue
+import threading
+
+from .config import SOUNDS_DIR
+
+SOUND_NAMES = ("click", "flag", "boom", "win")
+
+# -----------------------------
+# Audio Manager
+# -----------------------------
+class AudioManager:
+    QUEUE_SIZE = 32
+    MERGE_MS = 30                  # same sound again within this window is dropped
+    MAX_VOICES = {"click": 2, "flag": 2, "boom": 1, "win": 1}
+    MIXER = {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512}
+
+    def __init__(self, start=True):
+        self.enabled = False
+        self.sounds = {}
+        self.mixer = None
+        self.ready = threading.Event()   # set once loading finished (or failed)
+        self._queue = queue.Queue(self.QUEUE_SIZE)
+        self._last = {}
+        self._thread = None
+        self._closed = False
+        if start:
+            self.start()
+
+    def start(self):
+        if self._thread is not None or self._closed:
+            return
+        self._thread = threading.Thread(target=self._run, name="gridbreaker-audio", daemon=True)
+        self._thread.start()
+
+    def play(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if (now - self._last.get(name, -1.0)) * 1000.0 < self.MERGE_MS:
+            return
+        self._last[name] = now
+        try:
+            self._queue.put_nowait(name)
+        except queue.Full:
+            pass
+
+    def close(self):
+        self._closed = True
+        self.enabled = False
+        if self._thread is None:
+            return
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # Worker is behind; make room for the stop command.
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(None)
+        self._thread.join(0.5)
+
+    # ---- Worker thread ----
+    def _run(self):
+        try:
+            self._open()
+        finally:
+            self.ready.set()
+        if self.mixer is None:
+            return
+        self.enabled = not self._closed
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            try:
+                while True:
+                    batch.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:
+                break
+            for name in dict.fromkeys(batch):
+                self._play_now(name)
+        try:
+            self.mixer.quit()
+        except Exception:
+            pass
+
+    def _open(self):
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        try:
+            import pygame
+            pygame.mixer.pre_init(**self.MIXER)
+            pygame.mixer.init()
+            self.mixer = pygame.mixer
+        except Exception:
+            self.mixer = None
+            return
+        self._load_sounds()
+
+    def _load_sounds(self):
+        # Optional: click.wav, flag.wav, boom.wav, win.wav
+        for name in SOUND_NAMES:
+            path = os.path.join(SOUNDS_DIR, f"{name}.wav")
+            if os.path.exists(path):
+                try:
+                    self.sounds[name] = self.mixer.Sound(path)
+                except Exception:
+                    pass
+
+    def _play_now(self, name):
+        s = self.sounds.get(name)
+        if s is None:
+            return
+        try:
+            if s.get_num_channels() < self.MAX_VOICES.get(name, 2):
+                s.play()
+        except Exception:
+            pass
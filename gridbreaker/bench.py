@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the Board hot paths, headless and reproducible.
+
+Every case is a board (the DIFFICULTIES plus synthetic boards up to millions
+of cells at expert density) and one operation:
+
+    place_mines     sample mines and label openings on a fresh board
+    reveal_opening  reveal a zero of the largest region (bulk opening path)
+    reveal_flood    the same with a flag in the region (flood-fill path)
+    reveal_cell     reveal single numbered cells
+    chord_reveal    chord numbered cells whose mines are flagged
+    toggle_flag     flag and unflag hidden cells
+    is_win          the win check after every move
+
+The two opening cases run on a board of the same size with OPEN_DENSITY
+mines instead, where one click opens nearly everything: the worst case.
+
+Layouts and the cells each operation touches come from
+``random.Random(f"{seed}:{case}")``, so two runs with the same seed time
+exactly the same work. Samples are milliseconds per call. Each series is
+summarized as percentiles plus its minimum; comparisons against a saved
+baseline use the minimum, which scheduler noise can only push up, and fail
+when it slows down by more than the tolerance.
+"""
+
+import sys
+import json
+import time
+import random
+import platform
+
+from .config import BENCH_OPS, BENCH_SIZES
+from .engine import Board, DIFFICULTIES, HIDDEN, FLAGGED
+from .perf import Timings
+
+OPS = BENCH_OPS
+SYNTHETIC = BENCH_SIZES
+DENSITY = DIFFICULTIES["expert"][2] / (DIFFICULTIES["expert"][0] * DIFFICULTIES["expert"][1])
+OPEN_DENSITY = 0.001
+OPENING_OPS = ("reveal_opening", "reveal_flood")
+IS_WIN_LOOP = 1000      # is_win is too fast to time one call at a time
+NOISE_FLOOR_MS = 0.001  # ignore slowdowns smaller than this in comparisons
+FORMAT = 1
+
+
+# -----------------------------
+# Cases
+# -----------------------------
+def board_cases(sizes=SYNTHETIC):
+    """(name, rows, cols, mines): the difficulties, then the synthetic sizes."""
+    cases = [(name, rows, cols, mines) for name, (rows, cols, mines)
+             in sorted(DIFFICULTIES.items(), key=lambda kv: kv[1][0] * kv[1][1])]
+    for size in sizes:
+        rows, cols = (int(n) for n in size.lower().split("x"))
+        cases.append((f"{rows}x{cols}", rows, cols, int(rows * cols * DENSITY)))
+    return cases
+
+
+def _clear(board):
+    """Back to the state right after mine placement, keeping the layout."""
+    board.cell_state[:] = bytes(board.size)
+    board.revealed_count = board.flag_count = 0
+    board.region_opened[:] = bytes(len(board.region_opened))
+    for k in range(len(board.region_flags)):
+        board.region_flags[k] = 0
+
+
+def _largest_region(board):
+    offsets = board.open_offsets
+    if len(offsets) < 2:
+        return -1
+    return max(range(len(offsets) - 1), key=lambda k: offsets[k + 1] - offsets[k])
+
+
+# -----------------------------
+# Operations
+# -----------------------------
+# Each takes (board, rng, timings, name, cells) on a freshly cleared board
+# and adds one sample per timed call. Setup work stays outside the timers.
+def op_reveal_opening(board, rng, timings, name, cells, flood=False):
+    region = _largest_region(board)
+    if region < 0:
+        return
+    zero_region = board.zero_region
+    zeros = [i for i in board.opening(region) if zero_region[i] == region]
+    r, c = board.pos(zeros[rng.randrange(len(zeros))])
+    if flood and len(zeros) > 1:
+        # A flagged zero forces reveal() off the precomputed opening
+        other = next(i for i in zeros if board.pos(i) != (r, c))
+        board.toggle_flag(*board.pos(other))
+    t = time.perf_counter()
+    board.reveal(r, c)
+    timings.add(name, (time.perf_counter() - t) * 1000.0)
+
+
+def op_reveal_flood(board, rng, timings, name, cells):
+    op_reveal_opening(board, rng, timings, name, cells, flood=True)
+
+
+def _numbered(board, rng, cells):
+    counts, mines = board.counts, board.mine_map
+    numbered = [i for i in range(board.size) if counts[i] > 0 and not mines[i]]
+    return rng.sample(numbered, min(cells, len(numbered)))
+
+
+def op_reveal_cell(board, rng, timings, name, cells):
+    for i in _numbered(board, rng, cells):
+        r, c = board.pos(i)
+        t = time.perf_counter()
+        board.reveal(r, c)
+        timings.add(name, (time.perf_counter() - t) * 1000.0)
+
+
+def op_chord_reveal(board, rng, timings, name, cells):
+    state, mines = board.cell_state, board.mine_map
+    for i in _numbered(board, rng, cells):
+        r, c = board.pos(i)
+        if state[i] == HIDDEN:
+            board.reveal(r, c)
+        for j in board._neighbor_indices(i):
+            if mines[j] and state[j] != FLAGGED:
+                board.toggle_flag(*board.pos(j))
+        t = time.perf_counter()
+        board.chord_reveal(r, c)
+        timings.add(name, (time.perf_counter() - t) * 1000.0)
+
+
+def op_toggle_flag(board, rng, timings, name, cells):
+    for i in rng.sample(range(board.size), min(cells, board.size)):
+        r, c = board.pos(i)
+        for _ in range(2):
+            t = time.perf_counter()
+            board.toggle_flag(r, c)
+            timings.add(name, (time.perf_counter() - t) * 1000.0)
+
+
+def op_is_win(board, rng, timings, name, cells):
+    is_win = board.is_win
+    for _ in range(max(1, cells // 10)):
+        t = time.perf_counter()
+        for _ in range(IS_WIN_LOOP):
+            is_win()
+        timings.add(name, (time.perf_counter() - t) * 1000.0 / IS_WIN_LOOP)
+
+
+PLAY_OPS = {
+    "reveal_opening": op_reveal_opening,
+    "reveal_flood": op_reveal_flood,
+    "reveal_cell": op_reveal_cell,
+    "chord_reveal": op_chord_reveal,
+    "toggle_flag": op_toggle_flag,
+    "is_win": op_is_win,
+}
+
+
+def bench_case(rows, cols, mines, topology, ops, seed, label, repeat=5, cells=200, timings=None):
+    """Time ``ops`` on one board; returns the Timings with one sample
+    series per op, named ``{label}/{topology}/{op}``."""
+    timings = timings or Timings(maxlen=None, echo=False)
+    prefix = f"{label}/{topology}"
+    safe = (rows // 2, cols // 2)
+    board = None
+    timed = "place_mines" in ops
+    for _ in range(repeat if timed else 1):
+        fresh = Board(rows, cols, mines, topology, rng=random.Random(f"{seed}:{prefix}"))
+        t = time.perf_counter()
+        fresh.place_mines(*safe)
+        if timed:
+            timings.add(f"{prefix}/place_mines", (time.perf_counter() - t) * 1000.0)
+        board = board or fresh
+    open_board = None
+    if any(op in OPENING_OPS for op in ops):
+        open_board = Board(rows, cols, max(1, int(rows * cols * OPEN_DENSITY)), topology,
+                           rng=random.Random(f"{seed}:{prefix}:open"))
+        open_board.place_mines(*safe)
+    for op in ops:
+        if op not in PLAY_OPS:
+            continue
+        target = open_board if op in OPENING_OPS else board
+        # One untimed pass first, so caches and allocators are warm
+        _clear(target)
+        PLAY_OPS[op](target, random.Random(seed), Timings(echo=False), op, cells)
+        rng = random.Random(f"{seed}:{prefix}:{op}")
+        for _ in range(repeat):
+            _clear(target)
+            PLAY_OPS[op](target, rng, timings, f"{prefix}/{op}", cells)
+    return timings
+
+
+def run_bench(cases, topologies=("square",), ops=OPS, seed=0, repeat=5, cells=200, progress=None):
+    """Benchmark every case on every topology; returns the JSON-ready
+    results document."""
+    results = {}
+    for label, rows, cols, mines in cases:
+        for topology in topologies:
+            timings = bench_case(rows, cols, mines, topology, ops, seed, label, repeat, cells)
+            for name in timings.samples:
+                summary = timings.summary(name)
+                del summary["last"]
+                summary["min"] = min(timings.samples[name])
+                summary.update(rows=rows, cols=cols, mines=mines, topology=topology,
+                               op=name.rsplit("/", 1)[1])
+                results[name] = summary
+                if progress:
+                    progress(name, summary)
+    return {
+        "format": FORMAT, "unit": "ms", "seed": seed, "repeat": repeat, "cells": cells,
+        "python": platform.python_version(), "implementation": platform.python_implementation(),
+        "machine": platform.machine(), "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.2):
+    """(name, base min, new min, ratio, regressed) for every benchmark in both."""
+    rows = []
+    base = baseline.get("results", {})
+    for name, now in current["results"].items():
+        if name not in base:
+            continue
+        old, new = base[name]["min"], now["min"]
+        ratio = new / old if old else float("inf")
+        regressed = ratio > 1.0 + tolerance and new - old > NOISE_FLOOR_MS
+        rows.append((name, old, new, ratio, regressed))
+    return rows
+
+
+# -----------------------------
+# CLI (python -m gridbreaker bench; arguments in __main__)
+# -----------------------------
+def _fmt(ms):
+    if ms >= 1.0:
+        return f"{ms:9.2f} ms"
+    if ms >= 0.001:
+        return f"{ms * 1000:9.2f} us"
+    return f"{ms * 1e6:9.1f} ns"
+
+
+def run(args):
+    def progress(name, st):
+        print(f"{name:<40} n={st['count']:<6} min {_fmt(st['min'])}  p50 {_fmt(st['p50'])}  "
+              f"p95 {_fmt(st['p95'])}  max {_fmt(st['max'])}", flush=True)
+
+    doc = run_bench(board_cases(args.sizes), args.topology, args.ops, args.seed,
+                    args.repeat, args.cells, progress)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("seed") != args.seed:
+        print(f"warning: baseline seed {baseline.get('seed')} differs from {args.seed}", file=sys.stderr)
+    rows = compare(doc, baseline, args.tolerance)
+    print(f"\nvs. {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for name, old, new, ratio, regressed in rows:
+        print(f"{name:<40} {_fmt(old)} -> {_fmt(new)}  {ratio - 1:+7.1%}{'  REGRESSION' if regressed else ''}")
+    failed = sum(r[4] for r in rows)
+    if failed:
+        print(f"{failed} regression(s)")
+        return 1
+    print("no regressions")
+    return 0
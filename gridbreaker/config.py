@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Paths and application-wide settings."""
+
+import os
+
+APP_NAME = "GridBreaker"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+SOUNDS_DIR = os.path.join(ASSETS_DIR, "sound")
+
+# Pre-SQLite best times; imported into STATS_DB once.
+HIGHSCORE_FILE = os.path.join(os.path.expanduser("~"), ".gridbreaker_besttimes.json")
+REPLAY_FILE = os.path.join(os.path.expanduser("~"), ".gridbreaker_replays.bin")
+SAVE_FILE = os.path.join(os.path.expanduser("~"), ".gridbreaker_save.bin")
+STATS_DB = os.path.join(os.path.expanduser("~"), ".gridbreaker_stats.sqlite3")
+
+# Budget for a cold ``import gridbreaker.engine`` in a fresh interpreter,
+# checked by ``python -m gridbreaker importtime``.
+ENGINE_IMPORT_BUDGET_MS = 25.0
+
+# The splash stays up at least this long, and otherwise only until startup
+# work (UI build, best times, sounds, splash image) has finished.
+SPLASH_MIN_MS = 700
+
+# Custom boards up to CUSTOM_MAX (rows, cols). Boards up to FULL_VIEW_MAX
+# have every cell drawn; larger ones go through the scrolling viewport.
+CUSTOM_MAX = (1000, 1000)
+FULL_VIEW_MAX = (24, 40)
+
+# Refresh interval of the performance overlay (View > Performance overlay).
+PERF_OVERLAY_MS = 500
+
+# Default race server port, and how often the window polls its connection.
+RACE_PORT = 47623
+RACE_POLL_MS = 15
+
+# Heat map overlay (View > Mine probabilities): solving time per refresh,
+# the delay before refreshing after a move (quick moves share a refresh),
+# and the pause between refreshes while some components are estimated.
+HEAT_BUDGET_MS = 30
+HEAT_DELAY_MS = 10
+HEAT_RETRY_MS = 60
+
+# Boards of OFFLOAD_MIN_CELLS and more place mines and reveal openings on a
+# worker thread (see jobs.py). Clicks made meanwhile wait in a queue of up
+# to JOB_QUEUE_MAX; later ones are dropped. On exit a running job gets
+# JOB_EXIT_WAIT_S seconds to finish before the game is saved.
+OFFLOAD_MIN_CELLS = 40000
+JOB_QUEUE_MAX = 16
+JOB_EXIT_WAIT_S = 5.0
+
+# Choices and defaults of the simulate, bench and endless commands, here so
+# that building the command line parser imports none of those modules.
+SIM_STRATEGIES = ("first-click", "random", "solver")   # sim.STRATEGIES
+SIM_FIRST_CLICKS = ("center", "corner", "random")
+BENCH_OPS = ("place_mines", "reveal_opening", "reveal_flood", "reveal_cell",
+             "chord_reveal", "toggle_flag", "is_win")
+BENCH_SIZES = ("300x300", "1000x1000")
+ENDLESS_DENSITY = 0.18
+ENDLESS_MAX_CHUNKS = 256
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+Endless boards: an unbounded square grid generated one chunk at a time.
+
+The plane is cut into CHUNK x CHUNK chunks addressed by (cy, cx) =
+(row // CHUNK, col // CHUNK), negative coordinates included. A chunk's
+mines are a pure function of the game seed, the first click and the chunk
+coordinates (``chunk_mines``), so they are never stored: any chunk can be
+regenerated at any time. Numbers are computed lazily, the first time a
+chunk needs one; cells on its border look at the mine maps of the eight
+neighboring chunks, which are regenerated (and cached) without loading
+those chunks.
+
+Only play state has to survive. At most ``max_chunks`` chunks stay in
+memory; the least recently used one is evicted, its cell states written
+to a ChunkStore (2 bits per cell, in SQLite) if anything in it changed,
+and read back when play returns to it.
+
+Zero cells must not percolate or one click could open an unbounded area,
+so the density is at least MIN_DENSITY; FLOOD_LIMIT caps a single reveal
+regardless. A capped flood is not cut short: the cells it still had to
+visit wait in ``flood`` (saved with the game) until continue_flood(), so
+every revealed zero ends up with all its neighbors revealed.
+"""
+
+import sys
+import time
+import random
+import sqlite3
+from array import array
+from collections import OrderedDict
+
+from .config import ENDLESS_DENSITY, ENDLESS_MAX_CHUNKS
+from .engine import HIDDEN, REVEALED, FLAGGED
+from .snapshot import pack, unpack
+
+CHUNK = 32
+CHUNK_CELLS = CHUNK * CHUNK
+MIN_DENSITY = 0.10
+DEFAULT_DENSITY = ENDLESS_DENSITY
+FLOOD_LIMIT = 250000
+MAX_CHUNKS = ENDLESS_MAX_CHUNKS
+
+_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def chunk_mines(seed, density, start, cy, cx):
+    """Mine map of chunk (cy, cx), one byte per cell, row-major. The 3x3
+    around ``start`` (the first click) is always mine-free."""
+    safe = set()
+    if start is not None:
+        sr, sc = start
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = sr + dr, sc + dc
+                if (r // CHUNK, c // CHUNK) == (cy, cx):
+                    safe.add((r % CHUNK) * CHUNK + c % CHUNK)
+    free = [i for i in range(CHUNK_CELLS) if i not in safe] if safe else range(CHUNK_CELLS)
+    mines = bytearray(CHUNK_CELLS)
+    for i in random.Random(f"{seed}:{cy}:{cx}").sample(free, round(density * CHUNK_CELLS)):
+        mines[i] = 1
+    return bytes(mines)
+
+
+# -----------------------------
+# Chunk store
+# -----------------------------
+class ChunkStore:
+    """Evicted chunk states plus the game's metadata. ``path=None`` keeps
+    them in memory (still packed, 256 bytes per chunk)."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.con = sqlite3.connect(path or ":memory:")
+        with self.con:
+            self.con.executescript(
+                "CREATE TABLE IF NOT EXISTS chunks (cy INTEGER, cx INTEGER, state BLOB NOT NULL, "
+                "PRIMARY KEY (cy, cx)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);")
+
+    def get(self, cy, cx):
+        row = self.con.execute("SELECT state FROM chunks WHERE cy = ? AND cx = ?", (cy, cx)).fetchone()
+        return bytearray(unpack(row[0], 4, CHUNK_CELLS)) if row else None
+
+    def put(self, cy, cx, state):
+        with self.con:
+            if state.count(HIDDEN) == CHUNK_CELLS:
+                self.con.execute("DELETE FROM chunks WHERE cy = ? AND cx = ?", (cy, cx))
+            else:
+                self.con.execute("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?)", (cy, cx, pack(state, 4)))
+
+    def __len__(self):
+        return self.con.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def meta(self):
+        return dict(self.con.execute("SELECT key, value FROM meta"))
+
+    def set_meta(self, **values):
+        with self.con:
+            self.con.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", values.items())
+
+    def close(self):
+        self.con.close()
+
+
+# -----------------------------
+# Endless board
+# -----------------------------
+class Chunk:
+    __slots__ = ("cy", "cx", "mines", "state", "counts", "dirty")
+
+    def __init__(self, cy, cx, mines, state):
+        self.cy, self.cx = cy, cx
+        self.mines = mines
+        self.state = state
+        self.counts = None   # array("b"), -1 for mines; built on first use
+        self.dirty = False
+
+
+class EndlessBoard:
+    """Board-like game on an unbounded grid. Coordinates are any ints.
+
+    reveal / chord_reveal / toggle_flag behave as on Board; there is no
+    win, only ``revealed_count`` as the score, and the game ends when
+    ``lost`` (the mine hit) is set. While ``flood`` is not empty a reveal
+    stopped at FLOOD_LIMIT; continue_flood() carries on with it.
+    """
+
+    topology = "square"
+
+    def __init__(self, seed, density=DEFAULT_DENSITY, store=None, max_chunks=MAX_CHUNKS):
+        if not MIN_DENSITY <= density < 1:
+            raise ValueError(f"density must be in [{MIN_DENSITY}, 1)")
+        self.seed = seed
+        self.density = density
+        self.store = store if store is not None else ChunkStore()
+        self.max_chunks = max(9, max_chunks)
+        self.start = None
+        self.lost = None
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.flood = []                # (r, c) a capped reveal has still to visit
+        self.evictions = 0
+        self._chunks = OrderedDict()   # (cy, cx) -> Chunk, least recently used first
+        self._mines = OrderedDict()    # (cy, cx) -> mine map, incl. chunks not loaded
+
+    @classmethod
+    def open(cls, path, seed=0, density=DEFAULT_DENSITY, max_chunks=MAX_CHUNKS):
+        """The game stored at ``path``, or a new one there."""
+        store = ChunkStore(path)
+        meta = store.meta()
+        if not meta:
+            return cls(seed, density, store, max_chunks)
+        board = cls(int(meta["seed"]), float(meta["density"]), store, max_chunks)
+        if meta.get("start_r") is not None:
+            board.start = (int(meta["start_r"]), int(meta["start_c"]))
+        if meta.get("lost_r") is not None:
+            board.lost = (int(meta["lost_r"]), int(meta["lost_c"]))
+        board.revealed_count = int(meta["revealed"])
+        board.flag_count = int(meta["flags"])
+        if meta.get("flood"):
+            flat = array("q", meta["flood"])
+            board.flood = list(zip(flat[::2], flat[1::2]))
+        return board
+
+    def save(self):
+        """Write every changed chunk and the counters to the store."""
+        for ch in self._chunks.values():
+            if ch.dirty:
+                self.store.put(ch.cy, ch.cx, ch.state)
+                ch.dirty = False
+        start, lost = self.start or (None, None), self.lost or (None, None)
+        flood = array("q", [x for cell in self.flood for x in cell]).tobytes() if self.flood else None
+        self.store.set_meta(seed=self.seed, density=self.density, revealed=self.revealed_count,
+                            flags=self.flag_count, start_r=start[0], start_c=start[1],
+                            lost_r=lost[0], lost_c=lost[1], flood=flood, saved_at=time.time())
+
+    def close(self):
+        self.save()
+        self.store.close()
+
+    # ---- Chunks ----
+    @property
+    def chunks_loaded(self):
+        return len(self._chunks)
+
+    def _mine_map(self, cy, cx):
+        key = (cy, cx)
+        m = self._mines.get(key)
+        if m is None:
+            m = self._mines[key] = chunk_mines(self.seed, self.density, self.start, cy, cx)
+            if len(self._mines) > 4 * self.max_chunks:
+                self._mines.popitem(last=False)
+        else:
+            self._mines.move_to_end(key)
+        return m
+
+    def _chunk(self, cy, cx):
+        key = (cy, cx)
+        ch = self._chunks.get(key)
+        if ch is not None:
+            self._chunks.move_to_end(key)
+            return ch
+        state = self.store.get(cy, cx) or bytearray(CHUNK_CELLS)
+        ch = self._chunks[key] = Chunk(cy, cx, self._mine_map(cy, cx), state)
+        if len(self._chunks) > self.max_chunks:
+            _, old = self._chunks.popitem(last=False)
+            if old.dirty:
+                self.store.put(old.cy, old.cx, old.state)
+            self.evictions += 1
+        return ch
+
+    def _locate(self, r, c):
+        cy, lr = divmod(r, CHUNK)
+        cx, lc = divmod(c, CHUNK)
+        return self._chunk(cy, cx), lr * CHUNK + lc
+
+    def _counts(self, ch):
+        # Pad the chunk's mines with a one-cell ring from its neighbors'
+        # mine maps, then sum 3x3 boxes: row sums first, then columns.
+        cy, cx = ch.cy, ch.cx
+        w = CHUNK + 2
+        rows = []
+        for dy, lr in ((-1, CHUNK - 1),) + tuple((0, r) for r in range(CHUNK)) + ((1, 0),):
+            west, mid, east = (self._mine_map(cy + dy, cx + dx) if dy or dx else ch.mines
+                               for dx in (-1, 0, 1))
+            base = lr * CHUNK
+            rows.append(bytes((west[base + CHUNK - 1],)) + mid[base:base + CHUNK] + bytes((east[base],)))
+        hsum = [[row[k] + row[k + 1] + row[k + 2] for k in range(CHUNK)] for row in rows]
+        counts = array("b", bytes(CHUNK_CELLS))
+        mines = ch.mines
+        for r in range(CHUNK):
+            a, b, c = hsum[r], hsum[r + 1], hsum[r + 2]
+            base = r * CHUNK
+            for k in range(CHUNK):
+                counts[base + k] = -1 if mines[base + k] else a[k] + b[k] + c[k]
+        ch.counts = counts
+        return counts
+
+    # ---- Queries ----
+    def state_at(self, r, c):
+        ch, i = self._locate(r, c)
+        return ch.state[i]
+
+    def number_at(self, r, c):
+        ch, i = self._locate(r, c)
+        return (ch.counts or self._counts(ch))[i]
+
+    def mine_at(self, r, c):
+        cy, lr = divmod(r, CHUNK)
+        cx, lc = divmod(c, CHUNK)
+        return self._mine_map(cy, cx)[lr * CHUNK + lc] == 1
+
+    def neighbors(self, r, c):
+        for dr, dc in _DELTAS:
+            yield r + dr, c + dc
+
+    # ---- Moves ----
+    def _begin(self, r, c):
+        # The first click fixes the safe area, so anything generated before
+        # it (flags placed first) is regenerated around it.
+        self.start = (r, c)
+        self._mines.clear()
+        for ch in self._chunks.values():
+            ch.mines = self._mine_map(ch.cy, ch.cx)
+            ch.counts = None
+
+    def toggle_flag(self, r, c):
+        if self.lost:
+            return None
+        ch, i = self._locate(r, c)
+        st = ch.state[i]
+        if st == REVEALED:
+            return 0
+        ch.state[i] = FLAGGED if st == HIDDEN else HIDDEN
+        ch.dirty = True
+        delta = 1 if st == HIDDEN else -1
+        self.flag_count += delta
+        return delta
+
+    def reveal(self, r, c):
+        if self.lost:
+            return False, []
+        if self.start is None:
+            self._begin(r, c)
+        ch, i = self._locate(r, c)
+        if ch.state[i] != HIDDEN:
+            return False, []
+        if ch.mines[i]:
+            ch.state[i] = REVEALED
+            ch.dirty = True
+            self.lost = (r, c)
+            return True, [(r, c)]
+        return False, self._flood([(r, c)])
+
+    def continue_flood(self):
+        """Carry on with the reveal that stopped at FLOOD_LIMIT, for up to
+        FLOOD_LIMIT more cells; returns the cells revealed."""
+        stack, self.flood = self.flood, []
+        return self._flood(stack)
+
+    def _flood(self, stack):
+        # Flood fill. Each cell is marked before its neighbors are looked
+        # up, since looking them up may evict (and save) its chunk. At
+        # FLOOD_LIMIT cells what is left of the stack goes to ``flood``.
+        newly = []
+        while stack and len(newly) < FLOOD_LIMIT:
+            r, c = stack.pop()
+            ch, i = self._locate(r, c)
+            if ch.state[i] != HIDDEN:
+                continue
+            ch.state[i] = REVEALED
+            ch.dirty = True
+            newly.append((r, c))
+            if (ch.counts or self._counts(ch))[i] == 0:
+                stack.extend((r + dr, c + dc) for dr, dc in _DELTAS)
+        self.flood.extend(stack)
+        self.revealed_count += len(newly)
+        return newly
+
+    def chord_reveal(self, r, c):
+        ch, i = self._locate(r, c)
+        n = (ch.counts or self._counts(ch))[i]
+        if self.lost or ch.state[i] != REVEALED or n <= 0:
+            return False, []
+        around = list(self.neighbors(r, c))
+        if sum(1 for cell in around if self.state_at(*cell) == FLAGGED) != n:
+            return False, []
+        hit_mine, newly_all = False, []
+        for cell in around:
+            if self.state_at(*cell) == HIDDEN:
+                hm, newc = self.reveal(*cell)
+                hit_mine = hit_mine or hm
+                newly_all.extend(newc)
+        return hit_mine, newly_all
+
+    def is_win(self):
+        return False
+
+
+# -----------------------------
+# CLI (python -m gridbreaker endless; arguments in __main__)
+# -----------------------------
+def format_window(board, r0, c0, rows, cols):
+    lines = []
+    for r in range(r0, r0 + rows):
+        row = []
+        for c in range(c0, c0 + cols):
+            st = board.state_at(r, c)
+            if st == FLAGGED:
+                row.append("F")
+            elif st == HIDDEN:
+                row.append("#")
+            elif board.mine_at(r, c):
+                row.append("*")
+            else:
+                n = board.number_at(r, c)
+                row.append(str(n) if n else ".")
+        lines.append(" ".join(row))
+    return "\n".join(lines)
+
+
+def walk(board, cells, row=0):
+    """Reveal safe cells eastward along ``row`` until ``cells`` more are
+    revealed (peeks at the mines; a stress test for chunk eviction)."""
+    target = board.revealed_count + cells
+    c = board.start[1] if board.start else 0
+    while board.revealed_count < target and not board.lost:
+        for r in (row - 1, row, row + 1):
+            if not board.mine_at(r, c) and board.state_at(r, c) == HIDDEN:
+                board.reveal(r, c)
+        c += 1
+
+
+def run(args):
+    try:
+        if args.store:
+            board = EndlessBoard.open(args.store, args.seed, args.density, args.max_chunks)
+        else:
+            board = EndlessBoard(args.seed, args.density, max_chunks=args.max_chunks)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    t = time.perf_counter()
+    for r, c in args.flag:
+        board.toggle_flag(r, c)
+    for r, c in args.click:
+        board.reveal(r, c)
+    for r, c in args.chord:
+        board.chord_reveal(r, c)
+    if args.walk:
+        walk(board, args.walk)
+    dt = time.perf_counter() - t
+    if args.view:
+        print(format_window(board, *args.view))
+    board.save()
+    print(f"seed {board.seed}, density {board.density:.2f}: revealed {board.revealed_count}, "
+          f"flags {board.flag_count}{', lost at %s' % (board.lost,) if board.lost else ''}"
+          f"{', flood pending %d cells' % len(board.flood) if board.flood else ''}; "
+          f"chunks in memory {board.chunks_loaded}, evicted {board.evictions}, "
+          f"stored {len(board.store)}; {dt * 1000:.0f} ms")
+    board.store.close()
+    return 0 if not board.lost else 1
@@ -0,0 +1,590 @@
+# -*- coding: utf-8 -*-
+"""
+Headless GridBreaker engine: board state, topologies and game rules.
+
+This module must stay importable without tkinter, pygame or PIL so batch
+jobs (simulation, solving, benchmarks, servers) only pay for what they use.
+"""
+
+import re
+import random
+from array import array
+from functools import lru_cache
+
+# -----------------------------
+# Difficulties
+# -----------------------------
+DIFFICULTIES = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (16, 30, 99),
+}
+
+# -----------------------------
+# Game logic
+# -----------------------------
+# Cell state codes (one byte per cell in Board.cell_state)
+HIDDEN = 0
+REVEALED = 1
+FLAGGED = 2
+STATE_NAMES = ("hidden", "revealed", "flagged")
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+
+# Board topologies. "hex" uses the odd-r offset layout: odd rows sit half a
+# cell to the right, so each cell has six neighbors.
+TOPOLOGIES = ("square", "torus", "hex")
+
+_SQUARE_DELTAS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+_HEX_DELTAS_EVEN = ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0))
+_HEX_DELTAS_ODD = ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1))
+
+
+class NeighborTable:
+    """Cell adjacency in CSR form: the neighbors of flat index i are
+    ``indices[offsets[i]:offsets[i + 1]]``."""
+    __slots__ = ("rows", "cols", "topology", "offsets", "indices")
+
+    def __init__(self, rows, cols, topology, offsets, indices):
+        self.rows = rows
+        self.cols = cols
+        self.topology = topology
+        self.offsets = offsets
+        self.indices = indices
+
+    def of(self, i):
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i):
+        return self.offsets[i + 1] - self.offsets[i]
+
+
+def _row_neighbors(rows, cols, topology, r):
+    # Neighbor lists for every cell of row r, relative to the row start.
+    if topology == "hex":
+        deltas = _HEX_DELTAS_ODD if r & 1 else _HEX_DELTAS_EVEN
+    else:
+        deltas = _SQUARE_DELTAS
+    wrap = topology == "torus"
+    base = r * cols
+    out = []
+    for c in range(cols):
+        found = []
+        for dr, dc in deltas:
+            rr, cc = r + dr, c + dc
+            if wrap:
+                rr %= rows
+                cc %= cols
+            elif not (0 <= rr < rows and 0 <= cc < cols):
+                continue
+            j = rr * cols + cc - base
+            if j != c and j not in found:
+                found.append(j)
+        out.append(found)
+    return out
+
+
+@lru_cache(maxsize=16)
+def neighbor_table(rows, cols, topology="square"):
+    """Build (once per rows, cols, topology) the shared adjacency table."""
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown topology: {topology!r}")
+    # Rows away from the top/bottom edge share one relative neighbor pattern
+    # (two for hex, by row parity), so each pattern is built once and then
+    # shifted into place with C-level map/extend.
+    templates = {}
+    offsets = array("I", [0])
+    indices = array("I")
+    for r in range(rows):
+        key = (r == 0, r == rows - 1, r & 1 if topology == "hex" else 0)
+        tpl = templates.get(key)
+        if tpl is None:
+            per_cell = _row_neighbors(rows, cols, topology, r)
+            rel = array("i", [j for found in per_cell for j in found])
+            ends = array("I")
+            n = 0
+            for found in per_cell:
+                n += len(found)
+                ends.append(n)
+            tpl = templates[key] = (rel, ends)
+        rel, ends = tpl
+        indices.extend(map((r * cols).__add__, rel))
+        offsets.extend(map(offsets[-1].__add__, ends))
+    return NeighborTable(rows, cols, topology, offsets, indices)
+
+
+_ZERO_RUN = re.compile(rb"\x00+")
+_ONE_RUN = re.compile(rb"\x01+")
+_IS_REVEALED = bytes(1 if b == REVEALED else 0 for b in range(256))
+_IS_ZERO = bytes([1]) + bytes(255)
+
+class _RowView:
+    __slots__ = ("_grid", "_base")
+
+    def __init__(self, grid, base):
+        self._grid = grid
+        self._base = base
+
+    def __len__(self):
+        return self._grid._cols
+
+    def __getitem__(self, c):
+        if not 0 <= c < self._grid._cols:
+            raise IndexError(c)
+        return self._grid._decode(self._grid._buf[self._base + c])
+
+    def __setitem__(self, c, value):
+        if not 0 <= c < self._grid._cols:
+            raise IndexError(c)
+        self._grid._buf[self._base + c] = self._grid._encode(value)
+
+    def __iter__(self):
+        return (self[c] for c in range(self._grid._cols))
+
+
+class _GridView:
+    """Read/write ``view[r][c]`` access over a flat row-major buffer."""
+    __slots__ = ("_buf", "_rows", "_cols", "_decode", "_encode")
+
+    def __init__(self, buf, rows, cols, decode, encode):
+        self._buf = buf
+        self._rows = rows
+        self._cols = cols
+        self._decode = decode
+        self._encode = encode
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, r):
+        if not 0 <= r < self._rows:
+            raise IndexError(r)
+        return _RowView(self, r * self._cols)
+
+    def __iter__(self):
+        return (self[r] for r in range(self._rows))
+
+
+class Board:
+    # Flat row-major storage, one byte per cell:
+    #   cell_state: HIDDEN / REVEALED / FLAGGED
+    #   mine_map:   1 if the cell holds a mine
+    #   counts:     adjacent mine count, -1 for mines
+    # Adjacency comes from the shared NeighborTable for the board's topology.
+    # Once mines are placed, connected zero cells are labeled into regions
+    # and each region's opening (its zeros plus their bordering numbers) is
+    # stored in CSR form, so revealing a zero opens the region in one pass.
+    # The nested ``state`` / ``is_mine`` / ``number`` views keep the old
+    # ``board.state[r][c]`` API working on top of these buffers.
+    __slots__ = ("rows", "cols", "size", "mines_total", "topology", "adj", "rng",
+                 "cell_state", "mine_map", "counts",
+                 "mines_placed", "revealed_count", "flag_count",
+                 "zero_region", "open_offsets", "open_cells",
+                 "region_flags", "region_opened", "three_bv")
+
+    def __init__(self, rows, cols, mines, topology="square", rng=None):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.mines_total = mines
+        self.topology = topology
+        self.adj = neighbor_table(rows, cols, topology)
+        # Any object with random.Random's sample(); seeded Random instances
+        # make mine layouts reproducible.
+        self.rng = rng if rng is not None else random
+
+        self.cell_state = bytearray(self.size)
+        self.mine_map = bytearray(self.size)
+        self.counts = array("b", bytes(self.size))
+
+        self.mines_placed = False
+        self.revealed_count = 0
+        self.flag_count = 0
+
+        self.zero_region = None
+        self.open_offsets = self.open_cells = None
+        self.region_flags = self.region_opened = None
+        self.three_bv = 0
+
+    # ---- Compatibility views ----
+    @property
+    def state(self):
+        return _GridView(self.cell_state, self.rows, self.cols,
+                         STATE_NAMES.__getitem__, STATE_CODES.__getitem__)
+
+    @property
+    def is_mine(self):
+        return _GridView(self.mine_map, self.rows, self.cols, bool, int)
+
+    @property
+    def number(self):
+        return _GridView(self.counts, self.rows, self.cols, int, int)
+
+    # ---- Indexing ----
+    def idx(self, r, c):
+        return r * self.cols + c
+
+    def pos(self, i):
+        return divmod(i, self.cols)
+
+    def state_at(self, r, c):
+        return self.cell_state[r * self.cols + c]
+
+    def number_at(self, r, c):
+        return self.counts[r * self.cols + c]
+
+    def mine_at(self, r, c):
+        return self.mine_map[r * self.cols + c] == 1
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def neighbors(self, r, c):
+        cols = self.cols
+        for j in self._neighbor_indices(r * cols + c):
+            yield divmod(j, cols)
+
+    def _neighbor_indices(self, i):
+        adj = self.adj
+        return adj.indices[adj.offsets[i]:adj.offsets[i + 1]]
+
+    def place_mines(self, safe_r, safe_c):
+        safe = self.idx(safe_r, safe_c)
+        forbidden = sorted({safe, *self._neighbor_indices(safe)})
+        free = self.size - len(forbidden)
+        mines_to_place = min(self.mines_total, free)
+        # Sample positions among the free cells without materializing them:
+        # random.sample over a range is O(k), then each sampled rank is
+        # shifted past the (sorted, at most 9) forbidden indices.
+        mine_map = self.mine_map
+        for j in self.rng.sample(range(free), mines_to_place):
+            for f in forbidden:
+                if j >= f:
+                    j += 1
+                else:
+                    break
+            mine_map[j] = 1
+        self._finish_placement()
+
+    def set_mines(self, mine_map):
+        """Use a precomputed layout (one byte per cell, 1 = mine) instead of
+        sampling one, e.g. a pre-generated no-guess board."""
+        if len(mine_map) != self.size:
+            raise ValueError("mine map does not match board size")
+        self.mine_map[:] = mine_map
+        self._finish_placement()
+
+    def resume(self, mine_map, cell_state):
+        """Rebuild a game in progress from its layout and cell states (one
+        byte per cell each), e.g. from a saved snapshot."""
+        if len(cell_state) != self.size:
+            raise ValueError("cell states do not match board size")
+        self.cell_state[:] = cell_state
+        self.revealed_count = self.cell_state.count(REVEALED)
+        self.flag_count = self.cell_state.count(FLAGGED)
+        self.set_mines(mine_map)
+        # A region with any revealed zero has been opened, so reveal() must
+        # flood-fill it. Revealed zeros are found as runs of a byte mask;
+        # a run stays in one region within a row, so each run is looked up
+        # once per row it touches.
+        size, cols = self.size, self.cols
+        mask = (int.from_bytes(self.cell_state.translate(_IS_REVEALED), "little")
+                & int.from_bytes(self.counts.tobytes().translate(_IS_ZERO), "little"))
+        mask = mask.to_bytes(size, "little")
+        zero_region, opened = self.zero_region, self.region_opened
+        for m in _ONE_RUN.finditer(mask):
+            a, b = m.span()
+            opened[zero_region[a]] = 1
+            for i in range((a // cols + 1) * cols, b, cols):
+                opened[zero_region[i]] = 1
+
+    def _finish_placement(self):
+        self._compute_counts()
+        self._label_openings()
+        self.mines_placed = True
+
+    def _compute_counts(self):
+        if self.topology != "square":
+            self._scatter_counts()
+            return
+        # Neighbor counts for the whole grid as one 3x3 box sum over a
+        # big integer holding a byte per cell (little-endian, cell i at
+        # bits 8i..8i+7). Each lane stays <= 9, so lanes never carry, and
+        # the shifts/adds run in C regardless of board size.
+        size, cols = self.size, self.cols
+        if size == 0:
+            return
+        m = int.from_bytes(self.mine_map, "little")
+        not_first = int.from_bytes((b"\x00" + b"\x01" * (cols - 1)) * self.rows, "little")
+        not_last = int.from_bytes((b"\x01" * (cols - 1) + b"\x00") * self.rows, "little")
+        h = m + ((m & not_last) << 8) + ((m & not_first) >> 8)
+        row = 8 * cols
+        full = (1 << (8 * size)) - 1
+        total = h + ((h << row) & full) + (h >> row) - m
+        # Mine lanes become 0xFF, i.e. -1 once read back as signed bytes.
+        mines = m * 0xFF
+        total = (total & ~mines) | mines
+        self.counts = array("b", total.to_bytes(size, "little"))
+
+    def _scatter_counts(self):
+        # Any topology: each mine bumps its neighbors, O(mines * degree).
+        counts = array("b", bytes(self.size))
+        indices, offsets = self.adj.indices, self.adj.offsets
+        mine_map = self.mine_map
+        mines = []
+        i = mine_map.find(1)
+        while i != -1:
+            mines.append(i)
+            for n in indices[offsets[i]:offsets[i + 1]]:
+                counts[n] += 1
+            i = mine_map.find(1, i + 1)
+        for i in mines:
+            counts[i] = -1
+        self.counts = counts
+
+    def _label_openings(self):
+        if self.topology == "square":
+            zero_region, open_offsets, open_cells, covered = self._label_runs()
+        else:
+            zero_region, open_offsets, open_cells, covered = self._label_cells()
+        regions = len(open_offsets) - 1
+        self.zero_region = zero_region
+        self.open_offsets = open_offsets
+        self.open_cells = open_cells
+        self.region_opened = bytearray(regions)
+        self.region_flags = array("I", bytes(4 * regions))
+        # Flags may already sit on zero cells if placed before the first click
+        i = self.cell_state.find(FLAGGED)
+        while i != -1:
+            if zero_region[i] >= 0:
+                self.region_flags[zero_region[i]] += 1
+            i = self.cell_state.find(FLAGGED, i + 1)
+        # 3BV: clicks needed without flags = openings + numbers outside them
+        mines = self.mine_map.count(1)
+        zeros = self.counts.tobytes().count(0)
+        self.three_bv = regions + (self.size - mines - zeros - covered)
+
+    def _label_runs(self):
+        # Square boards: label horizontal runs of zeros instead of cells.
+        # Runs in adjacent rows join when their column spans touch
+        # (8-connectivity); each region's opening is the union of its runs
+        # grown by one cell, merged into row intervals and emitted with
+        # C-level range/slice operations.
+        rows, cols, size = self.rows, self.cols, self.size
+        data = self.counts.tobytes()
+        runs = []   # (row, first col, last col)
+        parent = []
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        prev = []
+        for r in range(rows):
+            base = r * cols
+            cur = []
+            j = 0
+            for m in _ZERO_RUN.finditer(data, base, base + cols):
+                a, b = m.start() - base, m.end() - base - 1
+                rid = len(runs)
+                runs.append((r, a, b))
+                parent.append(rid)
+                while j < len(prev) and runs[prev[j]][2] < a - 1:
+                    j += 1
+                k = j
+                while k < len(prev) and runs[prev[k]][1] <= b + 1:
+                    ra, rb = find(rid), find(prev[k])
+                    if ra != rb:
+                        parent[max(ra, rb)] = min(ra, rb)
+                    k += 1
+                cur.append(rid)
+            prev = cur
+
+        zero_region = array("i", [-1]) * size
+        ids = {}
+        spans = []
+        for rid, (r, a, b) in enumerate(runs):
+            g = ids.setdefault(find(rid), len(ids))
+            zero_region[r * cols + a:r * cols + b + 1] = array("i", [g]) * (b - a + 1)
+            lo, hi = max(a - 1, 0), min(b + 1, cols - 1)
+            for rr in (r - 1, r, r + 1):
+                if 0 <= rr < rows:
+                    spans.append((g, rr, lo, hi))
+        spans.sort()
+
+        mark = bytearray(size)
+        open_offsets = array("I", [0])
+        open_cells = array("I")
+
+        def emit(rr, lo, hi):
+            start = rr * cols
+            open_cells.extend(range(start + lo, start + hi + 1))
+            mark[start + lo:start + hi + 1] = b"\x01" * (hi - lo + 1)
+
+        last = None
+        for g, rr, lo, hi in spans:
+            if last and last[0] == g and last[1] == rr and lo <= last[3] + 1:
+                if hi > last[3]:
+                    last[3] = hi
+                continue
+            if last:
+                emit(last[1], last[2], last[3])
+                if last[0] != g:
+                    open_offsets.append(len(open_cells))
+            last = [g, rr, lo, hi]
+        if last:
+            emit(last[1], last[2], last[3])
+            open_offsets.append(len(open_cells))
+        covered = mark.count(1) - data.count(0)
+        return zero_region, open_offsets, open_cells, covered
+
+    def _label_cells(self):
+        # Any topology: union-find over zero cells (each zero joins its
+        # lower-index zero neighbors), then one pass per region collecting
+        # its zeros and their neighbors.
+        size = self.size
+        indices, offsets = self.adj.indices, self.adj.offsets
+        data = self.counts.tobytes()
+        parent = array("i", range(size))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        zeros = []
+        i = data.find(0)
+        while i != -1:
+            zeros.append(i)
+            ri = i
+            for n in indices[offsets[i]:offsets[i + 1]]:
+                if n < i and data[n] == 0:
+                    rn = find(n)
+                    if rn < ri:
+                        parent[ri] = rn
+                        ri = rn
+                    elif rn > ri:
+                        parent[rn] = ri
+            i = data.find(0, i + 1)
+
+        zero_region = array("i", [-1]) * size
+        ids = {}
+        for i in zeros:
+            zero_region[i] = ids.setdefault(find(i), len(ids))
+        zeros.sort(key=zero_region.__getitem__)
+
+        # stamp[j] == region id once j is in that region's opening
+        stamp = array("i", [-1]) * size
+        covered = 0  # numbered cells bordering at least one opening
+        open_offsets = array("I", [0])
+        open_cells = array("I")
+        current = 0
+        for i in zeros:
+            g = zero_region[i]
+            if g != current:
+                open_offsets.append(len(open_cells))
+                current = g
+            if stamp[i] != g:
+                stamp[i] = g
+                open_cells.append(i)
+            for n in indices[offsets[i]:offsets[i + 1]]:
+                if stamp[n] != g:
+                    if stamp[n] == -1 and data[n] != 0:
+                        covered += 1
+                    stamp[n] = g
+                    open_cells.append(n)
+        if zeros:
+            open_offsets.append(len(open_cells))
+        return zero_region, open_offsets, open_cells, covered
+
+    def opening(self, region):
+        """Flat indices of the cells opened by any zero in ``region``."""
+        return self.open_cells[self.open_offsets[region]:self.open_offsets[region + 1]]
+
+    def toggle_flag(self, r, c):
+        i = r * self.cols + c
+        st = self.cell_state[i]
+        if st == REVEALED:
+            return 0
+        region = self.zero_region[i] if self.zero_region is not None else -1
+        if st == HIDDEN:
+            self.cell_state[i] = FLAGGED
+            self.flag_count += 1
+            if region >= 0:
+                self.region_flags[region] += 1
+            return +1
+        if st == FLAGGED:
+            self.cell_state[i] = HIDDEN
+            self.flag_count -= 1
+            if region >= 0:
+                self.region_flags[region] -= 1
+            return -1
+
+    def reveal(self, r, c):
+        cols = self.cols
+        cell_state = self.cell_state
+        i = r * cols + c
+        if cell_state[i] != HIDDEN:
+            return False, []
+        if self.mine_map[i]:
+            cell_state[i] = REVEALED
+            return True, [(r, c)]
+
+        counts = self.counts
+        region = self.zero_region[i] if counts[i] == 0 and self.zero_region is not None else -1
+        if region >= 0:
+            opened = self.region_opened[region]
+            self.region_opened[region] = 1
+            # An untouched region with no flagged zeros is fully reachable
+            # from any of its zeros: reveal its precomputed opening in bulk.
+            if not opened and not self.region_flags[region]:
+                newly = []
+                for ci in self.opening(region):
+                    if cell_state[ci] == HIDDEN:
+                        cell_state[ci] = REVEALED
+                        newly.append(ci)
+                self.revealed_count += len(newly)
+                return False, [divmod(ci, cols) for ci in newly]
+
+        # Flood fill over flat indices. Every neighbor of a zero is
+        # mine-free, so no mine test is needed when pushing.
+        indices, offsets = self.adj.indices, self.adj.offsets
+        stack = [i]
+        newly = []
+        while stack:
+            ci = stack.pop()
+            if cell_state[ci] != HIDDEN:
+                continue
+            cell_state[ci] = REVEALED
+            newly.append(ci)
+            if counts[ci] == 0:
+                for ni in indices[offsets[ci]:offsets[ci + 1]]:
+                    if cell_state[ni] == HIDDEN:
+                        stack.append(ni)
+        self.revealed_count += len(newly)
+        return False, [divmod(ci, cols) for ci in newly]
+
+    def chord_reveal(self, r, c):
+        i = r * self.cols + c
+        if self.cell_state[i] != REVEALED or self.counts[i] <= 0:
+            return False, []
+        around = self._neighbor_indices(i)
+        cell_state = self.cell_state
+        flags = sum(1 for n in around if cell_state[n] == FLAGGED)
+        if flags != self.counts[i]:
+            return False, []
+        hit_mine = False
+        newly_all = []
+        for n in around:
+            if cell_state[n] == HIDDEN:
+                hm, newc = self.reveal(*divmod(n, self.cols))
+                if hm:
+                    hit_mine = True
+                newly_all.extend(newc)
+        return hit_mine, newly_all
+
+    def is_win(self):
+        total_cells = self.rows * self.cols
+        return self.revealed_count == total_cells - self.mines_total
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+No-guess board generation and a background prefetch pool.
+
+A no-guess board is one the deterministic Solver can clear from its start
+cell without ever guessing. Boards are found by rejection sampling: place
+mines, let the solver play, and abort the attempt the moment it gets stuck.
+Expert boards pass a few percent of the time (tens of milliseconds per
+board), so NoGuessPool keeps finished layouts ready in a worker process.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import Board
+from .solver import Solver
+
+MAX_ATTEMPTS = 2000
+
+
+def default_start(rows, cols):
+    return rows // 2, cols // 2
+
+
+def solvable_from(board, start):
+    """Play the solver from ``start`` on a board with mines placed; stops at
+    the first point where no safe cell can be proven."""
+    hit, newly = board.reveal(*start)
+    if hit:
+        return False
+    solver = Solver(board)
+    while not board.is_win():
+        cell = solver.next_safe()
+        if cell is None:
+            return False
+        _, newly = board.reveal(*cell)
+        solver.update(newly)
+    return True
+
+
+def generate_no_guess(rows, cols, mines, topology="square", start=None, rng=None,
+                      max_attempts=MAX_ATTEMPTS):
+    """Return a no-guess mine map (bytes) for a first click at ``start``,
+    or None if none was found within ``max_attempts``."""
+    rng = rng or random.Random()
+    start = start or default_start(rows, cols)
+    for _ in range(max_attempts):
+        board = Board(rows, cols, mines, topology, rng=rng)
+        board.place_mines(*start)
+        if solvable_from(board, start):
+            return bytes(board.mine_map)
+    return None
+
+
+def seeded_layout(rows, cols, mines, topology, seed, first, no_guess=False):
+    """Mine map (bytes) of the game identified by ``seed`` and its first
+    click. The App places mines this way and replays rebuild their board
+    from it, so the result must depend on nothing else."""
+    if no_guess:
+        layout = generate_no_guess(rows, cols, mines, topology, first, random.Random(seed))
+        if layout is not None:
+            return layout
+    board = Board(rows, cols, mines, topology, rng=random.Random(seed))
+    board.place_mines(*first)
+    return bytes(board.mine_map)
+
+
+def _generate_job(rows, cols, mines, topology, start, seed):
+    return seed, generate_no_guess(rows, cols, mines, topology, start, random.Random(seed))
+
+
+class NoGuessPool:
+    """Keeps up to ``depth`` no-guess layouts in flight or ready per board
+    configuration, generated in a background process.
+
+    ``take(key)`` never blocks: it returns a finished (seed, layout) or None
+    and tops the queue back up. Keys are (rows, cols, mines, topology); every
+    layout is for ``default_start(rows, cols)`` and equals
+    ``seeded_layout(..., seed, default_start(rows, cols), no_guess=True)``.
+    """
+
+    def __init__(self, depth=2, workers=1):
+        self.depth = depth
+        self.workers = workers
+        self._executor = None
+        self._pending = {}  # key -> [Future]
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def prefetch(self, key):
+        # Work for other configurations is dropped; only the current one is kept warm.
+        for other in list(self._pending):
+            if other != key:
+                for fut in self._pending.pop(other):
+                    fut.cancel()
+        futures = self._pending.setdefault(key, [])
+        rows, cols, mines, topology = key
+        while len(futures) < self.depth:
+            seed = random.getrandbits(32)
+            futures.append(self._pool().submit(
+                _generate_job, rows, cols, mines, topology, default_start(rows, cols), seed))
+
+    def take(self, key):
+        taken = None
+        futures = self._pending.get(key, [])
+        for fut in list(futures):
+            if fut.done() and not fut.cancelled():
+                futures.remove(fut)
+                try:
+                    seed, layout = fut.result()
+                except Exception:
+                    continue
+                if layout is not None:
+                    taken = seed, layout
+                    break
+        self.prefetch(key)
+        return taken
+
+    def shutdown(self):
+        if self._executor is not None:
+            for futures in self._pending.values():
+                for fut in futures:
+                    fut.cancel()
+            self._pending.clear()
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Undo/redo of Board moves, for practice games.
+
+MoveHistory stands in for a Board's move methods (reveal, chord_reveal,
+toggle_flag: same arguments, same results) and keeps every move as a
+delta instead of a copy of the board: the flat indices of the cells it
+revealed, or the cell it flagged, plus the zero regions whose opening it
+started (so reveal() floods them again after an undo). Undo and redo apply
+a delta backwards or forwards, so both cost time and memory in proportion
+to the cells the move changed, whatever the board size, and hand back
+exactly those cells to repaint.
+
+Only these three methods are tracked; mine placement and anything else
+that writes to the board directly is not undoable.
+"""
+
+from array import array
+
+from .engine import HIDDEN, REVEALED
+from .replay import REVEAL, FLAG, CHORD
+
+
+class Move:
+    __slots__ = ("kind", "at", "cells", "regions", "hit")
+
+    def __init__(self, kind, at, cells, regions, hit):
+        self.kind = kind          # REVEAL, FLAG or CHORD
+        self.at = at              # flat index of the clicked cell
+        self.cells = cells        # array("I") of flat indices changed
+        self.regions = regions    # zero regions opened by this move
+        self.hit = hit            # a mine was revealed
+
+
+class MoveHistory:
+    def __init__(self, board):
+        self.board = board
+        self.done = []            # moves played, oldest first
+        self.undone = []          # moves taken back, latest undo last
+
+    @property
+    def can_undo(self):
+        return bool(self.done)
+
+    @property
+    def can_redo(self):
+        return bool(self.undone)
+
+    # ---- Moves ----
+    def reveal(self, r, c):
+        b = self.board
+        i = r * b.cols + c
+        closed = self._closed_regions((i,))
+        hit, newly = b.reveal(r, c)
+        self._push(REVEAL, i, newly, closed, hit)
+        return hit, newly
+
+    def chord_reveal(self, r, c):
+        b = self.board
+        i = r * b.cols + c
+        closed = self._closed_regions(b.adj.of(i))
+        hit, newly = b.chord_reveal(r, c)
+        self._push(CHORD, i, newly, closed, hit)
+        return hit, newly
+
+    def toggle_flag(self, r, c):
+        b = self.board
+        delta = b.toggle_flag(r, c)
+        if delta:
+            i = r * b.cols + c
+            self._push(FLAG, i, [(r, c)], (), False)
+        return delta
+
+    def _closed_regions(self, cells):
+        # Regions a reveal of ``cells`` could open that are not opened yet
+        b = self.board
+        if b.zero_region is None:
+            return ()
+        zero_region, opened, counts = b.zero_region, b.region_opened, b.counts
+        return {zero_region[i] for i in cells if counts[i] == 0 and not opened[zero_region[i]]}
+
+    def _push(self, kind, at, changed, closed, hit):
+        if not changed:
+            return
+        b = self.board
+        cols = b.cols
+        cells = array("I", [r * cols + c for r, c in changed])
+        opened = b.region_opened
+        regions = tuple(g for g in closed if opened[g])
+        self.done.append(Move(kind, at, cells, regions, hit))
+        self.undone.clear()
+
+    # ---- Undo / redo ----
+    def undo(self):
+        """Take the latest move back; returns it, or None if there is none."""
+        if not self.done:
+            return None
+        move = self.done.pop()
+        b = self.board
+        if move.kind == FLAG:
+            b.toggle_flag(*divmod(move.at, b.cols))
+        else:
+            state, mine_map = b.cell_state, b.mine_map
+            safe = 0
+            for i in move.cells:
+                state[i] = HIDDEN
+                safe += not mine_map[i]
+            b.revealed_count -= safe  # reveal() does not count a mine it hits
+            for g in move.regions:
+                b.region_opened[g] = 0
+        self.undone.append(move)
+        return move
+
+    def redo(self):
+        """Play the latest undone move again; returns it, or None."""
+        if not self.undone:
+            return None
+        move = self.undone.pop()
+        b = self.board
+        if move.kind == FLAG:
+            b.toggle_flag(*divmod(move.at, b.cols))
+        else:
+            state, mine_map = b.cell_state, b.mine_map
+            safe = 0
+            for i in move.cells:
+                state[i] = REVEALED
+                safe += not mine_map[i]
+            b.revealed_count += safe
+            for g in move.regions:
+                b.region_opened[g] = 1
+        self.done.append(move)
+        return move
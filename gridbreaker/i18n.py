@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""Internationalization (i18n) tables and lookup."""
+
+LANGUAGES = {
+    "en": "English",
+    "bn": "বাংলা",
+    "hi": "हिन्दी",
+    "es": "Español",
+    "ja": "日本語",
+}
+
+I18N = {
+    "en": {
+        "game": "Game",
+        "new_game": "New",
+        "hint": "Hint",
+        "auto_solve": "Auto-solve",
+        "no_hint": "No safe move can be deduced.",
+        "replay_last": "Replay last game",
+        "no_replay": "No game to replay yet.",
+        "move_failed": "The move could not be completed: {error}",
+        "difficulty": "Difficulty",
+        "beginner": "Beginner (9×9, 10)",
+        "intermediate": "Intermediate (16×16, 40)",
+        "expert": "Expert (16×30, 99)",
+        "custom": "Custom…",
+        "topology": "Topology",
+        "topology_square": "Square",
+        "topology_torus": "Torus (wrap)",
+        "topology_hex": "Hex",
+        "no_guess": "No-guess mode",
+        "practice": "Practice mode (undo)",
+        "undo": "Undo",
+        "redo": "Redo",
+        "exit": "Exit",
+        "view": "View",
+        "fullscreen": "Fullscreen",
+        "theme": "Theme",
+        "light": "Light",
+        "dark": "Dark",
+        "renderer": "Renderer",
+        "renderer_canvas": "Canvas",
+        "renderer_buttons": "Buttons",
+        "animate": "Animate reveals",
+        "heatmap": "Mine probabilities",
+        "perf_overlay": "Performance overlay",
+        "export_perf": "Export timings…",
+        "language": "Language",
+        "help": "Help",
+        "about": "About",
+        "about_text": "GridBreaker — a modern, polished Minesweeper.\nBuilt with Tkinter.",
+        "you_win": "You win!",
+        "you_lose": "Boom! You hit a mine.",
+        "cleared_in": "Cleared in {seconds} seconds.",
+        "new_record": "New best time for {difficulty}: {seconds}s 🎉",
+        "statistics": "Statistics",
+        "join_race": "Join race…",
+        "leave_race": "Leave race",
+        "race_address": "Race server (host:port):",
+        "race_room": "Room name:",
+        "race_bad_address": "Invalid server address.",
+        "race_closed": "The race server closed the connection.",
+        "race_you": "you",
+        "stats_played": "Played {played}, won {won} ({rate:.0f}%)",
+        "stats_best": "Best times",
+        "stats_recent": "Recent games",
+        "faster_than": "Faster than {pct:.0f}% of your wins on this board.",
+        "invalid_custom": "Invalid custom settings.",
+        "custom_prompt_title": "Custom Difficulty",
+        "rows_prompt": "Rows (5–24):",
+        "cols_prompt": "Columns (5–40):",
+        "mines_prompt": "Mines (1–rows*cols-1):",
+        "confirm_exit_title": "Exit",
+        "confirm_exit_text": "Quit the game?",
+        "loading": "Loading...",
+        "play": "Play",
+        "resume": "Resume",
+    },
+    "bn": {
+        "game": "গেম",
+        "new_game": "নতুন",
+        "hint": "ইঙ্গিত",
+        "auto_solve": "স্বয়ংক্রিয় সমাধান",
+        "no_hint": "নিশ্চিত নিরাপদ কোনো চাল নেই।",
+        "replay_last": "শেষ খেলা রিপ্লে",
+        "no_replay": "রিপ্লে করার মতো কোনো খেলা এখনও নেই।",
+        "move_failed": "চালটি সম্পূর্ণ করা যায়নি: {error}",
+        "difficulty": "কঠিনতা",
+        "beginner": "বেগিনার (9×9, 10)",
+        "intermediate": "ইন্টারমিডিয়েট (16×16, 40)",
+        "expert": "এক্সপার্ট (16×30, 99)",
+        "custom": "কাস্টম…",
+        "topology": "টপোলজি",
+        "topology_square": "বর্গাকার",
+        "topology_torus": "টোরাস (মোড়ানো)",
+        "topology_hex": "ষড়ভুজ",
+        "no_guess": "অনুমানহীন মোড",
+        "practice": "অনুশীলন মোড (আনডু)",
+        "undo": "আনডু",
+        "redo": "রিডু",
+        "exit": "প্রস্থান",
+        "view": "ভিউ",
+        "fullscreen": "ফুলস্ক্রীন",
+        "theme": "থিম",
+        "light": "লাইট",
+        "dark": "ডার্ক",
+        "renderer": "রেন্ডারার",
+        "renderer_canvas": "ক্যানভাস",
+        "renderer_buttons": "বোতাম",
+        "animate": "অ্যানিমেটেড উন্মোচন",
+        "heatmap": "মাইনের সম্ভাবনা",
+        "perf_overlay": "পারফরম্যান্স ওভারলে",
+        "export_perf": "সময়ের তথ্য রপ্তানি…",
+        "language": "ভাষা",
+        "help": "সাহায্য",
+        "about": "সম্পর্কে",
+        "about_text": "গ্রিডব্রেকার — আধুনিক, সুন্দর মাইনসুইপার।\nTkinter দিয়ে নির্মিত।",
+        "you_win": "আপনি জিতেছেন!",
+        "you_lose": "বুম! আপনি একটি মাইনে ক্লিক করেছেন।",
+        "cleared_in": "{seconds} সেকেন্ডে সম্পন্ন।",
+        "new_record": "{difficulty} এর নতুন সেরা সময়: {seconds} সেকেন্ড 🎉",
+        "statistics": "পরিসংখ্যান",
+        "join_race": "রেসে যোগ দিন…",
+        "leave_race": "রেস ছাড়ুন",
+        "race_address": "রেস সার্ভার (host:port):",
+        "race_room": "রুমের নাম:",
+        "race_bad_address": "অবৈধ সার্ভার ঠিকানা।",
+        "race_closed": "রেস সার্ভার সংযোগ বন্ধ করেছে।",
+        "race_you": "আপনি",
+        "stats_played": "খেলা {played}, জয় {won} ({rate:.0f}%)",
+        "stats_best": "সেরা সময়",
+        "stats_recent": "সাম্প্রতিক খেলা",
+        "faster_than": "এই বোর্ডে আপনার {pct:.0f}% জয়ের চেয়ে দ্রুত।",
+        "invalid_custom": "কাস্টম সেটিংস সঠিক নয়।",
+        "custom_prompt_title": "কাস্টম কঠিনতা",
+        "rows_prompt": "সারি (5–24):",
+        "cols_prompt": "কলাম (5–40):",
+        "mines_prompt": "মাইন (1–সর্বোচ্চ-1):",
+        "confirm_exit_title": "প্রস্থান",
+        "confirm_exit_text": "গেমটি বন্ধ করবেন?",
+        "loading": "লোড হচ্ছে...",
+        "play": "খেলুন",
+        "resume": "পুনরায় শুরু",
+    },
+    "hi": {
+        "game": "गेम",
+        "new_game": "नया",
+        "hint": "संकेत",
+        "auto_solve": "स्वतः हल",
+        "no_hint": "कोई निश्चित सुरक्षित चाल नहीं मिली।",
+        "replay_last": "पिछला खेल दोबारा देखें",
+        "no_replay": "दोबारा देखने के लिए अभी कोई खेल नहीं है।",
+        "move_failed": "चाल पूरी नहीं हो सकी: {error}",
+        "difficulty": "कठिनाई",
+        "beginner": "शुरुआती (9×9, 10)",
+        "intermediate": "मध्य (16×16, 40)",
+        "expert": "विशेषज्ञ (16×30, 99)",
+        "custom": "कस्टम…",
+        "topology": "टोपोलॉजी",
+        "topology_square": "वर्गाकार",
+        "topology_torus": "टोरस (लिपटा)",
+        "topology_hex": "षट्कोण",
+        "no_guess": "बिना अनुमान मोड",
+        "practice": "अभ्यास मोड (पूर्ववत)",
+        "undo": "पूर्ववत करें",
+        "redo": "फिर से करें",
+        "exit": "बाहर निकलें",
+        "view": "दृश्य",
+        "fullscreen": "फुलस्क्रीन",
+        "theme": "थीम",
+        "light": "लाइट",
+        "dark": "डार्क",
+        "renderer": "रेंडरर",
+        "renderer_canvas": "कैनवास",
+        "renderer_buttons": "बटन",
+        "animate": "एनिमेटेड खुलना",
+        "heatmap": "माइन की संभावना",
+        "perf_overlay": "प्रदर्शन ओवरले",
+        "export_perf": "समय डेटा निर्यात करें…",
+        "language": "भाषा",
+        "help": "मदद",
+        "about": "परिचय",
+        "about_text": "GridBreaker — आधुनिक, सुसज्जित माइंसवीपर।\nTkinter से निर्मित।",
+        "you_win": "आप जीत गए!",
+        "you_lose": "धमाका! आप माइन पर क्लिक कर बैठे।",
+        "cleared_in": "{seconds} सेकंड में साफ़ किया।",
+        "new_record": "{difficulty} के लिए नया सर्वश्रेष्ठ समय: {seconds} सेकंड 🎉",
+        "statistics": "आँकड़े",
+        "join_race": "रेस में शामिल हों…",
+        "leave_race": "रेस छोड़ें",
+        "race_address": "रेस सर्वर (host:port):",
+        "race_room": "कमरे का नाम:",
+        "race_bad_address": "अमान्य सर्वर पता।",
+        "race_closed": "रेस सर्वर ने कनेक्शन बंद कर दिया।",
+        "race_you": "आप",
+        "stats_played": "खेले {played}, जीते {won} ({rate:.0f}%)",
+        "stats_best": "सर्वश्रेष्ठ समय",
+        "stats_recent": "हाल के खेल",
+        "faster_than": "इस बोर्ड पर आपकी {pct:.0f}% जीतों से तेज़।",
+        "invalid_custom": "कस्टम सेटिंग्स अमान्य हैं।",
+        "custom_prompt_title": "कस्टम कठिनाई",
+        "rows_prompt": "पंक्तियाँ (5–24):",
+        "cols_prompt": "स्तंभ (5–40):",
+        "mines_prompt": "माइंस (1–अधिकतम-1):",
+        "confirm_exit_title": "बाहर निकलें",
+        "confirm_exit_text": "क्या आप गेम बंद करना चाहते हैं?",
+        "loading": "लोड हो रहा है...",
+        "play": "खेलें",
+        "resume": "फिर से शुरू",
+    },
+    "es": {
+        "game": "Juego",
+        "new_game": "Nuevo",
+        "hint": "Pista",
+        "auto_solve": "Resolver automáticamente",
+        "no_hint": "No se puede deducir ninguna jugada segura.",
+        "replay_last": "Repetir última partida",
+        "no_replay": "Aún no hay ninguna partida para repetir.",
+        "move_failed": "No se pudo completar la jugada: {error}",
+        "difficulty": "Dificultad",
+        "beginner": "Principiante (9×9, 10)",
+        "intermediate": "Intermedio (16×16, 40)",
+        "expert": "Experto (16×30, 99)",
+        "custom": "Personalizado…",
+        "topology": "Topología",
+        "topology_square": "Cuadrada",
+        "topology_torus": "Toroide (envolvente)",
+        "topology_hex": "Hexagonal",
+        "no_guess": "Modo sin adivinar",
+        "practice": "Modo práctica (deshacer)",
+        "undo": "Deshacer",
+        "redo": "Rehacer",
+        "exit": "Salir",
+        "view": "Vista",
+        "fullscreen": "Pantalla completa",
+        "theme": "Tema",
+        "light": "Claro",
+        "dark": "Oscuro",
+        "renderer": "Renderizador",
+        "renderer_canvas": "Lienzo",
+        "renderer_buttons": "Botones",
+        "animate": "Animar revelado",
+        "heatmap": "Probabilidad de minas",
+        "perf_overlay": "Superposición de rendimiento",
+        "export_perf": "Exportar tiempos…",
+        "language": "Idioma",
+        "help": "Ayuda",
+        "about": "Acerca de",
+        "about_text": "GridBreaker — Buscaminas moderno y pulido.\nHecho con Tkinter.",
+        "you_win": "¡Has ganado!",
+        "you_lose": "¡Boom! Diste en una mina.",
+        "cleared_in": "Completado en {seconds} segundos.",
+        "new_record": "Nuevo récord para {difficulty}: {seconds}s 🎉",
+        "statistics": "Estadísticas",
+        "join_race": "Unirse a una carrera…",
+        "leave_race": "Salir de la carrera",
+        "race_address": "Servidor de carreras (host:puerto):",
+        "race_room": "Nombre de la sala:",
+        "race_bad_address": "Dirección de servidor no válida.",
+        "race_closed": "El servidor de carreras cerró la conexión.",
+        "race_you": "tú",
+        "stats_played": "Jugadas {played}, ganadas {won} ({rate:.0f}%)",
+        "stats_best": "Mejores tiempos",
+        "stats_recent": "Partidas recientes",
+        "faster_than": "Más rápido que el {pct:.0f}% de tus victorias en este tablero.",
+        "invalid_custom": "Configuración personalizada inválida.",
+        "custom_prompt_title": "Dificultad personalizada",
+        "rows_prompt": "Filas (5–24):",
+        "cols_prompt": "Columnas (5–40):",
+        "mines_prompt": "Minas (1–máx-1):",
+        "confirm_exit_title": "Salir",
+        "confirm_exit_text": "¿Salir del juego?",
+        "loading": "Cargando...",
+        "play": "Jugar",
+        "resume": "Reanudar",
+    },
+    "ja": {
+        "game": "ゲーム",
+        "new_game": "新規",
+        "hint": "ヒント",
+        "auto_solve": "自動解決",
+        "no_hint": "確実に安全なマスはありません。",
+        "replay_last": "前回のゲームを再生",
+        "no_replay": "再生できるゲームはまだありません。",
+        "move_failed": "手を完了できませんでした: {error}",
+        "difficulty": "難易度",
+        "beginner": "ビギナー (9×9, 10)",
+        "intermediate": "中級 (16×16, 40)",
+        "expert": "上級 (16×30, 99)",
+        "custom": "カスタム…",
+        "topology": "盤面形状",
+        "topology_square": "四角",
+        "topology_torus": "トーラス (ループ)",
+        "topology_hex": "六角",
+        "no_guess": "運要素なしモード",
+        "practice": "練習モード（取り消し可）",
+        "undo": "元に戻す",
+        "redo": "やり直し",
+        "exit": "終了",
+        "view": "表示",
+        "fullscreen": "フルスクリーン",
+        "theme": "テーマ",
+        "light": "ライト",
+        "dark": "ダーク",
+        "renderer": "描画方式",
+        "renderer_canvas": "キャンバス",
+        "renderer_buttons": "ボタン",
+        "animate": "開放アニメーション",
+        "heatmap": "地雷の確率",
+        "perf_overlay": "パフォーマンス表示",
+        "export_perf": "計測データを書き出す…",
+        "language": "言語",
+        "help": "ヘルプ",
+        "about": "情報",
+        "about_text": "GridBreaker — 洗練された近代的マインスイーパ。\nTkinter 製。",
+        "you_win": "勝利！",
+        "you_lose": "ドカン！ 地雷に当たりました。",
+        "cleared_in": "{seconds} 秒でクリア。",
+        "new_record": "{difficulty} の最速記録: {seconds}秒 🎉",
+        "statistics": "統計",
+        "join_race": "レースに参加…",
+        "leave_race": "レースを抜ける",
+        "race_address": "レースサーバー (host:port):",
+        "race_room": "ルーム名:",
+        "race_bad_address": "サーバーのアドレスが正しくありません。",
+        "race_closed": "レースサーバーとの接続が切れました。",
+        "race_you": "あなた",
+        "stats_played": "プレイ {played}、勝利 {won}（{rate:.0f}%）",
+        "stats_best": "ベストタイム",
+        "stats_recent": "最近のゲーム",
+        "faster_than": "この盤面での勝利の {pct:.0f}% より速いタイムです。",
+        "invalid_custom": "カスタム設定が無効です。",
+        "custom_prompt_title": "カスタム難易度",
+        "rows_prompt": "行 (5–24):",
+        "cols_prompt": "列 (5–40):",
+        "mines_prompt": "地雷 (1–最大-1):",
+        "confirm_exit_title": "終了",
+        "confirm_exit_text": "ゲームを終了しますか？",
+        "loading": "読み込み中…",
+        "play": "プレイ",
+        "resume": "再開",
+    },
+}
+
+def T(lang, key, **kwargs):
+    base = I18N.get(lang, I18N["en"])
+    template = base.get(key, I18N["en"].get(key, key))
+    return template.format(**kwargs) if kwargs else template
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Engine work off the Tk thread.
+
+JobRunner runs submitted functions one at a time, in order, on a daemon
+worker thread. Results come back through a queue that the Tk thread polls
+with after() while jobs are out, so ``done`` / ``failed`` callbacks always
+run on the Tk thread and may touch widgets. Tk itself is never called from
+the worker.
+
+Jobs can be cancelled, directly or by submitting a newer job with the same
+key: a cancelled job that has not started is skipped, and the result of
+one already running is dropped when it arrives. A running function is not
+interrupted, so it must not depend on state the Tk thread replaces (pass
+the Board it works on instead of reading it from the App).
+"""
+
+import queue
+import threading
+import time
+
+JOB_POLL_MS = 4
+
+
+class Job:
+    __slots__ = ("fn", "args", "key", "done", "failed", "cancelled", "submitted", "started", "finished")
+
+    def __init__(self, fn, args, key, done, failed):
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.done = done          # done(result), on the Tk thread
+        self.failed = failed      # failed(exception), on the Tk thread
+        self.cancelled = False
+        self.submitted = time.perf_counter()
+        self.started = self.finished = None
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class JobRunner:
+    """One worker thread plus an after()-polled result queue for ``widget``.
+
+    With ``timings`` (a perf.Timings) every delivered job records
+    ``job.run`` (ms on the worker) and ``job.delivery`` (ms from finishing
+    to its callback running on the Tk thread).
+    """
+
+    def __init__(self, widget, timings=None, poll_ms=JOB_POLL_MS):
+        self.widget = widget
+        self.timings = timings
+        self.poll_ms = poll_ms
+        self._todo = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()   # a job is started or cancelled, not both
+        self._thread = None
+        self._poll_job = None
+        self._out = 0          # submitted and not yet taken off the result queue
+        self._live = []        # submitted, not cancelled, not yet delivered
+
+    @property
+    def busy(self):
+        """True while a job that will still be delivered is out."""
+        return bool(self._live)
+
+    def submit(self, fn, *args, done=None, failed=None, key=None):
+        """Run ``fn(*args)`` on the worker. Pending jobs with the same
+        ``key`` are cancelled first."""
+        if key is not None:
+            self.cancel(key)
+        job = Job(fn, args, key, done, failed)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="gridbreaker-jobs", daemon=True)
+            self._thread.start()
+        self._live.append(job)
+        self._out += 1
+        self._todo.put(job)
+        self._schedule()
+        return job
+
+    def cancel(self, key=None):
+        """Cancel the pending jobs with ``key``, or all of them."""
+        for job in self._live:
+            if key is None or job.key == key:
+                job.cancel()
+        self._live = [job for job in self._live if not job.cancelled]
+
+    def shutdown(self, timeout=None):
+        """Stop the worker, waiting up to ``timeout`` seconds for a running
+        job to return (None: do not wait). Jobs that have not started are
+        cancelled; a running job that returns in time is delivered here, so
+        its callback has run when this returns. Returns False if a job may
+        still be running."""
+        if self._poll_job is not None:
+            try:
+                self.widget.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+        with self._lock:
+            for job in self._live:
+                if job.started is None:
+                    job.cancel()
+        thread, self._thread = self._thread, None
+        stopped = True
+        if thread is not None:
+            self._todo.put(None)
+            if timeout is not None:
+                thread.join(timeout)
+            stopped = not thread.is_alive()
+        if stopped:
+            self._deliver()
+        self.cancel()
+        return stopped
+
+    # ---- Worker thread ----
+    def _work(self):
+        while True:
+            job = self._todo.get()
+            if job is None:
+                return
+            result = error = None
+            with self._lock:
+                if not job.cancelled:
+                    job.started = time.perf_counter()
+            if job.started is not None:
+                try:
+                    result = job.fn(*job.args)
+                except Exception as e:
+                    error = e
+                job.finished = time.perf_counter()
+            self._results.put((job, result, error))
+
+    # ---- Tk thread ----
+    def _schedule(self):
+        if self._poll_job is None:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        self._deliver()
+        if self._out:
+            self._schedule()
+
+    def _deliver(self):
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._out -= 1
+            if job.cancelled:
+                continue
+            self._live.remove(job)
+            if self.timings is not None and job.started is not None:
+                self.timings.add("job.run", (job.finished - job.started) * 1000.0)
+                self.timings.add("job.delivery", (time.perf_counter() - job.finished) * 1000.0)
+            try:
+                if error is None:
+                    if job.done is not None:
+                        job.done(result)
+                elif job.failed is not None:
+                    job.failed(error)
+                else:
+                    raise error
+            except Exception as e:
+                self.widget.report_callback_exception(type(e), e, e.__traceback__)
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight latency bookkeeping for the UI.
+
+Timings keeps a bounded window of samples (milliseconds) per named event
+and summarizes them as percentiles; InputLatency turns input handlers into
+end-to-end traces on top of it. Neither has a Tk dependency; the App feeds
+them and decides where the numbers go. Set GRIDBREAKER_PERF=1 to have each
+sample printed to stderr as it is recorded, and GRIDBREAKER_PERF_FILE to a
+path to have everything exported there as JSON on exit.
+"""
+
+import os
+import sys
+import json
+import time
+from collections import deque
+
+PERF_ENV = "GRIDBREAKER_PERF"
+PERF_FILE_ENV = "GRIDBREAKER_PERF_FILE"
+
+
+def perf_enabled():
+    return os.environ.get(PERF_ENV, "") not in ("", "0")
+
+
+def perf_file():
+    return os.environ.get(PERF_FILE_ENV) or None
+
+
+def export(path, **sections):
+    """Write Timings (as keyword sections) to ``path`` as JSON, raw samples
+    included, for offline analysis."""
+    doc = {"created": time.time(), "unit": "ms"}
+    doc.update((name, t.to_dict()) for name, t in sections.items())
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1)
+
+
+class Timings:
+    """Recent samples per event name, kept in bounded deques."""
+
+    def __init__(self, maxlen=1000, echo=None):
+        self.maxlen = maxlen
+        self.echo = perf_enabled() if echo is None else echo
+        self.samples = {}
+
+    def add(self, name, ms, detail=""):
+        q = self.samples.get(name)
+        if q is None:
+            q = self.samples[name] = deque(maxlen=self.maxlen)
+        q.append(ms)
+        if self.echo:
+            print(f"[perf] {name} {ms:.2f} ms {detail}".rstrip(), file=sys.stderr)
+
+    def timer(self, name):
+        return _Span(self, name)
+
+    def summary(self, name):
+        q = self.samples.get(name)
+        if not q:
+            return None
+        s = sorted(q)
+        pick = lambda p: s[min(len(s) - 1, int(p * len(s)))]
+        return {"count": len(s), "last": q[-1], "p50": pick(0.50), "p95": pick(0.95),
+                "p99": pick(0.99), "max": s[-1]}
+
+    def to_dict(self):
+        return {name: dict(self.summary(name), samples=list(q)) for name, q in self.samples.items() if q}
+
+    def report(self):
+        lines = []
+        for name in sorted(self.samples):
+            st = self.summary(name)
+            lines.append(f"{name:<18} n={st['count']:<5} last={st['last']:.2f} p50={st['p50']:.2f} "
+                         f"p95={st['p95']:.2f} p99={st['p99']:.2f} max={st['max']:.2f} ms")
+        return "\n".join(lines)
+
+
+class _Span:
+    """``with timings.timer("reset") as span:`` records the block's duration;
+    set ``span.detail`` to annotate the echoed line."""
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+        self.detail = ""
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, (time.perf_counter() - self.t0) * 1000.0, self.detail)
+        return False
+
+
+# -----------------------------
+# Input latency
+# -----------------------------
+class _Trace:
+    __slots__ = ("name", "t0", "board", "cells", "returned")
+
+    def __init__(self, name):
+        self.name = name
+        self.t0 = time.perf_counter()
+        self.board = 0.0
+        self.cells = 0
+        self.returned = None
+
+
+class InputLatency:
+    """End-to-end latency of input handlers.
+
+    A trace starts when a handler is entered and ends when finish(trace)
+    runs, which the App schedules as an idle callback once everything the
+    handler queued has been painted. Per handler name it records in ``timings``:
+
+        input.<name>   ms from the event to the idle callback after paint
+        board.<name>   ms spent inside Board calls
+        paint.<name>   ms from the handler's return to the idle callback
+
+    and in ``cells`` (counts, not ms) the cells each event touched.
+    Handlers called from inside a traced one (auto-solve's reveals) join
+    the outer trace. Traces waiting for paint overlap freely with new ones;
+    each is closed only by the finish() scheduled after its own paint.
+    A handler that hands its Board work to a background job detach()es
+    its trace and the job's completion attach()es it again, so the trace
+    spans the job.
+    """
+
+    def __init__(self, timings, maxlen=1000):
+        self.timings = timings
+        self.cells = Timings(maxlen, echo=False)
+        self.current = None
+        self.pending = []
+
+    def begin(self, name):
+        """Start a trace unless one is running; True if this call started it."""
+        if self.current is not None:
+            return False
+        self.current = _Trace(name)
+        return True
+
+    def board(self, t0, cells, t1=None):
+        """A Board call that ran from perf_counter() ``t0`` to ``t1`` (default:
+        now) touched ``cells``."""
+        tr = self.current
+        if tr is not None:
+            tr.board += (time.perf_counter() if t1 is None else t1) - t0
+            tr.cells += cells
+
+    def touch(self, cells):
+        if self.current is not None:
+            self.current.cells += cells
+
+    def settle(self):
+        """The handler returned; its trace now waits for finish(trace) and
+        is returned. None if there was nothing to wait for (e.g. cut()
+        already closed it)."""
+        tr, self.current = self.current, None
+        if tr is None:
+            return None
+        tr.returned = time.perf_counter()
+        self.pending.append(tr)
+        return tr
+
+    def detach(self):
+        """Take the running trace away from its handler, which returns
+        before its work is done; settle() then has nothing to wait for."""
+        tr, self.current = self.current, None
+        return tr
+
+    def attach(self, tr):
+        """Continue a detached trace; True if it is the running one now
+        (settle() it afterwards), False if another trace is running."""
+        if tr is None or self.current is not None:
+            return False
+        self.current = tr
+        return True
+
+    def cut(self):
+        """Close the running trace now, e.g. before a modal dialog whose
+        time on screen is not latency."""
+        tr, self.current = self.current, None
+        if tr is not None:
+            tr.returned = time.perf_counter()
+            self._record(tr, tr.returned)
+
+    def finish(self, tr):
+        """Close a settled trace once its paint is done."""
+        if tr in self.pending:
+            self.pending.remove(tr)
+            self._record(tr, time.perf_counter())
+
+    def _record(self, tr, end):
+        t = self.timings
+        detail = f"cells={tr.cells}"
+        t.add(f"board.{tr.name}", tr.board * 1000.0)
+        t.add(f"paint.{tr.name}", (end - tr.returned) * 1000.0)
+        t.add(f"input.{tr.name}", (end - tr.t0) * 1000.0, detail)
+        self.cells.add(tr.name, tr.cells)
+
+    def handlers(self):
+        return sorted(name[6:] for name in self.timings.samples if name.startswith("input."))
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Mine probabilities of hidden cells, for the heat map overlay.
+
+Flags count as mines, so the cells left to place are ``mines_total -
+flag_count`` mines over the hidden, unflagged cells. Every revealed number
+gives a constraint "these hidden neighbors hold k mines". Hidden cells
+with such a constraint form the frontier; the rest are interior cells,
+which all share one probability.
+
+Frontier cells that share a constraint belong to one component, and
+components are independent apart from the global mine count. Each
+component is solved exactly by walking its cells in breadth-first order:
+a partial assignment matters only through the mines still owed by the
+constraints it has started but not finished, so the number of solutions
+(and of solutions with each cell a mine) of the remaining cells depends
+only on (position, those residuals) and is memoized on that. The result,
+solutions per mine count, is then weighted against the interior by
+C(interior cells, mines left over) and combined across components.
+
+ProbabilityMap follows the board like the Solver does: update() gets the
+cells a move changed and only components touching them are solved again.
+Results are also cached by the component's shape, so a pattern seen
+before costs nothing. recompute() has a time budget: a component that
+does not finish in time gets per-cell local estimates instead (marked by
+``exact`` being False), keeps its memo, and continues from there on the
+next call.
+"""
+
+import gc
+import math
+import time
+from array import array
+from collections import OrderedDict, deque
+
+from .engine import HIDDEN, REVEALED, FLAGGED
+
+BUDGET_MS = 30.0
+CACHE_SIZE = 512          # solved component shapes kept across moves
+EXACT_MAX_CELLS = 400     # larger components are only estimated (recursion depth)
+MEMO_MAX = 400000         # sub-results per component before giving up on it
+COMBINE_MAX = 400000      # work limit of the exact global combination
+CHECK_EVERY = 16          # solver steps between deadline checks
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Component:
+    """Frontier cells linked by shared constraints, and their solution."""
+
+    __slots__ = ("cells", "numbers", "key", "local", "dist", "counts", "approx", "memo", "hopeless")
+
+    def __init__(self, cells, numbers, key, local):
+        self.cells = cells        # flat indices in solving order
+        self.numbers = numbers    # revealed numbers constraining them
+        self.key = key            # shape: constraints over cell positions
+        self.local = local        # [(positions, mines)] for the solver
+        self.dist = None          # {mines: solutions}
+        self.counts = None        # {mines: [solutions with cell p a mine]}
+        self.approx = None        # [estimated probability] while not solved
+        self.memo = None          # partial sub-results kept between attempts
+        self.hopeless = False
+
+
+def solve_component(n, constraints, deadline=None, memo=None):
+    """Exact solution counts of ``n`` cells under ``constraints``, a list of
+    (sorted cell positions, mines). Returns ({mines: solutions},
+    {mines: [solutions with cell p a mine]}), as floats. Raises _Timeout
+    past ``deadline``; sub-results found so far stay in ``memo``."""
+    starts = [[] for _ in range(n)]
+    members = [[] for _ in range(n)]   # (constraint, cells of it after p)
+    first, last = [], []
+    for j, (pos, k) in enumerate(constraints):
+        starts[pos[0]].append(j)
+        for rank, p in enumerate(pos):
+            members[p].append((j, len(pos) - rank - 1))
+        first.append(pos[0])
+        last.append(pos[-1])
+    # Constraints started before p and not finished before p
+    open_at = [[j for j in range(len(constraints)) if first[j] < p <= last[j]] for p in range(n + 1)]
+    mines = [k for _, k in constraints]
+    memo = {} if memo is None else memo
+    steps = [0]
+    empty = {0: (1.0, ())}
+
+    def solve(p, key):
+        if p == n:
+            return empty
+        hit = memo.get((p, key))
+        if hit is not None:
+            return hit
+        steps[0] += 1
+        if deadline is not None and steps[0] % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+            raise _Timeout
+        if len(memo) > MEMO_MAX:
+            raise _Timeout
+        res = dict(zip(open_at[p], key))
+        for j in starts[p]:
+            res[j] = mines[j]
+        out = {}
+        width = n - p
+        for v in (0, 1):
+            nres = dict(res)
+            for j, after in members[p]:
+                r = res[j] - v
+                if r < 0 or r > after:
+                    break
+                nres[j] = r
+            else:
+                sub = solve(p + 1, tuple(nres[j] for j in open_at[p + 1]))
+                for k, (w, cnt) in sub.items():
+                    cur = out.get(k + v)
+                    if cur is None:
+                        cur = out[k + v] = [0.0, [0.0] * width]
+                    cur[0] += w
+                    acc = cur[1]
+                    if v:
+                        acc[0] += w
+                    for q, c in enumerate(cnt, 1):
+                        acc[q] += c
+        # Arrays are not tracked by the garbage collector, so a large memo
+        # does not make every collection slower
+        result = {k: (w, array("d", acc)) for k, (w, acc) in out.items()}
+        memo[(p, key)] = result
+        # Merging is most of the work, so check again once it is stored
+        steps[0] += 1
+        if deadline is not None and steps[0] % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+            raise _Timeout
+        return result
+
+    root = solve(0, ())
+    return {k: w for k, (w, _) in root.items()}, {k: list(acc) for k, (_, acc) in root.items()}
+
+
+def _lcomb(n, k):
+    if k < 0 or k > n:
+        return -math.inf
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _convolve(a, b):
+    out = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            out[i + j] = out.get(i + j, 0.0) + x * y
+    top = max(out.values(), default=0.0)
+    return {k: v / top for k, v in out.items()} if top > 0 else out
+
+
+class ProbabilityMap:
+    """Mine probabilities for ``board``; call update() with the cells each
+    move changed and recompute() before reading ``prob`` (frontier cell ->
+    probability) and ``interior`` (every other hidden cell)."""
+
+    def __init__(self, board, cache=None):
+        self.board = board
+        self.cache = cache if cache is not None else OrderedDict()
+        self.prob = {}
+        self.interior = 0.0
+        self.exact = True
+        self.last = (0, 0, 0)     # components (solved, cached, estimated) by the latest recompute
+        self._cons = {}           # revealed number -> (hidden neighbors, mines among them)
+        self._of_cell = {}        # frontier cell -> numbers constraining it
+        self._comp_of = {}        # frontier cell -> Component
+        self._comps = set()
+        self._dirty = set()       # numbers whose constraint changed
+        self._dirty_comps = set()
+        state, counts = board.cell_state, board.counts
+        i = state.find(REVEALED)
+        while i != -1:
+            if counts[i] > 0:
+                self._refresh(i)
+            i = state.find(REVEALED, i + 1)
+
+    # ---- Constraints ----
+    def update(self, cells):
+        """Feed the cells changed by reveal/chord_reveal/toggle_flag."""
+        b = self.board
+        cols, state, counts = b.cols, b.cell_state, b.counts
+        indices, offsets = b.adj.indices, b.adj.offsets
+        for cell in cells:
+            i = cell if isinstance(cell, int) else cell[0] * cols + cell[1]
+            if i in self._comp_of:
+                self._dirty_comps.add(self._comp_of[i])
+            for y in (i, *indices[offsets[i]:offsets[i + 1]]):
+                if state[y] == REVEALED and counts[y] > 0:
+                    self._refresh(y)
+                elif y in self._cons:
+                    self._drop(y)
+
+    def _refresh(self, x):
+        b = self.board
+        state = b.cell_state
+        unknown, left = [], b.counts[x]
+        for n in b.adj.indices[b.adj.offsets[x]:b.adj.offsets[x + 1]]:
+            st = state[n]
+            if st == FLAGGED:
+                left -= 1
+            elif st == HIDDEN:
+                unknown.append(n)
+        con = (tuple(unknown), left) if unknown else None
+        if self._cons.get(x) == con:
+            return
+        self._drop(x)
+        if con is None:
+            return
+        self._cons[x] = con
+        self._dirty.add(x)
+        for n in con[0]:
+            self._of_cell.setdefault(n, set()).add(x)
+            if n in self._comp_of:
+                self._dirty_comps.add(self._comp_of[n])
+
+    def _drop(self, x):
+        con = self._cons.pop(x, None)
+        if con is None:
+            return
+        self._dirty.add(x)
+        for n in con[0]:
+            if n in self._comp_of:
+                self._dirty_comps.add(self._comp_of[n])
+            owners = self._of_cell.get(n)
+            if owners is not None:
+                owners.discard(x)
+                if not owners:
+                    del self._of_cell[n]
+
+    # ---- Components ----
+    def _regroup(self):
+        """Replace the dirty components by components of their numbers."""
+        todo = set(self._dirty)
+        for comp in self._dirty_comps:
+            self._comps.discard(comp)
+            todo.update(comp.numbers)
+            for c in comp.cells:
+                if self._comp_of.get(c) is comp:
+                    del self._comp_of[c]
+        self._dirty.clear()
+        self._dirty_comps.clear()
+        cons, of_cell = self._cons, self._of_cell
+        todo = {x for x in todo if x in cons}
+        fresh = []
+        while todo:
+            seed = min(todo)
+            todo.discard(seed)
+            numbers, order, seen = [seed], [], set()
+            queue = deque([seed])
+            while queue:
+                x = queue.popleft()
+                for c in sorted(cons[x][0]):
+                    if c in seen:
+                        continue
+                    seen.add(c)
+                    order.append(c)
+                    for y in sorted(of_cell[c]):
+                        if y in todo:
+                            todo.discard(y)
+                            numbers.append(y)
+                            queue.append(y)
+            pos = {c: p for p, c in enumerate(order)}
+            local = sorted((tuple(sorted(pos[c] for c in cons[x][0])), cons[x][1]) for x in numbers)
+            comp = Component(order, numbers, (len(order), tuple(local)), local)
+            for c in order:
+                self._comp_of[c] = comp
+            self._comps.add(comp)
+            fresh.append(comp)
+        return fresh
+
+    def _solve(self, comp, deadline):
+        """True if ``comp`` is solved exactly (now or from the cache)."""
+        hit = self.cache.get(comp.key)
+        if hit is not None:
+            self.cache.move_to_end(comp.key)
+            comp.dist, comp.counts = hit
+            comp.approx = comp.memo = None
+            return True
+        if not comp.hopeless and len(comp.cells) <= EXACT_MAX_CELLS and time.perf_counter() < deadline:
+            if comp.memo is None:
+                comp.memo = {}
+            # A full collection walks the whole memo and can take longer than
+            # the budget, so the collector waits until the solver stops
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                dist, counts = solve_component(len(comp.cells), comp.local, deadline, comp.memo)
+            except _Timeout:
+                comp.hopeless = len(comp.memo) > MEMO_MAX
+                if comp.hopeless:
+                    comp.memo = None
+            except RecursionError:
+                comp.hopeless, comp.memo = True, None
+            else:
+                top = max(dist.values(), default=0) or 1
+                comp.dist = {k: w / top for k, w in dist.items()}
+                comp.counts = {k: [c / top for c in cnt] for k, cnt in counts.items()}
+                comp.approx = comp.memo = None
+                self.cache[comp.key] = (comp.dist, comp.counts)
+                if len(self.cache) > CACHE_SIZE:
+                    self.cache.popitem(last=False)
+                return True
+            finally:
+                if collecting:
+                    gc.enable()
+        if comp.approx is None:
+            comp.approx = self._estimate(comp)
+        return False
+
+    def _estimate(self, comp):
+        # Mean density of the constraints on each cell
+        sums = [0.0] * len(comp.cells)
+        seen = [0] * len(comp.cells)
+        for pos, k in comp.local:
+            d = max(0.0, min(1.0, k / len(pos)))
+            for p in pos:
+                sums[p] += d
+                seen[p] += 1
+        return [s / n if n else 0.0 for s, n in zip(sums, seen)]
+
+    # ---- Probabilities ----
+    def recompute(self, budget_ms=BUDGET_MS):
+        """Bring ``prob`` / ``interior`` up to date, spending at most about
+        ``budget_ms`` on solving. Returns ``exact``."""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        fresh = self._regroup()
+        solved = cached = 0
+        for comp in sorted(fresh, key=lambda c: len(c.cells)):
+            was_cached = comp.key in self.cache
+            if self._solve(comp, deadline):
+                solved += not was_cached
+                cached += was_cached
+        # Estimated components left from before get the rest of the budget
+        for comp in sorted((c for c in self._comps if c.dist is None and c not in fresh),
+                           key=lambda c: len(c.cells)):
+            if self._solve(comp, deadline):
+                solved += 1
+        estimated = sum(1 for c in self._comps if c.dist is None)
+        self.last = (solved, cached, estimated)
+        self._combine()
+        self.exact = estimated == 0 and self.exact
+        return self.exact
+
+    @property
+    def pending(self):
+        """True if another recompute() could still turn estimates exact."""
+        return any(c.dist is None and not c.hopeless and len(c.cells) <= EXACT_MAX_CELLS
+                   for c in self._comps)
+
+    def _combine(self):
+        b = self.board
+        everything = sorted(self._comps, key=lambda c: c.cells[0])
+        left = b.mines_total - b.flag_count
+        hidden = b.size - b.revealed_count - b.flag_count
+        interior = hidden - len(self._comp_of)
+        self.exact = True
+        comps, dists = [], []
+        for comp in everything:
+            if comp.dist is not None and not comp.dist:
+                # No layout fits the flags around it: keep its estimate
+                # and leave it out of the combination
+                self.exact = False
+                continue
+            comps.append(comp)
+            if comp.dist is not None:
+                dists.append(comp.dist)
+            else:
+                dists.append({int(round(sum(comp.approx))): 1.0})
+        prob = {}
+        span = sum(max(d) for d in dists) + 1
+        logs = [_lcomb(interior, left - k) for k in range(span + 1)]
+        base = max(logs)
+
+        def f(k):
+            return math.exp(logs[k] - base) if logs[k] > -math.inf else 0.0
+
+        work = (sum(max(d) - min(d) for d in dists) + 1) * sum(len(d) for d in dists)
+        if work <= COMBINE_MAX:
+            weight = [f(k) for k in range(span + 1)]
+            pre = [{0: 1.0}]
+            for d in dists:
+                pre.append(_convolve(pre[-1], d))
+            total = pre[-1]
+            z = sum(w * weight[k] for k, w in total.items())
+            if z > 0:
+                self.interior = (sum(w * weight[k] * (left - k) for k, w in total.items()) / z / interior
+                                 if interior else 0.0)
+                # after[t]: weight of the components after i holding the
+                # rest, given t mines in the components before and in i
+                after = {t: weight[t] for t in total}
+                for i in range(len(comps) - 1, -1, -1):
+                    comp, d = comps[i], dists[i]
+                    if comp.dist is not None:
+                        # Weight of each mine count of this component given all the others
+                        g = {k: sum(w * after.get(a + k, 0.0) for a, w in pre[i].items()) for k in d}
+                        zi = sum(w * g[k] for k, w in d.items())
+                        if zi > 0:
+                            acc = [0.0] * len(comp.cells)
+                            for k, cnt in comp.counts.items():
+                                gk = g[k]
+                                for p, c in enumerate(cnt):
+                                    acc[p] += c * gk
+                            for p, c in enumerate(comp.cells):
+                                prob[c] = acc[p] / zi
+                    nxt = {}
+                    for t in pre[i]:
+                        nxt[t] = sum(w * after.get(t + k, 0.0) for k, w in d.items())
+                    top = max(nxt.values(), default=0.0)
+                    after = {t: v / top for t, v in nxt.items()} if top > 0 else nxt
+            else:
+                self.exact = False  # contradictory flags: no layout fits
+        else:
+            # Too many components to combine exactly: weigh each mine count
+            # by the interior's odds of taking one more mine instead.
+            self.exact = False
+            rho = left / max(1, interior - left + 1) if interior else 1.0
+            expected = 0.0
+            for comp in comps:
+                if comp.dist is None:
+                    continue
+                ws = {k: w * rho ** k for k, w in comp.dist.items()}
+                zi = sum(ws.values())
+                if zi <= 0:
+                    continue
+                for p, c in enumerate(comp.cells):
+                    prob[c] = sum(comp.counts[k][p] * rho ** k for k in comp.dist) / zi
+                expected += sum(k * w for k, w in ws.items()) / zi
+            self.interior = max(0.0, min(1.0, (left - expected) / interior)) if interior else 0.0
+        for comp in everything:
+            if comp.dist is None or comp.cells[0] not in prob:
+                for c, p in zip(comp.cells, comp.approx or self._estimate(comp)):
+                    prob[c] = p
+        self.prob = prob
+
+    def probability(self, i):
+        """Mine probability of cell ``i``, or None if it is revealed or flagged."""
+        st = self.board.cell_state[i]
+        if st != HIDDEN:
+            return None
+        return self.prob.get(i, self.interior)
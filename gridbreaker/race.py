@@ -0,0 +1,734 @@
+# -*- coding: utf-8 -*-
+"""
+Races: several players on the same seeded board, served over local TCP.
+
+A headless asyncio server keeps rooms. Everyone in a room plays the same
+layout (``seeded_layout`` for the room's seed and the default start cell),
+each on their own Board session; the start cell is revealed for every
+player as they join, so nobody gets a luckier first click. Moves go to the
+server, which applies them and answers each one with a diff built from
+what reveal / chord_reveal / toggle_flag returned. Players also get a
+progress line for everyone else in their room.
+
+Messages are frames: a varint payload length, then the payload, whose
+first byte is the message type and the rest varints (replay.put_varint):
+
+    client -> server
+    JOIN     topology, rows, cols, mines, room name (UTF-8, rest)
+    MOVE     index << 2 | kind              kind as in replay (REVEAL/FLAG/CHORD)
+
+    server -> client
+    WELCOME  player, topology, rows, cols, mines, seed
+    DIFF     status, n, n x (index delta << 4 | code)
+    PEER     player, revealed cells, status
+    ERROR    message (UTF-8, rest)
+
+Every MOVE gets exactly one DIFF, empty if nothing changed; the DIFF of the
+start opening follows WELCOME. Cells in a DIFF are in index order, each
+stored as the distance from the previous one (the first from -1), with a
+code: 0-8 revealed number, MINE revealed mine, FLAG_ON / FLAG_OFF, and
+MINE_AT for the mine positions sent when the game ends. A JOIN on a
+connection that is already playing starts a new session, on the room's
+board as it is (a rematch on the same layout).
+
+Each room builds its Board once; sessions share its mine map, numbers and
+openings and only own their cell states, so a session costs a few bytes
+per cell. The server is a single thread with no coroutine per connection
+(protocols parse and answer in data_received), so it runs on one core.
+``python -m gridbreaker race load`` measures it: thousands of scripted
+players, each making a move at random intervals, with per-move round
+trips reported at growing session counts.
+"""
+
+import os
+import sys
+import time
+import queue
+import random
+import signal
+import socket
+import asyncio
+import threading
+from array import array
+from collections import deque
+
+from .config import CUSTOM_MAX, RACE_PORT
+from .engine import Board, DIFFICULTIES, TOPOLOGIES, HIDDEN, REVEALED, FLAGGED
+from .generator import default_start, seeded_layout
+from .perf import Timings
+from .replay import REVEAL, FLAG, CHORD, put_varint, get_varint
+
+JOIN, MOVE = 0x01, 0x02
+WELCOME, DIFF, PEER, ERROR = 0x81, 0x82, 0x83, 0x8F
+
+PLAYING, WON, LOST, LEFT = 0, 1, 2, 3
+MINE, FLAG_ON, FLAG_OFF, MINE_AT = 9, 10, 11, 12
+
+MAX_CLIENT_FRAME = 1024          # client frames are tiny; anything larger is garbage
+MAX_SERVER_FRAME = 1 << 24
+CONNECT_BATCH = 200
+
+
+# -----------------------------
+# Protocol
+# -----------------------------
+def frame(payload):
+    out = bytearray()
+    put_varint(out, len(payload))
+    out += payload
+    return bytes(out)
+
+
+def message(kind, *fields, text=""):
+    payload = bytearray((kind,))
+    for n in fields:
+        put_varint(payload, n)
+    payload += text.encode("utf-8")
+    return frame(payload)
+
+
+def diff_message(status, cells):
+    """DIFF for ``cells``, (index, code) pairs in index order."""
+    payload = bytearray((DIFF,))
+    put_varint(payload, status)
+    put_varint(payload, len(cells))
+    prev = -1
+    for i, code in cells:
+        put_varint(payload, (i - prev) << 4 | code)
+        prev = i
+    return frame(payload)
+
+
+def join_message(room, rows, cols, mines, topology):
+    return message(JOIN, TOPOLOGIES.index(topology), rows, cols, mines, text=room)
+
+
+def move_message(kind, i):
+    return message(MOVE, i << 2 | kind)
+
+
+def decode(payload):
+    """One payload as a tuple: ("join", room, rows, cols, mines, topology),
+    ("move", kind, index), ("welcome", player, rows, cols, mines, topology,
+    seed), ("diff", status, cells), ("peer", player, revealed, status) or
+    ("error", text). Raises ValueError on anything else."""
+    try:
+        kind, pos = payload[0], 1
+        if kind == MOVE:
+            n, _ = get_varint(payload, pos)
+            return "move", n & 3, n >> 2
+        if kind == DIFF:
+            status, pos = get_varint(payload, pos)
+            n, pos = get_varint(payload, pos)
+            cells, i = [], -1
+            for _ in range(n):
+                v, pos = get_varint(payload, pos)
+                i += v >> 4
+                cells.append((i, v & 15))
+            return "diff", status, cells
+        if kind == PEER:
+            fields = []
+            for _ in range(3):
+                n, pos = get_varint(payload, pos)
+                fields.append(n)
+            return ("peer", *fields)
+        if kind in (JOIN, WELCOME):
+            fields = []
+            for _ in range(4 if kind == JOIN else 6):
+                n, pos = get_varint(payload, pos)
+                fields.append(n)
+            if kind == JOIN:
+                topology, rows, cols, mines = fields
+                return "join", bytes(payload[pos:]).decode("utf-8"), rows, cols, mines, TOPOLOGIES[topology]
+            player, topology, rows, cols, mines, seed = fields
+            return "welcome", player, rows, cols, mines, TOPOLOGIES[topology], seed
+        if kind == ERROR:
+            return "error", bytes(payload[pos:]).decode("utf-8", "replace")
+    except (IndexError, UnicodeDecodeError):
+        pass
+    raise ValueError("malformed race message")
+
+
+class FrameReader:
+    """Reassembles frames from a byte stream."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.buf = bytearray()
+
+    def feed(self, data):
+        """Payloads completed by ``data``; raises ValueError past the limit."""
+        buf = self.buf
+        buf += data
+        payloads = []
+        pos, end = 0, len(buf)
+        while True:
+            n = shift = 0
+            p = pos
+            while p < end:
+                b = buf[p]
+                p += 1
+                n |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+            else:
+                break   # length not complete yet
+            if n > self.limit:
+                raise ValueError("race frame too large")
+            if p + n > end:
+                break
+            payloads.append(bytes(buf[p:p + n]))
+            pos = p + n
+        del buf[:pos]
+        if len(buf) > self.limit + 8:
+            raise ValueError("race frame too large")
+        return payloads
+
+
+def apply_diff(board, cells):
+    """Apply DIFF cells to a client's copy of the board (mines unknown until
+    the server sends them). Returns (revealed, flag changes, mine hit) as
+    flat indices, the hit being None if no mine was revealed."""
+    state, counts, mines = board.cell_state, board.counts, board.mine_map
+    revealed, flags, bang = [], [], None
+    for i, code in cells:
+        if code <= 8:
+            state[i] = REVEALED
+            counts[i] = code
+            revealed.append(i)
+        elif code == MINE_AT or code == MINE:
+            mines[i] = 1
+            counts[i] = -1
+            if code == MINE:
+                state[i] = REVEALED
+                bang = i
+        elif state[i] != REVEALED:
+            on = code == FLAG_ON
+            if (state[i] == FLAGGED) != on:
+                board.flag_count += 1 if on else -1
+            state[i] = FLAGGED if on else HIDDEN
+            flags.append(i)
+    board.revealed_count += len(revealed)
+    return revealed, flags, bang
+
+
+def parse_address(text, default_port=RACE_PORT):
+    """"host:port" (or just "host") as (host, port); raises ValueError."""
+    host, sep, port = text.strip().rpartition(":")
+    if not sep:
+        host, port = port, ""
+    port = int(port) if port else default_port
+    if not host or not 0 < port < 65536:
+        raise ValueError(f"invalid address: {text!r}")
+    return host, port
+
+
+# -----------------------------
+# Server
+# -----------------------------
+def validate(rows, cols, mines):
+    if not (5 <= rows <= CUSTOM_MAX[0] and 5 <= cols <= CUSTOM_MAX[1]):
+        raise ValueError(f"board must be 5x5 to {CUSTOM_MAX[0]}x{CUSTOM_MAX[1]}")
+    if not 1 <= mines <= rows * cols - 9:
+        raise ValueError(f"mines must be 1 to {rows * cols - 9}")
+
+
+class Room:
+    """A race: the shared layout and the players on it."""
+
+    def __init__(self, name, rows, cols, mines, topology, seed):
+        self.name = name
+        self.seed = seed
+        self.start = default_start(rows, cols)
+        self.template = Board(rows, cols, mines, topology)
+        self.template.set_mines(seeded_layout(rows, cols, mines, topology, seed, self.start))
+        self.mine_cells = [i for i, m in enumerate(self.template.mine_map) if m]
+        self.players = {}
+
+    def board(self):
+        """A session board: shares the template's layout, numbers and
+        openings (never written during play), owns its play state."""
+        t = self.template
+        b = Board(t.rows, t.cols, t.mines_total, t.topology)
+        b.mine_map, b.counts = t.mine_map, t.counts
+        b.zero_region, b.open_offsets, b.open_cells = t.zero_region, t.open_offsets, t.open_cells
+        b.region_opened = bytearray(len(t.region_opened))
+        b.region_flags = array("I", bytes(4 * len(t.region_flags)))
+        b.three_bv = t.three_bv
+        b.mines_placed = True
+        return b
+
+
+class Player(asyncio.Protocol):
+    """One connection; ``board`` is its current session."""
+
+    def __init__(self, server):
+        self.server = server
+        self.id = 0
+        self.transport = None
+        self.reader = FrameReader(MAX_CLIENT_FRAME)
+        self.room = None
+        self.board = None
+        self.status = LEFT
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.id = self.server.connected(self)
+        try:
+            transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError):
+            pass
+
+    def data_received(self, data):
+        try:
+            for payload in self.reader.feed(data):
+                self.server.handle(self, decode(payload))
+        except ValueError as e:
+            self.send(message(ERROR, text=str(e)))
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.server.disconnected(self)
+
+    def send(self, data):
+        self.transport.write(data)
+
+
+class RaceServer:
+    """Rooms by name, created on first JOIN and dropped when empty. Room
+    seeds come from ``rng`` (a seeded Random makes load tests repeatable)."""
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.rooms = {}
+        self.players = 0
+        self.peak = 0
+        self.next_id = 1
+        self.moves = self.joins = 0
+        self.handling = Timings(maxlen=100000, echo=False)
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=RACE_PORT):
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: Player(self), host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[:2]
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+    def connected(self, player):
+        self.players += 1
+        self.peak = max(self.peak, self.players)
+        self.next_id += 1
+        return self.next_id - 1
+
+    def disconnected(self, player):
+        self.players -= 1
+        self._leave(player)
+
+    def handle(self, player, msg):
+        t = time.perf_counter()
+        if msg[0] == "move":
+            if player.board is None:
+                raise ValueError("move before join")
+            self._move(player, msg[1], msg[2])
+            self.handling.add("move", (time.perf_counter() - t) * 1000.0)
+        elif msg[0] == "join":
+            self._join(player, *msg[1:])
+            self.handling.add("join", (time.perf_counter() - t) * 1000.0)
+        else:
+            raise ValueError(f"unexpected {msg[0]} message")
+
+    def _join(self, player, name, rows, cols, mines, topology):
+        if name not in self.rooms:
+            try:
+                validate(rows, cols, mines)
+            except ValueError as e:
+                player.send(message(ERROR, text=str(e)))
+                return
+        self._leave(player)
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, rows, cols, mines, topology, self.rng.getrandbits(32))
+        self.joins += 1
+        b = player.board = room.board()
+        player.room, player.status = room, PLAYING
+        player.send(message(WELCOME, player.id, TOPOLOGIES.index(b.topology), b.rows, b.cols,
+                            b.mines_total, room.seed))
+        for other in room.players.values():
+            player.send(message(PEER, other.id, other.board.revealed_count, other.status))
+        room.players[player.id] = player
+        _, newly = b.reveal(*room.start)
+        self._reply(player, self._revealed(b, newly), 0, PLAYING)
+
+    def _leave(self, player):
+        room = player.room
+        if room is None:
+            return
+        player.room = player.board = None
+        player.status = LEFT
+        del room.players[player.id]
+        if not room.players:
+            del self.rooms[room.name]
+            return
+        data = message(PEER, player.id, 0, LEFT)
+        for other in room.players.values():
+            other.send(data)
+
+    def _move(self, player, kind, i):
+        b = player.board
+        if not 0 <= i < b.size:
+            raise ValueError("cell out of range")
+        self.moves += 1
+        before, status = b.revealed_count, player.status
+        cells = []
+        if status != PLAYING:
+            pass
+        elif kind == FLAG:
+            delta = b.toggle_flag(*divmod(i, b.cols))
+            if delta:
+                cells.append((i, FLAG_ON if delta > 0 else FLAG_OFF))
+        else:
+            hit, newly = (b.chord_reveal if kind == CHORD else b.reveal)(*divmod(i, b.cols))
+            cells = self._revealed(b, newly)
+            if hit:
+                status = LOST
+            elif newly and b.is_win():
+                status = WON
+            if status != PLAYING:
+                state = b.cell_state
+                cells += [(m, MINE_AT) for m in player.room.mine_cells if state[m] != REVEALED]
+                cells.sort()
+        self._reply(player, cells, before, status)
+
+    def _revealed(self, board, newly):
+        cols, counts = board.cols, board.counts
+        cells = []
+        for r, c in newly:
+            i = r * cols + c
+            n = counts[i]
+            cells.append((i, MINE if n < 0 else n))
+        cells.sort()
+        return cells
+
+    def _reply(self, player, cells, before, status):
+        player.send(diff_message(status, cells))
+        revealed = player.board.revealed_count
+        if revealed == before and status == player.status:
+            return
+        player.status = status
+        data = message(PEER, player.id, revealed, status)
+        for other in player.room.players.values():
+            if other is not player:
+                other.send(data)
+
+    def summary(self, cpu_s):
+        move = self.handling.summary("move")
+        line = (f"served {self.moves} moves, {self.joins} sessions, peak {self.peak} players; "
+                f"cpu {cpu_s:.2f} s")
+        if move:
+            line += (f", {cpu_s * 1e6 / max(1, self.moves + self.joins):.0f} us per message; handling "
+                     f"p50 {move['p50'] * 1000:.0f} us, p99 {move['p99'] * 1000:.0f} us, "
+                     f"max {move['max'] * 1000:.0f} us")
+        return line
+
+
+async def serve(host, port, seed=None, ready=None):
+    """Run a RaceServer until SIGINT/SIGTERM; returns it."""
+    server = RaceServer(random.Random(seed) if seed is not None else None)
+    addr = await server.start(host, port)
+    if ready:
+        ready(addr)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+    return server
+
+
+# -----------------------------
+# Client (for the App)
+# -----------------------------
+class RaceClient:
+    """Blocking connection with a reader thread, for programs that have
+    their own event loop: send with join() / move() and collect decoded
+    messages with poll(). A "diff" gets the move's round trip in ms
+    appended (None for the start opening); a lost connection arrives as
+    ("closed",)."""
+
+    def __init__(self, host, port=RACE_PORT, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.sock.settimeout(None)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.messages = queue.Queue()
+        self._sent = deque()     # send times of moves still waiting for their DIFF
+        self._opening = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._read_loop, name="gridbreaker-race", daemon=True)
+        self._thread.start()
+
+    def join(self, room, rows, cols, mines, topology):
+        self._send(join_message(room, rows, cols, mines, topology))
+
+    def move(self, kind, i):
+        self._sent.append(time.perf_counter())
+        self._send(move_message(kind, i))
+
+    def poll(self):
+        out = []
+        while True:
+            try:
+                out.append(self.messages.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self):
+        self._closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _send(self, data):
+        try:
+            self.sock.sendall(data)
+        except OSError:
+            self.messages.put(("closed",))
+
+    def _read_loop(self):
+        reader = FrameReader(MAX_SERVER_FRAME)
+        try:
+            while True:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                for payload in reader.feed(data):
+                    msg = decode(payload)
+                    if msg[0] == "welcome":
+                        self._opening = True
+                    elif msg[0] == "diff":
+                        if self._opening or not self._sent:
+                            self._opening = False
+                            msg += (None,)
+                        else:
+                            msg += ((time.perf_counter() - self._sent.popleft()) * 1000.0,)
+                    self.messages.put(msg)
+        except (OSError, ValueError):
+            pass
+        if not self._closed:
+            self.messages.put(("closed",))
+
+
+# -----------------------------
+# Load test
+# -----------------------------
+class LoadStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.rtt = Timings(maxlen=None, echo=False)
+        self.moves = self.games = self.errors = 0
+        self.t0 = time.perf_counter()
+
+
+class Bot(asyncio.Protocol):
+    """A scripted player: after each reply it waits an exponential think
+    time (mean 1 / rate seconds), then reveals a random hidden cell, or
+    now and then flags or chords one. Finished games are rejoined."""
+
+    def __init__(self, stats, room, dims, rate, rng):
+        self.stats, self.room, self.dims = stats, room, dims
+        self.rate, self.rng = rate, rng
+        self.reader = FrameReader(MAX_SERVER_FRAME)
+        self.transport = None
+        self.board = None
+        self.sent = None
+        self.timer = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        transport.write(join_message(self.room, *self.dims))
+
+    def connection_lost(self, exc):
+        if self.timer is not None:
+            self.timer.cancel()
+
+    def data_received(self, data):
+        for payload in self.reader.feed(data):
+            msg = decode(payload)
+            if msg[0] == "welcome":
+                _, _, rows, cols, mines, topology, _ = msg
+                self.board = Board(rows, cols, mines, topology)
+            elif msg[0] == "diff":
+                if self.sent is not None:
+                    self.stats.rtt.add("rtt", (time.perf_counter() - self.sent) * 1000.0)
+                    self.stats.moves += 1
+                    self.sent = None
+                apply_diff(self.board, msg[2])
+                self._later(self._move if msg[1] == PLAYING else self._rejoin)
+            elif msg[0] == "error":
+                self.stats.errors += 1
+
+    def _later(self, fn):
+        loop = asyncio.get_running_loop()
+        self.timer = loop.call_later(self.rng.expovariate(self.rate), fn)
+
+    def _rejoin(self):
+        self.stats.games += 1
+        self.transport.write(join_message(self.room, *self.dims))
+
+    def _move(self):
+        b, rng = self.board, self.rng
+        state = b.cell_state
+        x = rng.random()
+        kind, i = REVEAL, rng.randrange(b.size)
+        if x < 0.1:
+            kind = CHORD
+        elif x < 0.25:
+            kind = FLAG
+        else:
+            for _ in range(32):
+                if state[i] == HIDDEN:
+                    break
+                i = rng.randrange(b.size)
+        self.sent = time.perf_counter()
+        self.transport.write(move_message(kind, i))
+
+
+def _raise_fd_limit(needed):
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY and soft < needed:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+async def load_test(host, port, sessions, dims, rate=1.0, duration=10.0, warmup=2.0,
+                    room_size=4, seed=0, progress=None):
+    """Connect bots up to each count in ``sessions`` (ascending), let them
+    settle for ``warmup`` seconds and measure for ``duration``; returns one
+    result dict per stage."""
+    loop = asyncio.get_running_loop()
+    stats = LoadStats()
+    bots, results = [], []
+    try:
+        for target in sorted(sessions):
+            while len(bots) < target:
+                batch = [loop.create_connection(
+                    lambda k=k: Bot(stats, f"load-{k // room_size}", dims, rate, random.Random(f"{seed}:{k}")),
+                    host, port) for k in range(len(bots), min(target, len(bots) + CONNECT_BATCH))]
+                bots += [bot for _, bot in await asyncio.gather(*batch)]
+            await asyncio.sleep(warmup)
+            stats.reset()
+            await asyncio.sleep(duration)
+            elapsed = time.perf_counter() - stats.t0
+            result = dict(stats.rtt.summary("rtt") or {"count": 0})
+            result.update(sessions=len(bots), moves_per_s=stats.moves / elapsed, games=stats.games,
+                          errors=stats.errors)
+            results.append(result)
+            if progress:
+                progress(result)
+    finally:
+        for bot in bots:
+            bot.transport.close()
+    return results
+
+
+# -----------------------------
+# CLI (python -m gridbreaker race serve|load; arguments in __main__)
+# -----------------------------
+def run(args):
+    if args.mode == "serve":
+        return _run_serve(args)
+    return _run_load(args)
+
+
+def _run_serve(args):
+    _raise_fd_limit(65536)
+
+    def ready(addr):
+        print(f"listening on {addr[0]}:{addr[1]}", flush=True)
+
+    cpu = time.process_time()
+    try:
+        server = asyncio.run(serve(args.host, args.port, args.seed, ready))
+    except KeyboardInterrupt:
+        return 0
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(server.summary(time.process_time() - cpu), flush=True)
+    return 0
+
+
+def _run_load(args):
+    import subprocess
+    _raise_fd_limit(max(args.sessions) * 2 + 256)
+    proc = None
+    if args.connect:
+        try:
+            host, port = parse_address(args.connect)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    else:
+        env = dict(os.environ)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = root + os.pathsep + env.get("PYTHONPATH", "")
+        proc = subprocess.Popen([sys.executable, "-m", "gridbreaker", "race", "serve", "--port", "0",
+                                 "--seed", str(args.seed)], stdout=subprocess.PIPE, text=True, env=env)
+        line = proc.stdout.readline()
+        if not line.startswith("listening on "):
+            proc.kill()
+            print("race server failed to start", file=sys.stderr)
+            return 2
+        host, port = parse_address(line[len("listening on "):])
+    rows, cols, mines = DIFFICULTIES[args.difficulty]
+    print(f"{rows}x{cols}/{mines} {args.topology}, {args.rate:g} moves/s per player, "
+          f"rooms of {args.room_size}, {args.duration:g} s per stage")
+    print(f"{'sessions':>8} {'moves/s':>9} {'moves':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'games':>6}", flush=True)
+
+    def progress(st):
+        if not st["count"]:
+            print(f"{st['sessions']:>8} {'no moves':>9}", flush=True)
+            return
+        print(f"{st['sessions']:>8} {st['moves_per_s']:>9.0f} {st['count']:>7} {st['p50']:>8.2f} "
+              f"{st['p95']:>8.2f} {st['p99']:>8.2f} {st['max']:>8.2f} {st['games']:>6}"
+              f"{'  %d errors' % st['errors'] if st['errors'] else ''}", flush=True)
+
+    try:
+        results = asyncio.run(load_test(host, port, args.sessions, (rows, cols, mines, args.topology),
+                                        args.rate, args.duration, args.warmup, args.room_size,
+                                        args.seed, progress))
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGINT)
+            out, _ = proc.communicate(timeout=30)
+            if out.strip():
+                print(f"server: {out.strip()}")
+    measured = [r for r in results if r["count"]]
+    if len(measured) > 1:
+        lo, hi = measured[0], measured[-1]
+        print(f"p50 at {hi['sessions']} vs {lo['sessions']} sessions: x{hi['p50'] / lo['p50']:.2f}")
+    if args.budget is not None and any(r["count"] and r["p99"] > args.budget for r in results):
+        print(f"FAIL: p99 over {args.budget:g} ms")
+        return 1
+    return 0
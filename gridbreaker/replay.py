@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Compact binary game replays.
+
+A game is fully determined by its board parameters, the seed its mines were
+drawn from and the moves that followed, so that is all a replay stores:
+
+    b"GB" version                        magic, format version (one byte)
+    varint flags                         topology index << 1 | no_guess
+    varint rows, cols, mines, seed
+    varint first                         flat index of the first reveal
+    events until the end of the record:
+        varint dt                        ms since the previous event
+        varint zigzag(index delta) << 2 | kind
+
+Cell indices are stored as the difference from the previous event's cell,
+so clicks near each other cost one byte. Layouts are rebuilt with
+generator.seeded_layout. The replay log is a sequence of records, each
+prefixed by its varint length, appended as games finish.
+"""
+
+import os
+import time
+
+from .config import REPLAY_FILE
+from .engine import Board, TOPOLOGIES, REVEALED
+from .generator import seeded_layout
+
+MAGIC = b"GB"
+VERSION = 1
+
+REVEAL, FLAG, CHORD = 0, 1, 2
+KINDS = ("reveal", "flag", "chord")
+
+
+# -----------------------------
+# Varints
+# -----------------------------
+def put_varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def zigzag(n):
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+
+def unzigzag(n):
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+# -----------------------------
+# Replay
+# -----------------------------
+class Replay:
+    """One recorded game. ``events`` is a list of (t_ms, kind, index) with
+    t_ms counted from when the game was set up."""
+
+    __slots__ = ("rows", "cols", "mines", "topology", "seed", "no_guess", "first", "events")
+
+    def __init__(self, rows, cols, mines, topology, seed, no_guess, first, events):
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.topology = topology
+        self.seed = seed
+        self.no_guess = no_guess
+        self.first = first
+        self.events = events
+
+    @property
+    def duration_ms(self):
+        """Time from the first reveal to the last move, as the game timer saw it."""
+        start = next((t for t, kind, _ in self.events if kind == REVEAL), 0)
+        return self.events[-1][0] - start if self.events else 0
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        for n in (TOPOLOGIES.index(self.topology) << 1 | bool(self.no_guess),
+                  self.rows, self.cols, self.mines, self.seed, self.first):
+            put_varint(out, n)
+        prev_t = prev_i = 0
+        for t, kind, i in self.events:
+            put_varint(out, t - prev_t)
+            put_varint(out, zigzag(i - prev_i) << 2 | kind)
+            prev_t, prev_i = t, i
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:2] != MAGIC or len(data) < 3:
+            raise ValueError("not a GridBreaker replay")
+        if data[2] != VERSION:
+            raise ValueError(f"unsupported replay version {data[2]}")
+        pos = 3
+        fields = []
+        for _ in range(6):
+            n, pos = get_varint(data, pos)
+            fields.append(n)
+        flags, rows, cols, mines, seed, first = fields
+        events = []
+        t = i = 0
+        end = len(data)
+        while pos < end:
+            dt, pos = get_varint(data, pos)
+            code, pos = get_varint(data, pos)
+            t += dt
+            i += unzigzag(code >> 2)
+            events.append((t, code & 3, i))
+        return cls(rows, cols, mines, TOPOLOGIES[flags >> 1], seed, bool(flags & 1), first, events)
+
+    def layout(self):
+        return seeded_layout(self.rows, self.cols, self.mines, self.topology, self.seed,
+                             divmod(self.first, self.cols), self.no_guess)
+
+    def board(self):
+        """A fresh Board with this game's mines in place."""
+        board = Board(self.rows, self.cols, self.mines, self.topology)
+        board.set_mines(self.layout())
+        return board
+
+    def play(self, board=None):
+        """Apply the moves to ``board`` (default: a fresh one) as fast as
+        possible, yielding (t_ms, kind, r, c, newly) after each. Stops after
+        a mine is hit."""
+        board = board or self.board()
+        cols = self.cols
+        for t, kind, i in self.events:
+            r, c = divmod(i, cols)
+            if kind == FLAG:
+                hit, newly = False, [(r, c)] if board.toggle_flag(r, c) is not None else []
+            elif kind == CHORD:
+                hit, newly = board.chord_reveal(r, c)
+            else:
+                hit, newly = board.reveal(r, c)
+            yield t, kind, r, c, newly
+            if hit:
+                return
+
+    def run(self):
+        """Play to the end; returns (board, outcome) with outcome one of
+        "won", "lost" or "abandoned"."""
+        board = self.board()
+        for _ in self.play(board):
+            pass
+        state, mines = board.cell_state, board.mine_map
+        if any(mines[i] and state[i] == REVEALED for i in range(board.size)):
+            return board, "lost"
+        return board, "won" if board.is_win() else "abandoned"
+
+
+class Recorder:
+    """Collects the moves of the game in progress."""
+
+    def __init__(self, rows, cols, mines, topology, seed, no_guess=False, clock=time.perf_counter):
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.topology = topology
+        self.seed = seed
+        self.no_guess = no_guess
+        self.clock = clock
+        self.t0 = clock()
+        self.first = None
+        self.events = []
+
+    @classmethod
+    def resume(cls, replay, clock=time.perf_counter):
+        """Keep recording ``replay``; its clock picks up at the last move."""
+        rec = cls(replay.rows, replay.cols, replay.mines, replay.topology, replay.seed,
+                  replay.no_guess, clock)
+        rec.first = replay.first
+        rec.events = list(replay.events)
+        if rec.events:
+            rec.t0 -= rec.events[-1][0] / 1000.0
+        return rec
+
+    def record(self, kind, r, c):
+        i = r * self.cols + c
+        if kind == REVEAL and self.first is None:
+            self.first = i
+        self.events.append((int((self.clock() - self.t0) * 1000), kind, i))
+
+    def replay(self):
+        """The recorded game, or None if it never got a first reveal."""
+        if self.first is None:
+            return None
+        return Replay(self.rows, self.cols, self.mines, self.topology, self.seed, self.no_guess,
+                      self.first, list(self.events))
+
+
+# -----------------------------
+# Replay log
+# -----------------------------
+def append_replay(data, path=REPLAY_FILE):
+    frame = bytearray()
+    put_varint(frame, len(data))
+    with open(path, "ab") as f:
+        f.write(bytes(frame) + data)
+
+
+def load_replays(path=REPLAY_FILE):
+    """Every replay in the log, oldest first; a torn final record is skipped."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    replays = []
+    pos = 0
+    while pos < len(data):
+        try:
+            n, start = get_varint(data, pos)
+        except IndexError:
+            break
+        if start + n > len(data):
+            break
+        try:
+            replays.append(Replay.from_bytes(data[start:start + n]))
+        except (ValueError, IndexError):
+            pass
+        pos = start + n
+    return replays
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo simulator: play many seeded games headlessly across processes.
+
+Game ``g`` of a run always uses ``random.Random(f"{seed}:{g}")`` for both
+the mine layout and the strategy's choices, so results depend only on the
+master seed and game count, never on worker count or chunk size.
+"""
+
+import sys
+import math
+import json
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .config import SIM_FIRST_CLICKS as FIRST_CLICKS
+from .engine import Board, HIDDEN
+from .solver import Solver
+
+# -----------------------------
+# Strategies
+# -----------------------------
+# A strategy plays one game on a fresh board whose first click has already
+# been made and returns the number of further moves it took. It stops when
+# the board is won or a mine is hit (check board.is_win() / the return of
+# reveal). Register new strategies in STRATEGIES and config.SIM_STRATEGIES.
+
+
+def first_click_cell(board, where, rng):
+    if where == "corner":
+        return 0, 0
+    if where == "random":
+        return rng.randrange(board.rows), rng.randrange(board.cols)
+    return board.rows // 2, board.cols // 2
+
+
+def play_first_click(board, rng):
+    """Stop after the first click (measures first-click outcomes only)."""
+    return 0, False
+
+
+def play_random(board, rng):
+    """Reveal uniformly random hidden cells until the game ends."""
+    hidden = [i for i in range(board.size) if board.cell_state[i] == HIDDEN]
+    moves = 0
+    while hidden and not board.is_win():
+        k = rng.randrange(len(hidden))
+        i = hidden[k]
+        hidden[k] = hidden[-1]
+        hidden.pop()
+        if board.cell_state[i] != HIDDEN:
+            continue
+        moves += 1
+        hit, _ = board.reveal(*divmod(i, board.cols))
+        if hit:
+            return moves, True
+    return moves, False
+
+
+def play_solver(board, rng):
+    """Reveal every cell the solver proves safe; guess a random cell that is
+    not a proven mine when it is stuck."""
+    solver = Solver(board)
+    moves = 0
+    while not board.is_win():
+        cell = solver.next_safe()
+        if cell is None:
+            hidden = [i for i in range(board.size)
+                      if board.cell_state[i] == HIDDEN and i not in solver.mines]
+            cell = board.pos(rng.choice(hidden))
+        moves += 1
+        hit, newly = board.reveal(*cell)
+        if hit:
+            return moves, True
+        solver.update(newly)
+    return moves, False
+
+
+STRATEGIES = {
+    "first-click": play_first_click,
+    "random": play_random,
+    "solver": play_solver,
+}
+
+# -----------------------------
+# Aggregates
+# -----------------------------
+class Tally:
+    """Running totals for a batch of games; tallies from workers merge.
+
+    Every total is an integer, so merging in any order gives the same
+    result whatever the worker count or chunk size.
+    """
+    __slots__ = ("games", "wins", "losses", "first_click_wins", "first_reveal_cells",
+                 "three_bv", "moves", "revealed_cells", "safe_cells")
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.first_click_wins = 0
+        self.first_reveal_cells = 0
+        self.three_bv = 0
+        self.moves = 0
+        self.revealed_cells = 0
+        self.safe_cells = 0
+
+    def merge(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def summary(self):
+        n = max(self.games, 1)
+        p = self.wins / n
+        # 95% Wilson score interval for the win rate
+        z = 1.96
+        denom = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denom
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": p,
+            "win_rate_ci95": [max(0.0, center - half), min(1.0, center + half)],
+            "first_click_win_rate": self.first_click_wins / n,
+            "mean_first_reveal_cells": self.first_reveal_cells / n,
+            "mean_three_bv": self.three_bv / n,
+            "mean_moves": self.moves / n,
+            "mean_revealed_fraction": self.revealed_cells / self.safe_cells if self.safe_cells else 1.0,
+        }
+
+
+def play_game(rows, cols, mines, topology, strategy, first_click, seed, game):
+    rng = random.Random(f"{seed}:{game}")
+    board = Board(rows, cols, mines, topology, rng=rng)
+    r, c = first_click_cell(board, first_click, rng)
+    board.place_mines(r, c)
+    _, newly = board.reveal(r, c)
+    first_win = board.is_win()
+    moves, lost = (0, False) if first_win else STRATEGIES[strategy](board, rng)
+    return board, len(newly), first_win, moves, lost
+
+
+def run_chunk(rows, cols, mines, topology, strategy, first_click, seed, start, count):
+    """Worker entry point: play games [start, start + count) into one Tally."""
+    tally = Tally()
+    safe_cells = rows * cols - mines
+    for game in range(start, start + count):
+        board, first_cells, first_win, moves, lost = play_game(
+            rows, cols, mines, topology, strategy, first_click, seed, game)
+        won = board.is_win()
+        tally.games += 1
+        tally.wins += won
+        tally.losses += lost
+        tally.first_click_wins += first_win
+        tally.first_reveal_cells += first_cells
+        tally.three_bv += board.three_bv
+        tally.moves += moves
+        tally.revealed_cells += board.revealed_count
+        tally.safe_cells += safe_cells
+    return start, tally
+
+
+def simulate(rows, cols, mines, games, topology="square", strategy="random", first_click="center",
+             seed=0, workers=None, chunk=1000, progress=None):
+    """Play ``games`` games and return (Tally, elapsed seconds).
+
+    Chunks of ``chunk`` games are spread over a process pool; each finished
+    chunk's Tally is merged as it arrives and passed to ``progress(tally)``.
+    ``workers=0`` runs everything in this process.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy: {strategy!r}")
+    jobs = [(start, min(chunk, games - start)) for start in range(0, games, chunk)]
+    args = (rows, cols, mines, topology, strategy, first_click, seed)
+    total = Tally()
+    t0 = time.perf_counter()
+    if workers == 0:
+        for start, count in jobs:
+            total.merge(run_chunk(*args, start, count)[1])
+            if progress:
+                progress(total)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_chunk, *args, start, count) for start, count in jobs]
+            for fut in as_completed(futures):
+                total.merge(fut.result()[1])
+                if progress:
+                    progress(total)
+    return total, time.perf_counter() - t0
+
+
+# -----------------------------
+# CLI (python -m gridbreaker simulate; arguments in __main__)
+# -----------------------------
+def run(args, rows, cols, mines):
+    def progress(t):
+        print(f"\r{t.games}/{args.games} games", end="", file=sys.stderr, flush=True)
+
+    tally, elapsed = simulate(rows, cols, mines, args.games, args.topology, args.strategy,
+                              args.first_click, args.seed, args.workers, args.chunk,
+                              None if args.quiet else progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    summary = tally.summary()
+    summary.update({
+        "rows": rows, "cols": cols, "mines": mines, "topology": args.topology,
+        "strategy": args.strategy, "first_click": args.first_click, "seed": args.seed,
+        "elapsed_s": elapsed, "games_per_s": tally.games / elapsed if elapsed else 0.0,
+    })
+    lo, hi = summary["win_rate_ci95"]
+    print(f"{rows}x{cols}/{mines} {args.topology}, strategy {args.strategy}, seed {args.seed}")
+    print(f"  games        {tally.games}")
+    print(f"  win rate     {summary['win_rate']:.4%}  (95% CI {lo:.4%} .. {hi:.4%})")
+    print(f"  first click  wins {summary['first_click_win_rate']:.4%}, "
+          f"opens {summary['mean_first_reveal_cells']:.1f} cells on average")
+    print(f"  mean 3BV     {summary['mean_three_bv']:.2f}")
+    print(f"  revealed     {summary['mean_revealed_fraction']:.2%} of safe cells on average")
+    print(f"  throughput   {summary['games_per_s']:.0f} games/s ({elapsed:.2f} s)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
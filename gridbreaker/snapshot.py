@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Bit-packed save/resume snapshots of a game in progress.
+
+Layout (little-endian):
+
+    header   struct HEADER: magic, version, topology, flags, difficulty,
+             rows, cols, mines, revealed, flagged, elapsed ms, seed
+    mines    1 bit per cell, ceil(size / 8) bytes
+    states   2 bits per cell (HIDDEN/REVEALED/FLAGGED), ceil(size / 4) bytes
+    replay   optional: the game's replay record so far (replay.py format)
+
+Packing and unpacking go through 256-entry byte tables joined in C, so
+a 1M-cell board loads in a few milliseconds plus Board.resume(). Files at
+least MMAP_THRESHOLD bytes are read through mmap instead of copied.
+Writes go to a temporary file that replaces the old one atomically.
+"""
+
+import os
+import mmap
+import struct
+
+from .engine import Board, TOPOLOGIES
+
+MAGIC = b"GS"
+VERSION = 1
+HEADER = struct.Struct("<2sBBBBIIIIIII")
+MMAP_THRESHOLD = 256 * 1024
+
+DIFF_CODES = ("beginner", "intermediate", "expert", "custom")
+F_NO_GUESS, F_REPLAY = 1, 2
+
+# byte -> its bits / 2-bit fields, one output byte each (LSB first)
+_BITS = [bytes((b >> k) & 1 for k in range(8)) for b in range(256)]
+_PAIRS = [bytes((b >> k) & 3 for k in range(0, 8, 2)) for b in range(256)]
+_PACK_BITS = {v: k for k, v in enumerate(_BITS)}
+_PACK_PAIRS = {v: k for k, v in enumerate(_PAIRS)}
+
+
+def pack(cells, per_byte):
+    """One byte per cell -> ``per_byte`` cells per byte (8 for 0/1 values,
+    4 for values 0..3)."""
+    table = _PACK_BITS if per_byte == 8 else _PACK_PAIRS
+    data = bytes(cells)
+    pad = -len(data) % per_byte
+    if pad:
+        data += bytes(pad)
+    return bytes(map(table.__getitem__, (data[i:i + per_byte] for i in range(0, len(data), per_byte))))
+
+
+def unpack(packed, per_byte, count):
+    table = _BITS if per_byte == 8 else _PAIRS
+    return b"".join(map(table.__getitem__, packed))[:count]
+
+
+class Snapshot:
+    """A decoded save: the resumed Board plus what the App needs around it."""
+
+    __slots__ = ("board", "elapsed_ms", "seed", "no_guess", "difficulty", "replay")
+
+    def __init__(self, board, elapsed_ms, seed, no_guess, difficulty, replay=None):
+        self.board = board
+        self.elapsed_ms = elapsed_ms
+        self.seed = seed
+        self.no_guess = no_guess
+        self.difficulty = difficulty
+        self.replay = replay
+
+
+def dumps(board, elapsed_ms=0, seed=0, no_guess=False, difficulty="custom", replay=b""):
+    flags = (F_NO_GUESS if no_guess else 0) | (F_REPLAY if replay else 0)
+    head = HEADER.pack(MAGIC, VERSION, TOPOLOGIES.index(board.topology), flags,
+                       DIFF_CODES.index(difficulty if difficulty in DIFF_CODES else "custom"),
+                       board.rows, board.cols, board.mines_total, board.revealed_count,
+                       board.flag_count, int(elapsed_ms), seed)
+    return b"".join((head, pack(board.mine_map, 8), pack(board.cell_state, 4), replay or b""))
+
+
+def loads(buf):
+    """Decode a snapshot from any buffer (bytes, memoryview, mmap)."""
+    if len(buf) < HEADER.size:
+        raise ValueError("snapshot truncated")
+    (magic, version, topo, flags, diff, rows, cols, mines,
+     revealed, flagged, elapsed_ms, seed) = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a GridBreaker snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    size = rows * cols
+    mine_end = HEADER.size + (size + 7) // 8
+    state_end = mine_end + (size + 3) // 4
+    if len(buf) < state_end:
+        raise ValueError("snapshot truncated")
+    view = memoryview(buf)
+    board = Board(rows, cols, mines, TOPOLOGIES[topo])
+    board.resume(unpack(view[HEADER.size:mine_end], 8, size), unpack(view[mine_end:state_end], 4, size))
+    if board.revealed_count != revealed or board.flag_count != flagged:
+        raise ValueError("snapshot counters do not match its cells")
+    replay = bytes(view[state_end:]) if flags & F_REPLAY else None
+    view.release()
+    return Snapshot(board, elapsed_ms, seed, bool(flags & F_NO_GUESS), DIFF_CODES[diff], replay)
+
+
+def save(path, board, **meta):
+    """Write atomically: a crash mid-write leaves the previous file intact."""
+    data = dumps(board, **meta)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path):
+    """The snapshot at ``path``, or None if there is none."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return loads(mm)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental deterministic solver for hints and auto-play.
+
+The solver keeps the set of hidden cells proven safe and proven to be mines.
+It never rescans the board: after each move, ``update()`` receives the cells
+that move changed and re-examines only the revealed numbers around them.
+Each number gives a constraint "these unknown neighbors hold k mines"; two
+rules are applied:
+
+- single cell: k == 0 makes every unknown safe, k == len(unknowns) makes
+  every unknown a mine;
+- subset: if A's unknowns are a subset of B's, then B's extra unknowns hold
+  exactly k_B - k_A mines, which may again be 0 or all of them.
+
+Each new deduction queues the numbers next to it, so work stays
+proportional to the area a move affects, not to the board size.
+"""
+
+from .engine import REVEALED, FLAGGED
+
+
+class Solver:
+    def __init__(self, board, trust_flags=False):
+        self.board = board
+        # Player flags can be wrong; by default only proven mines count.
+        self.trust_flags = trust_flags
+        self.safe = set()    # hidden cells proven safe (flat indices)
+        self.mines = set()   # cells proven to be mines (flat indices)
+        self._queue = set()
+        b = board
+        i = b.cell_state.find(REVEALED)
+        while i != -1:
+            if b.counts[i] > 0:
+                self._queue.add(i)
+            i = b.cell_state.find(REVEALED, i + 1)
+        self._propagate()
+
+    # ---- Queries ----
+    def hint(self):
+        """("safe", (r, c)) or ("mine", (r, c)) for a proven cell, else None.
+        Mines already flagged are not suggested."""
+        pos = self.board.pos
+        for i in self.safe:
+            return "safe", pos(i)
+        state = self.board.cell_state
+        for i in self.mines:
+            if state[i] != FLAGGED:
+                return "mine", pos(i)
+        return None
+
+    def next_safe(self):
+        return self.board.pos(next(iter(self.safe))) if self.safe else None
+
+    # ---- Updates ----
+    def update(self, cells):
+        """Feed the cells changed by reveal/chord_reveal/toggle_flag."""
+        b = self.board
+        cols, state, counts = b.cols, b.cell_state, b.counts
+        indices, offsets = b.adj.indices, b.adj.offsets
+        queue = self._queue
+        for cell in cells:
+            i = cell if isinstance(cell, int) else cell[0] * cols + cell[1]
+            if state[i] == REVEALED:
+                self.safe.discard(i)
+                if counts[i] > 0:
+                    queue.add(i)
+            for n in indices[offsets[i]:offsets[i + 1]]:
+                if state[n] == REVEALED and counts[n] > 0:
+                    queue.add(n)
+        self._propagate()
+
+    def _constraint(self, x):
+        # Unknown neighbors of revealed number x and the mines among them.
+        b = self.board
+        state = b.cell_state
+        mines, safe, trust = self.mines, self.safe, self.trust_flags
+        unknown = set()
+        remaining = b.counts[x]
+        for n in b.adj.indices[b.adj.offsets[x]:b.adj.offsets[x + 1]]:
+            st = state[n]
+            if st == REVEALED or n in safe:
+                continue
+            if n in mines or (trust and st == FLAGGED):
+                remaining -= 1
+            else:
+                unknown.add(n)
+        return unknown, remaining
+
+    def _mark(self, cells, is_mine):
+        b = self.board
+        target = self.mines if is_mine else self.safe
+        indices, offsets, state, counts = b.adj.indices, b.adj.offsets, b.cell_state, b.counts
+        for n in cells:
+            if n in target:
+                continue
+            target.add(n)
+            for y in indices[offsets[n]:offsets[n + 1]]:
+                if state[y] == REVEALED and counts[y] > 0:
+                    self._queue.add(y)
+
+    def _propagate(self):
+        b = self.board
+        indices, offsets, state, counts = b.adj.indices, b.adj.offsets, b.cell_state, b.counts
+        queue = self._queue
+        while queue:
+            x = queue.pop()
+            unknown, remaining = self._constraint(x)
+            if not unknown:
+                continue
+            if remaining == 0:
+                self._mark(unknown, False)
+                continue
+            if remaining == len(unknown):
+                self._mark(unknown, True)
+                continue
+            # Subset rule against numbers sharing an unknown with x
+            seen = {x}
+            for u in unknown:
+                for y in indices[offsets[u]:offsets[u + 1]]:
+                    if y in seen or state[y] != REVEALED or counts[y] <= 0:
+                        continue
+                    seen.add(y)
+                    other, other_rem = self._constraint(y)
+                    if unknown < other:
+                        small, small_rem, big, big_rem = unknown, remaining, other, other_rem
+                    elif other and other < unknown:
+                        small, small_rem, big, big_rem = other, other_rem, unknown, remaining
+                    else:
+                        continue
+                    extra = big - small
+                    diff = big_rem - small_rem
+                    if diff == 0:
+                        self._mark(extra, False)
+                    elif diff == len(extra):
+                        self._mark(extra, True)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Game history in SQLite: every finished or abandoned game, all board sizes.
+
+The database runs in WAL mode so the UI can read while the writer commits.
+Writes never happen on the caller's thread: record() queues the row and a
+writer thread inserts whatever has accumulated (up to BATCH rows, waiting at
+most FLUSH_DELAY for more) in one transaction. Games are keyed by their
+board (rows, cols, mines, topology); indexes serve best-N, percentile and
+recent-history queries without scanning the table.
+
+The old best-times JSON file is imported once, the first time a database
+is created next to it.
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+
+from .engine import DIFFICULTIES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    finished_at REAL    NOT NULL,
+    difficulty  TEXT    NOT NULL,
+    rows        INTEGER NOT NULL,
+    cols        INTEGER NOT NULL,
+    mines       INTEGER NOT NULL,
+    topology    TEXT    NOT NULL,
+    no_guess    INTEGER NOT NULL DEFAULT 0,
+    outcome     TEXT    NOT NULL,
+    seconds     REAL    NOT NULL,
+    moves       INTEGER NOT NULL DEFAULT 0,
+    three_bv    INTEGER NOT NULL DEFAULT 0,
+    seed        INTEGER
+);
+CREATE INDEX IF NOT EXISTS games_board ON games (rows, cols, mines, topology, outcome, seconds);
+CREATE INDEX IF NOT EXISTS games_recent ON games (finished_at);
+CREATE INDEX IF NOT EXISTS games_board_recent ON games (rows, cols, mines, topology, finished_at);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+COLUMNS = ("finished_at", "difficulty", "rows", "cols", "mines", "topology", "no_guess",
+           "outcome", "seconds", "moves", "three_bv", "seed")
+_INSERT = "INSERT INTO games ({}) VALUES ({})".format(", ".join(COLUMNS), ", ".join("?" * len(COLUMNS)))
+_BOARD = "rows = ? AND cols = ? AND mines = ? AND topology = ?"
+
+OUTCOMES = ("won", "lost", "abandoned")
+
+
+def _connect(path):
+    con = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+class GameStore:
+    BATCH = 64
+    FLUSH_DELAY = 0.25   # seconds the writer waits for more rows
+
+    def __init__(self, path, legacy_json=None):
+        self.path = path
+        con = _connect(path)
+        with con:
+            con.executescript(SCHEMA)
+        if legacy_json:
+            self._migrate(con, legacy_json)
+        self._read = con
+        self._lock = threading.Lock()   # one reader connection shared by threads
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="gridbreaker-store", daemon=True)
+        self._writer.start()
+
+    # ---- Writes ----
+    def record(self, **game):
+        """Queue one game (keys from COLUMNS; finished_at defaults to now)."""
+        game.setdefault("finished_at", time.time())
+        self._queue.put(tuple(game.get(k, 0 if k in ("no_guess", "moves", "three_bv") else None)
+                              for k in COLUMNS))
+
+    def flush(self):
+        """Block until every queued game is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join(5.0)
+        with self._lock:
+            self._read.close()
+
+    def _write_loop(self):
+        con = _connect(self.path)
+        q = self._queue
+        stop = False
+        while not stop:
+            rows, waiters = [], []
+            item = q.get()
+            deadline = time.monotonic() + self.FLUSH_DELAY
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                if stop or waiters or len(rows) >= self.BATCH:
+                    break
+                try:
+                    item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    with con:
+                        con.executemany(_INSERT, rows)
+                except sqlite3.Error:
+                    pass
+            for w in waiters:
+                w.set()
+        con.close()
+
+    def _migrate(self, con, legacy_json):
+        with con:
+            if con.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return
+            try:
+                with open(legacy_json, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                when = os.path.getmtime(legacy_json)
+            except (OSError, ValueError):
+                data, when = {}, time.time()
+            for diff, seconds in data.items():
+                if diff in DIFFICULTIES:
+                    rows, cols, mines = DIFFICULTIES[diff]
+                    con.execute(_INSERT, (when, diff, rows, cols, mines, "square", 0, "won",
+                                          float(seconds), 0, 0, None))
+            con.execute("INSERT INTO meta VALUES ('json_migrated', ?)", (str(time.time()),))
+
+    # ---- Queries ----
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._read.execute(sql, args).fetchall()
+
+    def best_times(self):
+        """{(rows, cols, mines, topology): fastest win in seconds}"""
+        return {(r, c, m, t): s for r, c, m, t, s in self._query(
+            "SELECT rows, cols, mines, topology, MIN(seconds) FROM games "
+            "WHERE outcome = 'won' GROUP BY rows, cols, mines, topology")}
+
+    def top(self, board, n=10):
+        """Fastest ``n`` wins on ``board`` as (seconds, finished_at)."""
+        return self._query(f"SELECT seconds, finished_at FROM games WHERE {_BOARD} AND outcome = 'won' "
+                           "ORDER BY seconds LIMIT ?", (*board, n))
+
+    def percentile(self, board, seconds):
+        """Share (0-100) of wins on ``board`` slower than ``seconds``, or None."""
+        (total, slower), = self._query(
+            f"SELECT COUNT(*), COALESCE(SUM(seconds > ?), 0) FROM games WHERE {_BOARD} AND outcome = 'won'",
+            (seconds, *board))
+        return 100.0 * slower / total if total else None
+
+    def summary(self, board):
+        """{outcome: games} for ``board``."""
+        counts = dict.fromkeys(OUTCOMES, 0)
+        counts.update(self._query(f"SELECT outcome, COUNT(*) FROM games WHERE {_BOARD} GROUP BY outcome",
+                                  board))
+        return counts
+
+    def recent(self, n=20, board=None):
+        """Latest ``n`` games, newest first, as dicts."""
+        where, args = (f"WHERE {_BOARD}", tuple(board)) if board else ("", ())
+        rows = self._query(f"SELECT {', '.join(COLUMNS)} FROM games {where} "
+                           "ORDER BY finished_at DESC LIMIT ?", (*args, n))
+        return [dict(zip(COLUMNS, row)) for row in rows]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Color themes and cell glyphs."""
+
+NUMBER_COLORS_LIGHT = {1: "#1976D2", 2: "#388E3C", 3: "#D32F2F", 4: "#283593", 5: "#6D4C41", 6: "#00838F", 7: "#212121", 8: "#9E9E9E"}
+NUMBER_COLORS_DARK  = {1: "#90CAF9", 2: "#A5D6A7", 3: "#EF9A9A", 4: "#9FA8DA", 5: "#BCAAA4", 6: "#80CBC4", 7: "#ECEFF1", 8: "#B0BEC5"}
+
+THEMES = {
+    "light": {
+        "bg": "#ECEFF1", "panel": "#CFD8DC", "panel_dark": "#B0BEC5",
+        "cell_up": "#ECEFF1", "cell_down": "#CFD8DC",
+        "mine_bg": "#FFCDD2", "mine_bang_bg": "#F8BBD0", "wrong_flag_bg": "#FFE0B2",
+        "text": "#212121", "time": "#1976D2", "counter": "#D32F2F",
+        "num_colors": NUMBER_COLORS_LIGHT,
+        "hover": "#E0E0E0",
+        "hint_safe": "#C8E6C9", "hint_mine": "#FFAB91"
+    },
+    "dark": {
+        "bg": "#263238", "panel": "#37474F", "panel_dark": "#455A64",
+        "cell_up": "#37474F", "cell_down": "#455A64",
+        "mine_bg": "#8D6E63", "mine_bang_bg": "#6D4C41", "wrong_flag_bg": "#5D4037",
+        "text": "#ECEFF1", "time": "#90CAF9", "counter": "#EF9A9A",
+        "num_colors": NUMBER_COLORS_DARK,
+        "hover": "#546E7A",
+        "hint_safe": "#2E7D32", "hint_mine": "#BF360C"
+    },
+}
+
+FACE_DEFAULT = "😃"
+FACE_WON = "😎"
+FACE_LOST = "😵"
+FLAG = "🚩"
+MINE = "💣"
@@ -0,0 +1,1100 @@
+# -*- coding: utf-8 -*-
+"""Tk board renderers and the frame-budgeted render queue."""
+
+import time
+from collections import deque
+import tkinter as tk
+
+from .engine import HIDDEN, REVEALED, FLAGGED
+from .themes import FLAG, MINE
+
+# -----------------------------
+# Board views (renderers)
+# -----------------------------
+# A view owns the widgets that draw the board and forwards input to the App's
+# _on_left/_on_right/_on_chord handlers. All views expose the same methods:
+#   build(rows, cols), destroy(), render_revealed(cells), render_cell(r, c),
+#   reveal_mines(bang), hide_mines(), render_hidden(cells),
+#   mark_flags(cells, color), mark_hint(r, c, color),
+#   show_heat(prob, interior), repaint()
+# render_hidden() and hide_mines() paint cells an undo made hidden again
+# and take back reveal_mines().
+HEAT_LEVELS = 16
+_heat_colors = {}
+
+
+def heat_color(t, p):
+    """Fill of a hidden cell with mine probability ``p`` (heat map overlay):
+    the safe hint color if it cannot be a mine, else cell_up shaded toward
+    the mine hint color in HEAT_LEVELS steps."""
+    if p < 1e-9:
+        return t["hint_safe"]
+    level = max(1, round(min(p, 1.0) * HEAT_LEVELS))
+    key = (t["cell_up"], t["hint_mine"], level)
+    color = _heat_colors.get(key)
+    if color is None:
+        a, b = t["cell_up"], t["hint_mine"]
+        mix = [int(a[k:k + 2], 16) + (int(b[k:k + 2], 16) - int(a[k:k + 2], 16)) * level // HEAT_LEVELS
+               for k in (1, 3, 5)]
+        color = _heat_colors[key] = "#%02X%02X%02X" % tuple(mix)
+    return color
+
+
+def shown_mines(board):
+    """Cells reveal_mines() painted that are not revealed: (r, c) of every
+    hidden or flagged mine and of every flag."""
+    state, mine_map, cols = board.cell_state, board.mine_map, board.cols
+    cells = []
+    i = mine_map.find(1)
+    while i != -1:
+        if state[i] == HIDDEN:
+            cells.append(divmod(i, cols))
+        i = mine_map.find(1, i + 1)
+    i = state.find(FLAGGED)
+    while i != -1:
+        cells.append(divmod(i, cols))
+        i = state.find(FLAGGED, i + 1)
+    return cells
+
+
+def heat_fills(t, state, prob, interior):
+    """{flat index: fill} for every hidden cell, see heat_color()."""
+    inner = heat_color(t, interior)
+    fills = {}
+    i = state.find(HIDDEN)
+    while i != -1:
+        p = prob.get(i)
+        fills[i] = inner if p is None else heat_color(t, p)
+        i = state.find(HIDDEN, i + 1)
+    return fills
+
+
+class ButtonBoardView:
+    """One tk.Button per cell (the original renderer).
+
+    Buttons are pooled across games. build() keeps the existing widgets,
+    resets only those touched since the last build, and creates or destroys
+    just the difference when the cell count changes; widgets are re-gridded
+    only when the layout changes. Input is delegated: every cell carries
+    the CELL_TAG bindtag, bound once for the whole board, and the handlers
+    map the event's widget back to its pool index. No per-cell closures or
+    Tcl commands exist, and bindings survive resizes.
+    """
+    CELL_TAG = "GridBreakerCell"
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.btns = []
+        self.rows = self.cols = 0
+        self._pool = []
+        self._index = {}      # button -> pool index
+        self._hover = None    # pool index under the pointer
+        self._hexed = False
+        self._dirty = set()   # pool indices changed since their last reset
+        self._clean = None    # theme the untouched buttons are painted in
+        self._grid_cols = 0
+        self._heat = {}       # pool index -> heat map fill
+        self._heat_src = None
+        self.last_build = (0, 0, 0)  # (reused, created, destroyed)
+        self._bind_cells()
+
+    def build(self, rows, cols):
+        app = self.app
+        t = app.theme_cfg
+        pool = self._pool
+        need = rows * cols
+        old = len(pool)
+        # Hex boards: each button spans two grid columns and odd rows start
+        # one column later, giving the half-cell offset.
+        hexed = app.board.topology == "hex"
+        relayout = cols != self.cols or hexed != self._hexed
+
+        destroyed = 0
+        while len(pool) > need:
+            btn = pool.pop()
+            del self._index[btn]
+            btn.destroy()
+            destroyed += 1
+        self._hover = None
+        reused = len(pool)
+        for i in range(reused, need):
+            pool.append(self._new_button(i))
+
+        if self._clean is not t:
+            dirty = range(reused)
+            self._clean = t
+        else:
+            dirty = [i for i in self._dirty if i < reused]
+        for i in dirty:
+            pool[i].config(text="", bg=t["cell_up"], fg=t["text"], activebackground=t["cell_down"],
+                           relief="raised")
+        self._dirty.clear()
+        self._heat, self._heat_src = {}, None
+
+        for i in range(0 if relayout else min(old, need), need):
+            r, c = divmod(i, cols)
+            if hexed:
+                pool[i].grid(row=r, column=2 * c + (r & 1), columnspan=2, padx=1, pady=1, sticky="nsew")
+            else:
+                pool[i].grid(row=r, column=c, columnspan=1, padx=1, pady=1, sticky="nsew")
+
+        grid_cols = 2 * cols + 1 if hexed else cols
+        for r in range(rows, self.rows):
+            self.parent.grid_rowconfigure(r, weight=0)
+        for c in range(grid_cols, self._grid_cols):
+            self.parent.grid_columnconfigure(c, weight=0)
+        for r in range(self.rows, rows):
+            self.parent.grid_rowconfigure(r, weight=1)
+        for c in range(self._grid_cols, grid_cols):
+            self.parent.grid_columnconfigure(c, weight=1)
+
+        self.rows, self.cols, self._hexed, self._grid_cols = rows, cols, hexed, grid_cols
+        self.btns = [pool[r * cols:(r + 1) * cols] for r in range(rows)]
+        self.last_build = (reused, need - reused, destroyed)
+
+    def _new_button(self, i):
+        t = self.app.theme_cfg
+        btn = tk.Button(
+            self.parent, text="", width=2, height=1,
+            font=("Segoe UI", 12, "bold"),
+            bg=t["cell_up"], fg=t["text"],
+            activebackground=t["cell_down"],
+            relief="raised", bd=2
+        )
+        tags = btn.bindtags()
+        btn.bindtags((tags[0], self.CELL_TAG) + tuple(tags[1:]))
+        self._index[btn] = i
+        return btn
+
+    def _bind_cells(self):
+        for seq, fn in (("<Button-1>", self._on_left), ("<Double-Button-1>", self._on_chord),
+                        ("<Button-3>", self._on_right), ("<Control-Button-1>", self._on_right),
+                        ("<Enter>", self._on_enter), ("<Leave>", self._on_leave)):
+            self.parent.bind_class(self.CELL_TAG, seq, fn)
+
+    def destroy(self):
+        for ch in self.parent.winfo_children():
+            ch.destroy()
+        self.btns = []
+        self._pool = []
+        self._index = {}
+        self._hover = None
+        self._dirty.clear()
+        self._clean = None
+        self._heat, self._heat_src = {}, None
+        self.rows = self.cols = self._grid_cols = 0
+
+    def _touch(self, cells):
+        cols, dirty = self.cols, self._dirty
+        for (r, c) in cells:
+            dirty.add(r * cols + c)
+
+    # ---- Input ----
+    def _hit(self, e):
+        i = self._index.get(e.widget)
+        if i is None or self.app.game_over:
+            return None
+        return divmod(i, self.cols)
+
+    def _on_left(self, e):
+        cell = self._hit(e)
+        if cell:
+            self.app._on_left(*cell)
+
+    def _on_right(self, e):
+        cell = self._hit(e)
+        if cell:
+            self.app._on_right(*cell)
+
+    def _on_chord(self, e):
+        cell = self._hit(e)
+        if cell:
+            self.app._on_chord(*cell)
+
+    def _on_enter(self, e):
+        self._set_hover(self._index.get(e.widget))
+
+    def _on_leave(self, e):
+        if self._index.get(e.widget) == self._hover:
+            self._set_hover(None)
+
+    def _set_hover(self, i):
+        # Repaint only the cell losing the hover and the one gaining it
+        old, self._hover = self._hover, i
+        if old == i or self.app.game_over:
+            return
+        t = self.app.theme_cfg
+        state = self.app.board.cell_state
+        if old is not None and state[old] != REVEALED:
+            self._pool[old].configure(bg=self._heat.get(old, t["cell_up"]))
+        if i is not None and state[i] != REVEALED:
+            self._dirty.add(i)
+            self._pool[i].configure(bg=t["hover"])
+
+    def render_revealed(self, cells):
+        t = self.app.theme_cfg
+        colors = self.app.number_colors
+        board = self.app.board
+        self._touch(cells)
+        for (r, c) in cells:
+            btn = self.btns[r][c]
+            btn.config(relief="sunken", bg=t["cell_down"], activebackground=t["cell_down"])
+            val = board.number_at(r, c)
+            if val == 0:
+                btn.config(text="", fg=t["text"])
+            else:
+                btn.config(text=str(val), fg=colors.get(val, t["text"]))
+
+    def render_cell(self, r, c):
+        btn = self.btns[r][c]
+        self._dirty.add(r * self.cols + c)
+        if self.app.board.state_at(r, c) == FLAGGED:
+            btn.config(text=FLAG, fg=self.app.theme_cfg["counter"])
+        else:
+            btn.config(text="")
+
+    def reveal_mines(self, bang=None):
+        t = self.app.theme_cfg
+        b = self.app.board
+        for r in range(b.rows):
+            for c in range(b.cols):
+                btn = self.btns[r][c]
+                i = r * b.cols + c
+                if b.mine_map[i]:
+                    self._dirty.add(i)
+                    btn.config(text=MINE, fg=t["text"], relief="sunken",
+                               bg=(t["mine_bang_bg"] if (bang == (r, c)) else t["mine_bg"]))
+                elif b.cell_state[i] == FLAGGED:
+                    self._dirty.add(i)
+                    btn.config(text="✖", fg=t["counter"], relief="sunken", bg=t["wrong_flag_bg"])
+
+    def hide_mines(self):
+        self.render_hidden(shown_mines(self.app.board))
+
+    def render_hidden(self, cells):
+        t = self.app.theme_cfg
+        state, cols = self.app.board.cell_state, self.cols
+        self._touch(cells)
+        for (r, c) in cells:
+            i = r * cols + c
+            flagged = state[i] == FLAGGED
+            self.btns[r][c].config(text=FLAG if flagged else "", fg=t["counter"] if flagged else t["text"],
+                                   bg=self._heat.get(i, t["cell_up"]), activebackground=t["cell_down"],
+                                   relief="raised")
+
+    def mark_flags(self, cells, color):
+        self._touch(cells)
+        for (r, c) in cells:
+            self.btns[r][c].config(text=FLAG, fg=color)
+
+    def mark_hint(self, r, c, color):
+        self._dirty.add(r * self.cols + c)
+        self.btns[r][c].configure(bg=color)
+
+    def show_heat(self, prob, interior=0.0):
+        t = self.app.theme_cfg
+        state = self.app.board.cell_state
+        pool, old = self._pool, self._heat
+        self._heat_src = None if prob is None else (prob, interior)
+        new = {} if prob is None else heat_fills(t, state, prob, interior)
+        for i, fill in new.items():
+            if old.get(i) != fill and i != self._hover:
+                self._dirty.add(i)
+                pool[i].configure(bg=fill)
+        for i in old:
+            if i not in new and state[i] != REVEALED and i != self._hover:
+                pool[i].configure(bg=t["cell_up"])
+        self._heat = new
+
+    def repaint(self):
+        t = self.app.theme_cfg
+        colors = self.app.number_colors
+        b = self.app.board
+        self._clean = t
+        self._heat = {}
+        for r in range(b.rows):
+            for c in range(b.cols):
+                btn = self.btns[r][c]
+                st = b.state_at(r, c)
+                if st == HIDDEN:
+                    btn.config(text="", bg=t["cell_up"], activebackground=t["cell_down"],
+                               fg=t["text"], relief="raised")
+                elif st == FLAGGED:
+                    btn.config(text=FLAG, bg=t["cell_up"], activebackground=t["cell_down"],
+                               fg=t["counter"], relief="raised")
+                elif st == REVEALED:
+                    btn.config(bg=t["cell_down"], activebackground=t["cell_down"], relief="sunken")
+                    val = b.number_at(r, c)
+                    if val > 0:
+                        btn.config(text=str(val), fg=colors.get(val, t["text"]))
+                    else:
+                        btn.config(text="", fg=t["text"])
+        if self._heat_src is not None:
+            self.show_heat(*self._heat_src)
+
+
+class CanvasBoardView:
+    """Whole board drawn on a single tk.Canvas, clicks hit-tested by coordinate.
+
+    Every cell is a rectangle plus a text item. Items carry a tag naming
+    their role ("up", "down", "n3", "flag", ...) so theme changes recolor
+    the board with one itemconfigure per tag instead of one per cell.
+    A new game of the same size keeps the canvas and resets only the items
+    touched since the last build.
+    """
+    CELL = 32
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.canvas = None
+        self.rows = self.cols = 0
+        self.hexed = False
+        self._rects = []
+        self._texts = []
+        self._hover = None
+        self._dirty = set()
+        self._heat = {}              # flat index -> heat map fill
+        self._heat_src = None
+        self.last_build = (0, 0, 0)  # (reused, created, destroyed)
+
+    def build(self, rows, cols):
+        hexed = self.app.board.topology == "hex"
+        if self.canvas is not None and (rows, cols, hexed) == (self.rows, self.cols, self.hexed):
+            self._reset()
+            return
+        dropped = len(self._rects)
+        self.destroy()
+        t = self.app.theme_cfg
+        s = self.CELL
+        self.rows, self.cols = rows, cols
+        # Hex boards shift odd rows right by half a cell.
+        self.hexed = self.app.board.topology == "hex"
+        cv = tk.Canvas(self.parent, width=cols * s + (s // 2 if self.hexed else 0), height=rows * s, bg=t["panel"],
+                       highlightthickness=0, bd=0)
+        cv.grid(row=0, column=0)
+        font = ("Segoe UI", 12, "bold")
+        rects, texts = [], []
+        for r in range(rows):
+            y = r * s
+            shift = s // 2 if self.hexed and r & 1 else 0
+            for c in range(cols):
+                x = c * s + shift
+                rects.append(cv.create_rectangle(x + 1, y + 1, x + s - 1, y + s - 1, fill=t["cell_up"],
+                                                 outline=t["panel_dark"], tags=("up",)))
+                texts.append(cv.create_text(x + s // 2, y + s // 2, text="", font=font, fill=t["text"]))
+        self._rects, self._texts = rects, texts
+        self._hover = None
+
+        cv.bind("<Button-1>", self._on_left)
+        cv.bind("<Double-Button-1>", self._on_chord)
+        cv.bind("<Button-3>", self._on_right)
+        cv.bind("<Control-Button-1>", self._on_right)
+        cv.bind("<Motion>", self._on_motion)
+        cv.bind("<Leave>", self._on_leave)
+        self.canvas = cv
+        self.last_build = (0, rows * cols, dropped)
+
+    def _reset(self):
+        t = self.app.theme_cfg
+        cv, rects, texts = self.canvas, self._rects, self._texts
+        for i in self._dirty:
+            cv.itemconfigure(rects[i], fill=t["cell_up"], tags=("up",))
+            cv.itemconfigure(texts[i], text="", tags=())
+        self._dirty.clear()
+        self._hover = None
+        self._heat, self._heat_src = {}, None
+        self.last_build = (len(rects), 0, 0)
+
+    def destroy(self):
+        for ch in self.parent.winfo_children():
+            ch.destroy()
+        self.canvas = None
+        self._rects, self._texts = [], []
+        self._hover = None
+        self._dirty.clear()
+        self._heat, self._heat_src = {}, None
+
+    # ---- Input ----
+    def _hit(self, e):
+        s = self.CELL
+        y, x = self.canvas.canvasy(e.y), self.canvas.canvasx(e.x)
+        r = int(y // s)
+        if self.hexed and r & 1:
+            x -= s // 2
+        c = int(x // s)
+        if 0 <= r < self.rows and 0 <= c < self.cols and x >= 0:
+            return r, c
+        return None
+
+    def _on_left(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_left(*cell)
+
+    def _on_right(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_right(*cell)
+
+    def _on_chord(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_chord(*cell)
+
+    def _on_motion(self, e):
+        cell = self._hit(e)
+        if cell == self._hover:
+            return
+        self._set_hover(self._hover, False)
+        self._hover = cell
+        self._set_hover(cell, True)
+
+    def _on_leave(self, e):
+        self._set_hover(self._hover, False)
+        self._hover = None
+
+    def _set_hover(self, cell, on):
+        if cell is None or self.app.game_over:
+            return
+        r, c = cell
+        if self.app.board.state_at(r, c) != REVEALED:
+            t = self.app.theme_cfg
+            i = r * self.cols + c
+            self._dirty.add(i)
+            self.canvas.itemconfigure(self._rects[i], fill=t["hover"] if on else self._heat.get(i, t["cell_up"]))
+
+    # ---- Drawing ----
+    def render_revealed(self, cells):
+        t = self.app.theme_cfg
+        colors = self.app.number_colors
+        board = self.app.board
+        cv, rects, texts, cols = self.canvas, self._rects, self._texts, self.cols
+        dirty = self._dirty
+        for (r, c) in cells:
+            i = r * cols + c
+            dirty.add(i)
+            cv.itemconfigure(rects[i], fill=t["cell_down"], tags=("down",))
+            val = board.counts[i]
+            if val > 0:
+                cv.itemconfigure(texts[i], text=str(val), fill=colors.get(val, t["text"]), tags=(f"n{val}",))
+            else:
+                cv.itemconfigure(texts[i], text="", tags=())
+
+    def render_cell(self, r, c):
+        i = r * self.cols + c
+        self._dirty.add(i)
+        if self.app.board.cell_state[i] == FLAGGED:
+            self.canvas.itemconfigure(self._texts[i], text=FLAG, fill=self.app.theme_cfg["counter"], tags=("flag",))
+        else:
+            self.canvas.itemconfigure(self._texts[i], text="", tags=())
+
+    def reveal_mines(self, bang=None):
+        t = self.app.theme_cfg
+        b = self.app.board
+        cv, rects, texts = self.canvas, self._rects, self._texts
+        bang_i = b.idx(*bang) if bang else -1
+        dirty = self._dirty
+        i = b.mine_map.find(1)
+        while i != -1:
+            dirty.add(i)
+            tag = "bang" if i == bang_i else "mine"
+            cv.itemconfigure(rects[i], fill=t["mine_bang_bg" if tag == "bang" else "mine_bg"], tags=(tag,))
+            cv.itemconfigure(texts[i], text=MINE, fill=t["text"], tags=("mine_t",))
+            i = b.mine_map.find(1, i + 1)
+        i = b.cell_state.find(FLAGGED)
+        while i != -1:
+            if not b.mine_map[i]:
+                dirty.add(i)
+                cv.itemconfigure(rects[i], fill=t["wrong_flag_bg"], tags=("wrong",))
+                cv.itemconfigure(texts[i], text="✖", fill=t["counter"], tags=("flag",))
+            i = b.cell_state.find(FLAGGED, i + 1)
+
+    def hide_mines(self):
+        self.render_hidden(shown_mines(self.app.board))
+
+    def render_hidden(self, cells):
+        t = self.app.theme_cfg
+        state = self.app.board.cell_state
+        cv, rects, texts, cols = self.canvas, self._rects, self._texts, self.cols
+        for (r, c) in cells:
+            i = r * cols + c
+            self._dirty.add(i)
+            cv.itemconfigure(rects[i], fill=self._heat.get(i, t["cell_up"]), tags=("up",))
+            if state[i] == FLAGGED:
+                cv.itemconfigure(texts[i], text=FLAG, fill=t["counter"], tags=("flag",))
+            else:
+                cv.itemconfigure(texts[i], text="", tags=())
+
+    def mark_flags(self, cells, color):
+        cv, texts, cols = self.canvas, self._texts, self.cols
+        for (r, c) in cells:
+            self._dirty.add(r * cols + c)
+            cv.itemconfigure(texts[r * cols + c], text=FLAG, fill=color, tags=("won",))
+
+    def mark_hint(self, r, c, color):
+        self._dirty.add(r * self.cols + c)
+        self.canvas.itemconfigure(self._rects[r * self.cols + c], fill=color)
+
+    def show_heat(self, prob, interior=0.0):
+        t = self.app.theme_cfg
+        state = self.app.board.cell_state
+        cv, rects, old = self.canvas, self._rects, self._heat
+        hover = self._hover[0] * self.cols + self._hover[1] if self._hover else None
+        self._heat_src = None if prob is None else (prob, interior)
+        new = {} if prob is None else heat_fills(t, state, prob, interior)
+        for i, fill in new.items():
+            if old.get(i) != fill and i != hover:
+                self._dirty.add(i)
+                cv.itemconfigure(rects[i], fill=fill)
+        for i in old:
+            if i not in new and state[i] != REVEALED and i != hover:
+                cv.itemconfigure(rects[i], fill=t["cell_up"])
+        self._heat = new
+
+    def repaint(self):
+        t = self.app.theme_cfg
+        cv = self.canvas
+        cv.configure(bg=t["panel"])
+        for tag, key in (("up", "cell_up"), ("down", "cell_down"), ("mine", "mine_bg"),
+                         ("bang", "mine_bang_bg"), ("wrong", "wrong_flag_bg")):
+            cv.itemconfigure(tag, fill=t[key], outline=t["panel_dark"])
+        cv.itemconfigure("flag", fill=t["counter"])
+        cv.itemconfigure("mine_t", fill=t["text"])
+        for val, color in self.app.number_colors.items():
+            cv.itemconfigure(f"n{val}", fill=color)
+        self._heat = {}
+        if self._heat_src is not None:
+            self.show_heat(*self._heat_src)
+
+
+class ViewportBoardView:
+    """Scrollable, zoomable board for boards larger than the screen.
+
+    The canvas's scrollregion is the whole board, so Tk does the scrolling,
+    but only cells inside the visible area have items (a rectangle and a
+    text each). After the view moves, the visible cell range is recomputed:
+    items of cells that left it are recycled for the newly exposed strip,
+    so a scroll costs one coords/itemconfigure pair per exposed cell.
+    Cells are painted from board state when they scroll in, so painting
+    calls for cells out of view are dropped and such reveals only change
+    state. Tags match CanvasBoardView, so repaint() recolors by tag.
+
+    Wheel scrolls (Shift+wheel sideways), Ctrl+wheel or Ctrl +/- zooms
+    around the pointer, and middle-drag pans.
+    """
+    ZOOMS = (12, 16, 20, 24, 32, 40, 48)
+    CELL = 32
+    WHEEL_CELLS = 3
+    SCREEN_MARGIN = (80, 240)   # px of the screen left for window chrome
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.parent = parent
+        self.canvas = None
+        self.rows = self.cols = 0
+        self.hexed = False
+        self.cell = self.CELL
+        self._font = None
+        self._slots = {}             # flat index -> (rect, text) for visible cells
+        self._free = []              # recycled (rect, text) pairs, hidden
+        self._stale = []             # pairs still shown but no longer placed (build, zoom)
+        self._range = (0, 0, 0, 0)   # visible rows [r0, r1) x cols [c0, c1)
+        self._hints = {}             # flat index -> hint color
+        self._won = {}               # flat index -> flag color after a win
+        self._heat = None            # (prob, interior) while the heat map is shown
+        self._tint = {}              # flat index -> heat map fill last painted
+        self._mines_shown = False
+        self._bang = -1
+        self._hover = None
+        self._sync_job = None
+        self.last_build = (0, 0, 0)  # (reused, created, destroyed)
+        self.last_sync = (0, 0)      # (cells exposed, items created) by the latest move
+
+    def build(self, rows, cols):
+        reused = len(self._slots) + len(self._free) + len(self._stale)
+        if self.canvas is None:
+            self._create()
+            reused = 0
+        self.rows, self.cols = rows, cols
+        self.hexed = self.app.board.topology == "hex"
+        self._hints.clear()
+        self._won.clear()
+        self._heat = None
+        self._tint.clear()
+        self._mines_shown = False
+        self._bang = -1
+        self._hover = None
+        self._release_all()
+        sw, sh = self.app.winfo_screenwidth(), self.app.winfo_screenheight()
+        w, h = self._extent()
+        self.canvas.configure(width=min(w, sw - self.SCREEN_MARGIN[0]), height=min(h, sh - self.SCREEN_MARGIN[1]),
+                              scrollregion=(0, 0, w, h))
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self._sync()
+        self.last_build = (reused, self.last_sync[1], 0)
+
+    def _create(self):
+        t = self.app.theme_cfg
+        cv = tk.Canvas(self.parent, bg=t["panel"], highlightthickness=0, bd=0, confine=True)
+        xs = tk.Scrollbar(self.parent, orient="horizontal", command=cv.xview)
+        ys = tk.Scrollbar(self.parent, orient="vertical", command=cv.yview)
+        # Every view change (scrollbar, wheel, drag, zoom) reports through
+        # these, so they are the one place that schedules a sync.
+        cv.configure(xscrollcommand=lambda *a: (xs.set(*a), self._schedule_sync()),
+                     yscrollcommand=lambda *a: (ys.set(*a), self._schedule_sync()))
+        cv.grid(row=0, column=0)
+        ys.grid(row=0, column=1, sticky="ns")
+        xs.grid(row=1, column=0, sticky="ew")
+        cv.bind("<Button-1>", self._on_left)
+        cv.bind("<Double-Button-1>", self._on_chord)
+        cv.bind("<Button-3>", self._on_right)
+        cv.bind("<Control-Button-1>", self._on_right)
+        cv.bind("<Motion>", self._on_motion)
+        cv.bind("<Leave>", self._on_leave)
+        cv.bind("<Enter>", lambda e: cv.focus_set())
+        cv.bind("<Configure>", lambda e: self._schedule_sync())
+        cv.bind("<MouseWheel>", self._on_wheel)
+        cv.bind("<Button-4>", lambda e: self._on_wheel(e, 1))
+        cv.bind("<Button-5>", lambda e: self._on_wheel(e, -1))
+        cv.bind("<ButtonPress-2>", lambda e: cv.scan_mark(e.x, e.y))
+        cv.bind("<B2-Motion>", lambda e: cv.scan_dragto(e.x, e.y, gain=1))
+        cv.bind("<Control-plus>", lambda e: self.zoom(1))
+        cv.bind("<Control-equal>", lambda e: self.zoom(1))
+        cv.bind("<Control-minus>", lambda e: self.zoom(-1))
+        self.canvas = cv
+        self._set_font()
+
+    def destroy(self):
+        if self._sync_job is not None and self.canvas is not None:
+            try:
+                self.canvas.after_cancel(self._sync_job)
+            except Exception:
+                pass
+        self._sync_job = None
+        for ch in self.parent.winfo_children():
+            ch.destroy()
+        self.canvas = None
+        self._slots, self._free, self._stale = {}, [], []
+        self._range = (0, 0, 0, 0)
+        self._hover = None
+
+    # ---- Geometry ----
+    def _extent(self):
+        s = self.cell
+        return self.cols * s + (s // 2 if self.hexed else 0), self.rows * s
+
+    def _set_font(self):
+        self._font = ("Segoe UI", max(6, self.cell * 3 // 8), "bold")
+
+    def _place(self, r, c, rect, text):
+        s = self.cell
+        x = c * s + (s // 2 if self.hexed and r & 1 else 0)
+        y = r * s
+        cv = self.canvas
+        cv.coords(rect, x + 1, y + 1, x + s - 1, y + s - 1)
+        cv.coords(text, x + s // 2, y + s // 2)
+
+    def _visible_range(self):
+        cv, s = self.canvas, self.cell
+        w = cv.winfo_width()
+        h = cv.winfo_height()
+        if w <= 1:  # not mapped yet
+            w, h = int(cv.cget("width")), int(cv.cget("height"))
+        x0, y0 = cv.canvasx(0), cv.canvasy(0)
+        shift = 1 if self.hexed else 0
+        return (max(0, int(y0 // s)), min(self.rows, int((y0 + h) // s) + 1),
+                max(0, int(x0 // s) - shift), min(self.cols, int((x0 + w) // s) + 1))
+
+    @staticmethod
+    def _outside(rng, other):
+        """Cells (r, c) of range ``rng`` that are not in ``other``."""
+        r0, r1, c0, c1 = rng
+        o0, o1, p0, p1 = other
+        for r in range(r0, r1):
+            if o0 <= r < o1:
+                for c in range(c0, min(c1, p0)):
+                    yield r, c
+                for c in range(max(c0, p1), c1):
+                    yield r, c
+            else:
+                for c in range(c0, c1):
+                    yield r, c
+
+    # ---- Virtualization ----
+    def _schedule_sync(self):
+        if self._sync_job is None and self.canvas is not None:
+            self._sync_job = self.canvas.after_idle(self._sync)
+
+    def _sync(self):
+        """Match the items to the visible range: recycle what left it, place
+        and paint only the newly exposed cells."""
+        self._sync_job = None
+        if self.canvas is None or self.app.board is None:
+            return
+        new, old = self._visible_range(), self._range
+        if new == old:
+            return
+        cols, slots, free = self.cols, self._slots, self._free
+        # Items released now are still shown: reuse those first, then
+        # hidden ones, and hide only what is left over.
+        released, self._stale = self._stale, []
+        for r, c in self._outside(old, new):
+            pair = slots.pop(r * cols + c, None)
+            if pair is not None:
+                released.append(pair)
+        cv, t = self.canvas, self.app.theme_cfg
+        exposed = created = 0
+        for r, c in self._outside(new, old):
+            if released:
+                rect, text = released.pop()
+            elif free:
+                rect, text = free.pop()
+                cv.itemconfigure(rect, state="normal")
+                cv.itemconfigure(text, state="normal")
+            else:
+                rect = cv.create_rectangle(0, 0, 0, 0, outline=t["panel_dark"])
+                text = cv.create_text(0, 0, text="")
+                created += 1
+            self._place(r, c, rect, text)
+            i = r * cols + c
+            slots[i] = (rect, text)
+            self._paint(i, rect, text)
+            exposed += 1
+        for rect, text in released:
+            cv.itemconfigure(rect, state="hidden")
+            cv.itemconfigure(text, state="hidden")
+        free.extend(released)
+        self._range = new
+        self.last_sync = (exposed, created)
+
+    def _release_all(self):
+        self._stale.extend(self._slots.values())
+        self._slots = {}
+        self._range = (0, 0, 0, 0)
+
+    def zoom(self, step, x=None, y=None):
+        """Zoom in (step > 0) or out one level, keeping the board point under
+        (x, y) (default: the view's center) where it is."""
+        k = self.ZOOMS.index(self.cell) if self.cell in self.ZOOMS else self.ZOOMS.index(self.CELL)
+        k = max(0, min(len(self.ZOOMS) - 1, k + step))
+        if self.ZOOMS[k] == self.cell or self.canvas is None:
+            return
+        cv = self.canvas
+        if x is None:
+            x, y = int(cv.cget("width")) // 2, int(cv.cget("height")) // 2
+        scale = self.ZOOMS[k] / self.cell
+        bx, by = cv.canvasx(x) * scale, cv.canvasy(y) * scale
+        self.cell = self.ZOOMS[k]
+        self._set_font()
+        w, h = self._extent()
+        cv.configure(scrollregion=(0, 0, w, h))
+        cv.xview_moveto(max(0.0, bx - x) / w)
+        cv.yview_moveto(max(0.0, by - y) / h)
+        self._release_all()
+        self._sync()
+
+    def see(self, r, c):
+        """Scroll so that cell (r, c) is centered, if it is not visible."""
+        r0, r1, c0, c1 = self._visible_range()
+        if r0 <= r < r1 and c0 <= c < c1:
+            return
+        cv, s = self.canvas, self.cell
+        w, h = self._extent()
+        cv.xview_moveto(max(0.0, c * s - int(cv.cget("width")) / 2) / w)
+        cv.yview_moveto(max(0.0, r * s - int(cv.cget("height")) / 2) / h)
+        self._sync()
+
+    # ---- Input ----
+    def _hit(self, e):
+        s = self.cell
+        y, x = self.canvas.canvasy(e.y), self.canvas.canvasx(e.x)
+        r = int(y // s)
+        if self.hexed and r & 1:
+            x -= s // 2
+        c = int(x // s)
+        if 0 <= r < self.rows and 0 <= c < self.cols and x >= 0:
+            return r, c
+        return None
+
+    def _on_left(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_left(*cell)
+
+    def _on_right(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_right(*cell)
+
+    def _on_chord(self, e):
+        cell = self._hit(e)
+        if cell and not self.app.game_over:
+            self.app._on_chord(*cell)
+
+    def _on_wheel(self, e, direction=None):
+        if direction is None:
+            direction = 1 if e.delta > 0 else -1
+        state = getattr(e, "state", 0)
+        if state & 0x4:      # Control
+            self.zoom(direction, e.x, e.y)
+        elif state & 0x1:    # Shift
+            self.canvas.xview_scroll(-direction * self.WHEEL_CELLS * self.cell, "pixels")
+        else:
+            self.canvas.yview_scroll(-direction * self.WHEEL_CELLS * self.cell, "pixels")
+
+    def _on_motion(self, e):
+        cell = self._hit(e)
+        if cell == self._hover:
+            return
+        self._set_hover(self._hover, False)
+        self._hover = cell
+        self._set_hover(cell, True)
+
+    def _on_leave(self, e):
+        self._set_hover(self._hover, False)
+        self._hover = None
+
+    def _set_hover(self, cell, on):
+        if cell is None or self.app.game_over:
+            return
+        i = cell[0] * self.cols + cell[1]
+        pair = self._slots.get(i)
+        if pair is not None and self.app.board.cell_state[i] != REVEALED:
+            t = self.app.theme_cfg
+            self.canvas.itemconfigure(pair[0], fill=t["hover"] if on else self._up_fill(i))
+
+    # ---- Drawing ----
+    def _up_fill(self, i):
+        # Hidden or flagged cell: hint, else heat map, else plain
+        t = self.app.theme_cfg
+        fill = self._hints.get(i)
+        if fill is None and self._heat is not None and self.app.board.cell_state[i] == HIDDEN:
+            prob, interior = self._heat
+            fill = self._tint[i] = heat_color(t, prob.get(i, interior))
+        return fill or t["cell_up"]
+
+    def _paint(self, i, rect, text):
+        t = self.app.theme_cfg
+        b = self.app.board
+        cv = self.canvas
+        st = b.cell_state[i]
+        font = self._font
+        if self._mines_shown and b.mine_map[i]:
+            tag = "bang" if i == self._bang else "mine"
+            cv.itemconfigure(rect, fill=t["mine_bang_bg" if tag == "bang" else "mine_bg"], tags=(tag,))
+            cv.itemconfigure(text, text=MINE, fill=t["text"], font=font, tags=("mine_t",))
+        elif self._mines_shown and st == FLAGGED:
+            cv.itemconfigure(rect, fill=t["wrong_flag_bg"], tags=("wrong",))
+            cv.itemconfigure(text, text="✖", fill=t["counter"], font=font, tags=("flag",))
+        elif st == REVEALED:
+            cv.itemconfigure(rect, fill=t["cell_down"], tags=("down",))
+            val = b.counts[i]
+            if val > 0:
+                cv.itemconfigure(text, text=str(val), fill=self.app.number_colors.get(val, t["text"]),
+                                 font=font, tags=(f"n{val}",))
+            else:
+                cv.itemconfigure(text, text="", tags=())
+        else:
+            cv.itemconfigure(rect, fill=self._up_fill(i), tags=("up",))
+            if st == FLAGGED:
+                won = self._won.get(i)
+                cv.itemconfigure(text, text=FLAG, fill=won or t["counter"], font=font,
+                                 tags=("won",) if won else ("flag",))
+            else:
+                cv.itemconfigure(text, text="", tags=())
+
+    def _repaint_cell(self, i):
+        pair = self._slots.get(i)
+        if pair is not None:
+            self._paint(i, *pair)
+
+    def render_revealed(self, cells):
+        slots, cols = self._slots, self.cols
+        for (r, c) in cells:
+            pair = slots.get(r * cols + c)
+            if pair is not None:
+                self._paint(r * cols + c, *pair)
+
+    def render_cell(self, r, c):
+        self._repaint_cell(r * self.cols + c)
+
+    def reveal_mines(self, bang=None):
+        self._mines_shown = True
+        self._bang = self.app.board.idx(*bang) if bang else -1
+        for i, pair in self._slots.items():
+            self._paint(i, *pair)
+
+    def hide_mines(self):
+        self._mines_shown = False
+        self._bang = -1
+        self.render_hidden(shown_mines(self.app.board))
+
+    def render_hidden(self, cells):
+        self.render_revealed(cells)  # both paint from the cell states
+
+    def mark_flags(self, cells, color):
+        cols = self.cols
+        for (r, c) in cells:
+            self._won[r * cols + c] = color
+            self._repaint_cell(r * cols + c)
+
+    def mark_hint(self, r, c, color):
+        i = r * self.cols + c
+        self._hints[i] = color
+        self.see(r, c)
+        self._repaint_cell(i)
+
+    def show_heat(self, prob, interior=0.0):
+        # Only visible cells have items; the rest are tinted as they scroll in
+        t = self.app.theme_cfg
+        state, tint = self.app.board.cell_state, self._tint
+        hover = self._hover_index()
+        self._heat = None if prob is None else (prob, interior)
+        for i, pair in self._slots.items():
+            fill = heat_color(t, prob.get(i, interior)) if prob is not None and state[i] == HIDDEN else None
+            if fill != tint.get(i) and i != hover:
+                tint.pop(i, None)
+                self._paint(i, *pair)
+        if prob is None:
+            tint.clear()
+
+    def _hover_index(self):
+        return self._hover[0] * self.cols + self._hover[1] if self._hover else None
+
+    def repaint(self):
+        t = self.app.theme_cfg
+        cv = self.canvas
+        cv.configure(bg=t["panel"])
+        for tag, key in (("up", "cell_up"), ("down", "cell_down"), ("mine", "mine_bg"),
+                         ("bang", "mine_bang_bg"), ("wrong", "wrong_flag_bg")):
+            cv.itemconfigure(tag, fill=t[key], outline=t["panel_dark"])
+        cv.itemconfigure("flag", fill=t["counter"])
+        cv.itemconfigure("mine_t", fill=t["text"])
+        for val, color in self.app.number_colors.items():
+            cv.itemconfigure(f"n{val}", fill=color)
+        for i in self._hints:
+            self._repaint_cell(i)
+        if self._heat is not None:
+            self._tint.clear()
+            for i, pair in self._slots.items():
+                if self.app.board.cell_state[i] == HIDDEN:
+                    self._paint(i, *pair)
+
+
+BOARD_VIEWS = {
+    "canvas": CanvasBoardView,
+    "buttons": ButtonBoardView,
+    "viewport": ViewportBoardView,
+}
+DEFAULT_VIEW = "canvas"
+
+# -----------------------------
+# Render scheduling
+# -----------------------------
+class RenderQueue:
+    """Revealed cells waiting to be painted, drained from the Tk event loop.
+
+    Board state is updated synchronously by the click handlers; only the
+    painting is deferred. Each frame paints cells until FRAME_BUDGET runs
+    out and then yields back to Tk with after(), so input stays live while
+    a large opening is drawn. A cell queued twice is painted once.
+    With ``animate`` on, cells are ordered by ring distance from the click
+    and one ring is painted per frame, so the opening cascades outward.
+    Callbacks given to when_drained() run once nothing is left to paint.
+    """
+    FRAME_BUDGET = 0.012     # seconds of painting per frame
+    FRAME_DELAY = 1          # ms between frames when not animating
+    ANIMATION_DELAY = 16     # ms between rings when animating
+    CHUNK = 32               # cells painted between budget checks
+
+    def __init__(self, widget, paint):
+        self.widget = widget
+        self.paint = paint
+        self.animate = False
+        self._order = deque()  # (ring, cell)
+        self._queued = set()
+        self._job = None
+        self._drained = []
+
+    def __len__(self):
+        return len(self._order)
+
+    def push(self, cells, origin=None):
+        if not cells:
+            return
+        if self.animate and origin is not None:
+            r0, c0 = origin
+            ring = lambda cell: max(abs(cell[0] - r0), abs(cell[1] - c0))
+            items = sorted((ring(cell), cell) for cell in cells)
+        else:
+            items = ((0, cell) for cell in cells)
+        queued = self._queued
+        for ring, cell in items:
+            if cell not in queued:
+                queued.add(cell)
+                self._order.append((ring, cell))
+        self._schedule(0)
+
+    def when_drained(self, fn):
+        if self._order:
+            self._drained.append(fn)
+        else:
+            fn()
+
+    def _notify(self):
+        callbacks, self._drained = self._drained, []
+        for fn in callbacks:
+            fn()
+
+    def _schedule(self, delay):
+        if self._job is None and self._order:
+            self._job = self.widget.after(delay, self._drain)
+
+    def _drain(self):
+        self._job = None
+        order, queued = self._order, self._queued
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        ring = order[0][0] if order else 0
+        while order:
+            batch = []
+            while order and len(batch) < self.CHUNK:
+                if self.animate and order[0][0] != ring:
+                    break
+                cell = order.popleft()[1]
+                queued.discard(cell)
+                batch.append(cell)
+            if not batch:
+                break
+            self.paint(batch)
+            if time.perf_counter() >= deadline:
+                break
+        animating = self.animate and order and order[0][0] != ring
+        self._schedule(self.ANIMATION_DELAY if animating else self.FRAME_DELAY)
+        if not order:
+            self._notify()
+
+    def flush(self):
+        self.cancel_job()
+        cells = [cell for _, cell in self._order]
+        self._order.clear()
+        self._queued.clear()
+        if cells:
+            self.paint(cells)
+        self._notify()
+
+    def clear(self):
+        self.cancel_job()
+        self._order.clear()
+        self._queued.clear()
+        self._notify()
+
+    def cancel_job(self):
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None